@@ -0,0 +1,35 @@
+"""Bulk amenity catalog import.
+
+Binds the shared catalog import (shared.bulk_import) to the amenities
+table, the amenity schema and the amenity cache.
+
+Usage: python -m app.bulk_import <file|-> [--format json|ndjson|csv]
+"""
+import sys
+import uuid
+import asyncio
+from typing import Dict, List
+
+from sqlalchemy.orm import Session
+
+from shared.bulk_import import (
+    IMPORT_BATCH_SIZE, MAX_REPORTED_ERRORS, ImportResult, run_import_cli, upsert_rows, validate_rows
+)
+
+from . import models, schemas
+from .cache import amenity_cache
+
+CATALOG_NAMESPACE = uuid.UUID("8f0d2c51-6f3e-4b7a-9a55-2f1c4e7d9b20")
+
+def import_catalog(db: Session, rows: List[Dict], batch_size: int = IMPORT_BATCH_SIZE) -> ImportResult:
+    """Upsert the valid catalog rows in one transaction and report the invalid ones"""
+    values, errors = validate_rows(rows, schemas.AmenityCreate, CATALOG_NAMESPACE)
+    if values:
+        upsert_rows(db, models.Amenity.__table__, values, batch_size)
+        db.commit()
+        amenity_cache.invalidate()
+    return ImportResult(imported=len(values), rejected=len(errors), errors=errors[:MAX_REPORTED_ERRORS])
+
+if __name__ == "__main__":
+    from . import database
+    sys.exit(asyncio.run(run_import_cli(sys.argv[1:], "Upsert an amenity catalog", "amenity", import_catalog, database)))
@@ -0,0 +1,90 @@
+import os
+import time
+import threading
+from dataclasses import dataclass
+from typing import Optional, Tuple
+
+from pydantic import TypeAdapter
+from sqlalchemy.orm import Session
+
+from shared.caching import body_etag
+
+from . import models, schemas
+
+AMENITY_CACHE_TTL = float(os.getenv("AMENITY_CACHE_TTL", "300"))  # seconds
+AMENITY_CACHE_MAX_ENTRIES = 128
+
+_amenity_list = TypeAdapter(list[schemas.AmenityResponse])
+
+@dataclass(frozen=True)
+class AmenitySnapshot:
+    version: int
+    etag: str
+    body: bytes
+
+class AmenityCache:
+    """In-process snapshots of the amenity catalog, one per filter combination.
+
+    Any endpoint that writes amenities must call invalidate(); the TTL
+    covers writes made by other workers or replicas.
+    """
+
+    def __init__(self, ttl: float = AMENITY_CACHE_TTL):
+        self.ttl = ttl
+        self.version = 0
+        self._snapshots = {}  # (category, available) -> (loaded_at, snapshot)
+        self._lock = threading.Lock()
+
+    def _fresh(self, key: Tuple[Optional[str], bool]) -> Optional[AmenitySnapshot]:
+        entry = self._snapshots.get(key)
+        if entry is not None and time.monotonic() - entry[0] < self.ttl:
+            return entry[1]
+        return None
+
+    def peek(self, category: Optional[str], available: bool) -> Optional[AmenitySnapshot]:
+        """Return the snapshot for the given filters if still fresh, without touching the database"""
+        return self._fresh((category, available))
+
+    def get(self, db: Session, category: Optional[str], available: bool) -> AmenitySnapshot:
+        """Return the snapshot for the given filters, rebuilding it if stale"""
+        key = (category, available)
+        snapshot = self._fresh(key)
+        if snapshot is not None:
+            return snapshot
+
+        # Build outside the lock: on the async path the query yields to the
+        # event loop, and a thread lock held across it would block the loop
+        version = self.version
+        snapshot = self._build(db, version, category, available)
+        with self._lock:
+            # Only publish if no write landed while we were loading
+            if version == self.version:
+                if len(self._snapshots) >= AMENITY_CACHE_MAX_ENTRIES:
+                    self._snapshots.clear()
+                self._snapshots[key] = (time.monotonic(), snapshot)
+        return snapshot
+
+    def invalidate(self):
+        """Drop all snapshots after an amenity write"""
+        with self._lock:
+            self.version += 1
+            self._snapshots.clear()
+
+    @staticmethod
+    def _build(db: Session, version: int, category: Optional[str], available: bool) -> AmenitySnapshot:
+        query = db.query(models.Amenity)
+
+        if available:
+            query = query.filter(models.Amenity.available == True)
+
+        if category:
+            query = query.filter(models.Amenity.category == category)
+
+        amenities = query.order_by(models.Amenity.category, models.Amenity.name).all()
+
+        body = _amenity_list.dump_json(_amenity_list.validate_python(amenities, from_attributes=True))
+        etag = body_etag(body)
+        return AmenitySnapshot(version=version, etag=etag, body=body)
+
+
+amenity_cache = AmenityCache()
@@ -0,0 +1,21 @@
+from prometheus_client import Counter, Gauge, Histogram
+
+# Connection pool
+DB_POOL_CHECKOUT_SECONDS = Histogram(
+    "db_pool_checkout_seconds",
+    "Time spent waiting to check a connection out of the pool",
+    buckets=(0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30)
+)
+DB_POOL_CONNECTIONS_IN_USE = Gauge(
+    "db_pool_connections_in_use",
+    "Connections currently checked out of the pool",
+    multiprocess_mode="livesum"
+)
+DB_POOL_OVERFLOW_TOTAL = Counter(
+    "db_pool_overflow_total",
+    "Checkouts that opened a connection beyond pool_size"
+)
+DB_POOL_TIMEOUTS_TOTAL = Counter(
+    "db_pool_timeouts_total",
+    "Checkouts that gave up after pool_timeout"
+)
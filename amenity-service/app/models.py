@@ -1,4 +1,4 @@
-from sqlalchemy import Column, String, Integer, Float, DateTime, Boolean, Text
+from sqlalchemy import Column, String, Integer, Float, Date, DateTime, Boolean, JSON, Text, Index
 from .database import Base
 import uuid
 from datetime import datetime
@@ -33,4 +33,72 @@ class AmenityOrder(Base):
     staff_notes = Column(Text)
     created_at = Column(DateTime, default=datetime.utcnow)
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
-    completed_at = Column(DateTime)
\ No newline at end of file
+    completed_at = Column(DateTime)
+    
+    # Keyset-friendly indexes for list_amenity_orders: (created_at, id) is the page order
+    __table_args__ = (
+        Index("ix_amenity_orders_created_at_id", "created_at", "id"),
+        Index("ix_amenity_orders_guest_id_created_at_id", "guest_id", "created_at", "id"),
+        Index("ix_amenity_orders_status_created_at_id", "status", "created_at", "id"),
+    )
+
+class OutboxEvent(Base):
+    __tablename__ = "amenity_outbox"
+    
+    id = Column(String, primary_key=True, default=lambda: str(uuid.uuid4()))
+    event_type = Column(String, nullable=False)  # EventTypes value, used as routing key
+    payload = Column(JSON, nullable=False)
+    attempts = Column(Integer, default=0)
+    created_at = Column(DateTime, default=datetime.utcnow)
+    published_at = Column(DateTime, nullable=True)  # NULL until the broker confirms
+    
+    # Partial index over the relay's pending scan
+    __table_args__ = (
+        Index(
+            "ix_amenity_outbox_pending_created_at",
+            "created_at",
+            postgresql_where=published_at.is_(None),
+            sqlite_where=published_at.is_(None)
+        ),
+    )
+
+class IdempotencyKey(Base):
+    __tablename__ = "amenity_idempotency_keys"
+    
+    scope = Column(String, primary_key=True)  # endpoint the key was sent to
+    key = Column(String, primary_key=True)  # Idempotency-Key header
+    request_hash = Column(String, nullable=False)  # sha256 of the request body
+    response = Column(JSON, nullable=False)
+    created_at = Column(DateTime, default=datetime.utcnow)
+    expires_at = Column(DateTime, nullable=False)
+    
+    __table_args__ = (
+        Index("ix_amenity_idempotency_keys_expires_at", "expires_at"),
+    )
+
+class AmenityDailyStats(Base):
+    __tablename__ = "amenity_daily_stats"
+    
+    day = Column(Date, primary_key=True)  # day the orders were placed (UTC)
+    amenity_id = Column(String, primary_key=True)
+    amenity_name = Column(String)
+    category = Column(String)
+    order_count = Column(Integer, nullable=False, default=0)  # cancelled orders excluded
+    revenue = Column(Float, nullable=False, default=0.0)
+    completed_count = Column(Integer, nullable=False, default=0)
+    completion_seconds = Column(Float, nullable=False, default=0.0)  # sum of completed_at - created_at
+
+class AmenityDailyStatsDelta(Base):
+    __tablename__ = "amenity_daily_stats_deltas"
+    
+    # Journal of changes to amenity_daily_stats, written by order requests
+    # and summed into it by the rollup job
+    id = Column(String, primary_key=True, default=lambda: str(uuid.uuid4()))
+    day = Column(Date, nullable=False)
+    amenity_id = Column(String, nullable=False)
+    amenity_name = Column(String)
+    category = Column(String)
+    order_count = Column(Integer, nullable=False)
+    revenue = Column(Float, nullable=False)
+    completed_count = Column(Integer, nullable=False)
+    completion_seconds = Column(Float, nullable=False)
\ No newline at end of file
@@ -0,0 +1,268 @@
+"""Daily amenity rollups read by the reporting endpoints.
+
+amenity_daily_stats has one row per amenity and day, where the day is the
+one the order was placed on (UTC). A row holds the order count and revenue
+of the orders that are not cancelled. It also holds how many of them are
+completed and the sum of their completion times (completed_at minus
+created_at), which gives the average.
+
+Order writes do not touch it. In their own transaction they append the
+change to amenity_daily_stats_deltas, with one INSERT per request and no
+lock on shared rows. Creating an order adds it. Each status UPDATE also
+returns the previous status of its rows, which shows which orders moved
+into or out of "cancelled" and "completed". Every ROLLUP_INTERVAL,
+run_folding() sums the pending deltas into the rollup rows, so reports lag
+the orders by at most that long and never scan them.
+
+Rebuild the table from the orders after a backfill or a manual fix. A
+rebuild does not see writes made while it runs, so rebuild past days or
+pause order traffic first:
+
+    python -m app.rollups [--date-from YYYY-MM-DD] [--date-to YYYY-MM-DD]
+"""
+import os
+import sys
+import asyncio
+import logging
+import argparse
+from datetime import date, datetime, time, timedelta
+from typing import Dict, Iterable, Optional, Tuple
+
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy import delete, func, insert, tuple_
+from sqlalchemy.orm import Session
+
+from shared.bulk_import import dialect_insert
+
+from . import models
+from .database import SessionLocal, ASYNC_DATABASE, run_db
+
+logger = logging.getLogger(__name__)
+
+ROLLUP_INTERVAL = float(os.getenv("ROLLUP_INTERVAL", "10"))  # seconds
+ROLLUP_BATCH_SIZE = int(os.getenv("ROLLUP_BATCH_SIZE", "1000"))  # deltas folded per transaction
+REBUILD_BATCH_SIZE = 1000  # orders read per query
+UPSERT_BATCH_SIZE = 500  # rollup rows written per statement
+CANCELLED = "cancelled"
+COMPLETED = "completed"
+
+_COUNTERS = ("order_count", "revenue", "completed_count", "completion_seconds")
+
+class StatsDeltas:
+    """Changes to rollup rows, summed per (day, amenity_id) before writing"""
+
+    def __init__(self):
+        self.rows: Dict[Tuple[date, str], dict] = {}
+
+    def _row(self, day: date, amenity_id: str, amenity_name: Optional[str], category: Optional[str]) -> dict:
+        row = self.rows.get((day, amenity_id))
+        if row is None:
+            row = self.rows[(day, amenity_id)] = {
+                "day": day,
+                "amenity_id": amenity_id,
+                "amenity_name": amenity_name,
+                "category": category,
+                **{name: 0 for name in _COUNTERS}
+            }
+        else:
+            row["amenity_name"] = row["amenity_name"] or amenity_name
+            row["category"] = row["category"] or category
+        return row
+
+    def _order_row(self, order, categories: Optional[Dict[str, str]]) -> dict:
+        return self._row(
+            order.created_at.date(), order.amenity_id, order.amenity_name,
+            (categories or {}).get(order.amenity_id)
+        )
+
+    def add_order(self, order, sign: int, categories: Optional[Dict[str, str]] = None):
+        row = self._order_row(order, categories)
+        row["order_count"] += sign
+        row["revenue"] += sign * (order.total_amount or 0.0)
+
+    def add_completion(self, order, sign: int, categories: Optional[Dict[str, str]] = None):
+        if order.completed_at is None:
+            return
+        row = self._order_row(order, categories)
+        row["completed_count"] += sign
+        row["completion_seconds"] += sign * (order.completed_at - order.created_at).total_seconds()
+
+    def add_delta(self, delta: models.AmenityDailyStatsDelta):
+        row = self._row(delta.day, delta.amenity_id, delta.amenity_name, delta.category)
+        for name in _COUNTERS:
+            row[name] += getattr(delta, name)
+
+    def changed_rows(self):
+        # Primary key order: concurrent folds lock shared rollup rows in the same order
+        return [
+            self.rows[key] for key in sorted(self.rows)
+            if self.rows[key]["order_count"] or self.rows[key]["completed_count"]
+        ]
+
+    def fill_categories(self, db: Session):
+        """Look up the categories that status changes could not journal; one query"""
+        missing = {row["amenity_id"] for row in self.rows.values() if row["category"] is None}
+        if not missing:
+            return
+        categories = dict(db.query(models.Amenity.id, models.Amenity.category).filter(models.Amenity.id.in_(missing)).all())
+        for row in self.rows.values():
+            row["category"] = row["category"] or categories.get(row["amenity_id"])
+
+    def stage(self, db: Session):
+        """Append the deltas to the journal in the caller's transaction; one INSERT"""
+        rows = self.changed_rows()
+        if rows:
+            db.execute(insert(models.AmenityDailyStatsDelta), rows)
+
+    def apply(self, db: Session):
+        """Add the deltas to the rollup rows, dropping rows that are back to zero"""
+        rows = self.changed_rows()
+        table = models.AmenityDailyStats.__table__
+        upsert = dialect_insert(db)
+
+        for start in range(0, len(rows), UPSERT_BATCH_SIZE):
+            batch = rows[start:start + UPSERT_BATCH_SIZE]
+            stmt = upsert(table).values(batch)
+            db.execute(stmt.on_conflict_do_update(
+                index_elements=[table.c.day, table.c.amenity_id],
+                set_={
+                    "amenity_name": func.coalesce(table.c.amenity_name, stmt.excluded.amenity_name),
+                    "category": func.coalesce(table.c.category, stmt.excluded.category),
+                    **{name: table.c[name] + stmt.excluded[name] for name in _COUNTERS}
+                }
+            ))
+            db.execute(delete(table).where(
+                tuple_(table.c.day, table.c.amenity_id).in_([(row["day"], row["amenity_id"]) for row in batch]),
+                table.c.order_count == 0,
+                table.c.completed_count == 0
+            ))
+
+def order_created(db: Session, order: models.AmenityOrder, amenity: models.Amenity):
+    """Journal a new order; call before committing it"""
+    deltas = StatsDeltas()
+    deltas.add_order(order, 1, {amenity.id: amenity.category})
+    deltas.stage(db)
+
+def status_changed(db: Session, orders: Iterable):
+    """Journal status changes; orders are rows returned by the UPDATE, with previous_status"""
+    deltas = StatsDeltas()
+    for order in orders:
+        was_cancelled = order.previous_status == CANCELLED
+        if was_cancelled != (order.status == CANCELLED):
+            deltas.add_order(order, 1 if was_cancelled else -1)
+        # Leaving "completed" keeps completed_at, so the same duration is taken back
+        was_completed = order.previous_status == COMPLETED
+        if was_completed != (order.status == COMPLETED):
+            deltas.add_completion(order, -1 if was_completed else 1)
+    deltas.stage(db)
+
+def fold_pending(db: Session, batch_size: int = ROLLUP_BATCH_SIZE) -> int:
+    """Sum journaled deltas into the rollup rows, one committed batch at a time.
+
+    Returns the number of deltas folded. SKIP LOCKED lets folds in several
+    workers/replicas split the journal without folding a delta twice.
+    """
+    journal = models.AmenityDailyStatsDelta
+    folded = 0
+    while True:
+        pending = db.query(journal).limit(batch_size).with_for_update(skip_locked=True).all()
+        if not pending:
+            return folded
+
+        deltas = StatsDeltas()
+        for delta in pending:
+            deltas.add_delta(delta)
+        deltas.fill_categories(db)
+        deltas.apply(db)
+        db.execute(delete(journal).where(journal.id.in_([delta.id for delta in pending])))
+        db.commit()
+        folded += len(pending)
+        if len(pending) < batch_size:
+            return folded
+
+async def run_folding():
+    """Fold the journal periodically; runs as a background task of the app"""
+    while True:
+        await asyncio.sleep(ROLLUP_INTERVAL)
+        db = SessionLocal()
+        try:
+            folded = await run_db(db, fold_pending)
+            logger.debug("Folded %d daily amenity deltas", folded)
+        except asyncio.CancelledError:
+            raise
+        except Exception:
+            logger.warning("Daily amenity rollup failed", exc_info=True)
+        finally:
+            if ASYNC_DATABASE:
+                await db.close()
+            else:
+                await run_in_threadpool(db.close)
+
+def _days_between(column, date_from: Optional[date], date_to: Optional[date]):
+    criteria = []
+    if date_from:
+        criteria.append(column >= date_from)
+    if date_to:
+        criteria.append(column <= date_to)
+    return criteria
+
+def rebuild(db: Session, date_from: Optional[date] = None, date_to: Optional[date] = None) -> int:
+    """Recompute the rollup rows of a range of days from the orders, returning the row count"""
+    order = models.AmenityOrder
+    criteria = []
+    if date_from:
+        criteria.append(order.created_at >= datetime.combine(date_from, time.min))
+    if date_to:
+        criteria.append(order.created_at < datetime.combine(date_to + timedelta(days=1), time.min))
+
+    categories = dict(db.query(models.Amenity.id, models.Amenity.category).all())
+    deltas = StatsDeltas()
+    last_id = ""
+    # Keyset batches by id: the order of the orders does not matter for sums
+    while True:
+        batch = db.query(
+            order.id, order.amenity_id, order.amenity_name, order.status,
+            order.total_amount, order.created_at, order.completed_at
+        ).filter(
+            order.id > last_id,
+            order.status != CANCELLED,
+            *criteria
+        ).order_by(order.id).limit(REBUILD_BATCH_SIZE).all()
+        if not batch:
+            break
+        for row in batch:
+            deltas.add_order(row, 1, categories)
+            if row.status == COMPLETED:
+                deltas.add_completion(row, 1, categories)
+        last_id = batch[-1].id
+
+    # Pending deltas of these days are already reflected in the orders read above
+    for table in (models.AmenityDailyStatsDelta, models.AmenityDailyStats):
+        db.execute(delete(table).where(*_days_between(table.day, date_from, date_to)))
+    deltas.apply(db)
+    db.commit()
+    return len(deltas.changed_rows())
+
+async def _main(argv) -> int:
+    from .database import dispose_engine
+
+    parser = argparse.ArgumentParser(prog="python -m app.rollups", description="Rebuild the daily amenity rollups")
+    parser.add_argument("--date-from", type=date.fromisoformat)
+    parser.add_argument("--date-to", type=date.fromisoformat)
+    args = parser.parse_args(argv)
+
+    db = SessionLocal()
+    try:
+        count = await run_db(db, rebuild, args.date_from, args.date_to)
+    finally:
+        if ASYNC_DATABASE:
+            await db.close()
+        else:
+            db.close()
+        await dispose_engine()
+
+    print(f"✅ Rebuilt {count} daily amenity rows")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(asyncio.run(_main(sys.argv[1:])))
@@ -1,44 +1,93 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, Request, Response, status
+from fastapi.responses import StreamingResponse
+from sqlalchemy import case, func
 from sqlalchemy.orm import Session
-from typing import List
-from datetime import datetime
+from typing import List, Optional
+import uuid
+from datetime import date, datetime, time, timedelta
 
-from .database import get_db
-from . import models, schemas
+from shared.bulk_import import CatalogError, detect_format, parse_catalog
+from shared.caching import CATALOG_CACHE_CONTROL, etag_matches
+from shared.idempotency import IdempotentRequest, commit_with_response, create_store, replay_stored
+from shared.instrumentation import query_budget
+from shared.outbox import record_event
+from shared.pagination import paginate, DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE, NEXT_CURSOR_HEADER
+from shared.rabbitmq import EventTypes
+from shared.responses import rows_response
+from shared.streaming import SSE_HEADERS, format_event, guest_topic, order_events, order_topic
+from shared.updates import update_returning_previous
+
+from .database import DBSession, get_db, run_db
+from . import models, rollups, schemas
+from .cache import amenity_cache
+from .bulk_import import import_catalog
 
 router = APIRouter(prefix="/api", tags=["amenities"])
 
+idempotency_store = create_store(models.IdempotencyKey)
+
+ORDER_STATUSES = ["requested", "assigned", "in_progress", "completed", "cancelled"]
+FINAL_ORDER_STATUSES = {"completed", "cancelled"}
+# Most ids accepted by one bulk update
+MAX_BULK_IDS = 500
+# Days covered by a report when no date_from is given
+DEFAULT_REPORT_DAYS = 30
+
 # Amenity Endpoints
 @router.get("/amenities", response_model=List[schemas.AmenityResponse])
-def get_amenities(
+@query_budget(1)
+async def get_amenities(
+    request: Request,
     category: str = None,
     available: bool = True,
-    db: Session = Depends(get_db)
+    db: DBSession = Depends(get_db)
 ):
     """Get list of amenities with optional filtering"""
-    query = db.query(models.Amenity)
-    
-    if available:
-        query = query.filter(models.Amenity.available == True)
+    snapshot = amenity_cache.peek(category, available) or await run_db(db, amenity_cache.get, category, available)
+    headers = {"ETag": snapshot.etag, "Cache-Control": CATALOG_CACHE_CONTROL}
     
-    if category:
-        query = query.filter(models.Amenity.category == category)
+    if etag_matches(request.headers.get("if-none-match"), snapshot.etag):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
     
-    return query.order_by(models.Amenity.category, models.Amenity.name).all()
+    return Response(content=snapshot.body, media_type="application/json", headers=headers)
 
-@router.post("/amenities", response_model=schemas.AmenityResponse)
-def create_amenity(amenity: schemas.AmenityCreate, db: Session = Depends(get_db)):
-    """Create new amenity (admin only)"""
+def _create_amenity(db: Session, amenity: schemas.AmenityCreate):
     db_amenity = models.Amenity(**amenity.dict())
     db.add(db_amenity)
     db.commit()
-    db.refresh(db_amenity)
+    amenity_cache.invalidate()
     return db_amenity
 
+@router.post("/amenities", response_model=schemas.AmenityResponse)
+@query_budget(1)
+async def create_amenity(amenity: schemas.AmenityCreate, db: DBSession = Depends(get_db)):
+    """Create new amenity (admin only)"""
+    return await run_db(db, _create_amenity, amenity)
+
+@router.post("/amenities/bulk", response_model=schemas.BulkImportResponse)
+async def import_amenities(request: Request, format: str = None, db: DBSession = Depends(get_db)):
+    """Upsert a JSON, NDJSON or CSV amenity catalog (admin only)
+    
+    The format comes from the format query parameter or the Content-Type header.
+    Invalid rows are skipped and listed by index under "errors"; the valid
+    ones are imported.
+    """
+    content = await request.body()
+    try:
+        rows = parse_catalog(content, format or detect_format(request.headers.get("content-type")))
+        result = await run_db(db, import_catalog, rows)
+    except CatalogError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    
+    return result
+
 # Amenity Order Endpoints
-@router.post("/amenity-orders", response_model=schemas.AmenityOrderResponse)
-def create_amenity_order(order: schemas.AmenityOrderCreate, db: Session = Depends(get_db)):
-    """Create new amenity order"""
+def _create_amenity_order(db: Session, order: schemas.AmenityOrderCreate, idempotency: Optional[IdempotentRequest] = None):
+    # A retry gets the first attempt's response without touching amenities or orders
+    replayed = replay_stored(db, idempotency)
+    if replayed is not None:
+        return replayed
+    
     # Get amenity details
     amenity = db.query(models.Amenity).filter(
         models.Amenity.id == order.amenity_id,
@@ -53,6 +102,7 @@ def create_amenity_order(order: schemas.AmenityOrderCreate, db: Session = Depend
     
     # Create order
     db_order = models.AmenityOrder(
+        id=str(uuid.uuid4()),
         guest_id=order.guest_id,
         guest_name=order.guest_name,
         amenity_id=amenity.id,
@@ -60,36 +110,125 @@ def create_amenity_order(order: schemas.AmenityOrderCreate, db: Session = Depend
         total_amount=amenity.price,
         scheduled_for=order.scheduled_for,
         guest_notes=order.guest_notes,
-        status="requested"
+        status="requested",
+        created_at=datetime.utcnow()
     )
     
     db.add(db_order)
-    db.commit()
-    db.refresh(db_order)
-    
-    return {
+    rollups.order_created(db, db_order, amenity)
+    # Staged in the same transaction, published by the outbox relay
+    record_event(db, models.OutboxEvent, EventTypes.AMENITY_REQUESTED, {
+        "order_id": db_order.id,
+        "guest_id": order.guest_id,
+        "amenity_id": amenity.id,
+        "amenity_name": amenity.name,
+        "total_amount": amenity.price,
+        "scheduled_for": order.scheduled_for.isoformat()
+    })
+    response = {
         "order_id": db_order.id,
         "amenity_name": amenity.name,
         "status": db_order.status,
         "total_amount": amenity.price,
         "message": "Amenity order created successfully"
     }
+    
+    replayed = commit_with_response(db, idempotency, response)
+    if replayed is not None:
+        return replayed
+    
+    _publish_status(db_order)
+    return response
+
+@router.post("/amenity-orders", response_model=schemas.AmenityOrderResponse)
+@query_budget(6)
+async def create_amenity_order(
+    order: schemas.AmenityOrderCreate,
+    response: Response,
+    idempotency_key: Optional[str] = Header(None),
+    db: DBSession = Depends(get_db)
+):
+    """Create new amenity order.
+    
+    Send an Idempotency-Key header to make retries safe: a repeated key
+    returns the first response (with Idempotent-Replayed: true) instead of
+    creating another order.
+    """
+    idempotency = IdempotentRequest.from_header(idempotency_store, "amenity-orders", idempotency_key, order, response)
+    return await run_db(db, _create_amenity_order, order, idempotency)
+
+def _get_amenity_order(db: Session, order_id: str):
+    return db.query(models.AmenityOrder).filter(models.AmenityOrder.id == order_id).first()
 
 @router.get("/amenity-orders/{order_id}", response_model=schemas.AmenityOrderDetail)
-def get_amenity_order(order_id: str, db: Session = Depends(get_db)):
+@query_budget(1)
+async def get_amenity_order(order_id: str, db: DBSession = Depends(get_db)):
     """Get amenity order details"""
-    order = db.query(models.AmenityOrder).filter(models.AmenityOrder.id == order_id).first()
+    order = await run_db(db, _get_amenity_order, order_id)
     if not order:
         raise HTTPException(status_code=404, detail="Amenity order not found")
     return order
 
-@router.get("/amenity-orders", response_model=List[schemas.AmenityOrderDetail])
-def list_amenity_orders(
-    guest_id: str = None,
-    status: str = None,
-    db: Session = Depends(get_db)
-):
-    """List amenity orders with optional filtering"""
+def _status_frame(order: models.AmenityOrder) -> bytes:
+    return format_event("status", {
+        "order_id": order.id,
+        "guest_id": order.guest_id,
+        "status": order.status,
+        "assigned_to_name": order.assigned_to_name,
+        "updated_at": order.updated_at.isoformat(),
+        "completed_at": order.completed_at.isoformat() if order.completed_at else None
+    })
+
+def _publish_status(order: models.AmenityOrder):
+    """Push the committed state to the order's and the guest's SSE subscribers"""
+    order_events.publish(
+        [order_topic(order.id), guest_topic(order.guest_id)],
+        _status_frame(order),
+        final=order.status in FINAL_ORDER_STATUSES
+    )
+
+def _order_status_snapshot(db: Session, order_id: str):
+    order = db.query(models.AmenityOrder).filter(models.AmenityOrder.id == order_id).first()
+    if not order:
+        raise HTTPException(status_code=404, detail="Amenity order not found")
+    
+    snapshot = _status_frame(order), order.status in FINAL_ORDER_STATUSES
+    # Hand the connection back to the pool before the stream starts
+    db.close()
+    return snapshot
+
+@router.get("/amenity-orders/{order_id}/events", response_class=StreamingResponse)
+@query_budget(1)
+async def stream_amenity_order_status(order_id: str, db: DBSession = Depends(get_db)):
+    """Stream an amenity order's status changes as server-sent events.
+    
+    The current status is sent first; the stream ends once the order is
+    completed or cancelled.
+    """
+    subscription = order_events.subscribe(order_topic(order_id))
+    try:
+        current, final = await run_db(db, _order_status_snapshot, order_id)
+    except Exception:
+        subscription.close()
+        raise
+    
+    if final:
+        subscription.close()
+        return Response(content=current, media_type="text/event-stream", headers=SSE_HEADERS)
+    return StreamingResponse(
+        subscription.stream(current, close_on_final=True),
+        media_type="text/event-stream",
+        headers=SSE_HEADERS
+    )
+
+@router.get("/guests/{guest_id}/amenity-order-events", response_class=StreamingResponse)
+@query_budget(0)
+async def stream_guest_amenity_orders(guest_id: str):
+    """Stream status changes of all of a guest's amenity orders as server-sent events"""
+    subscription = order_events.subscribe(guest_topic(guest_id))
+    return StreamingResponse(subscription.stream(), media_type="text/event-stream", headers=SSE_HEADERS)
+
+def _list_amenity_orders(db: Session, guest_id: str, status: str, limit: int, cursor: str):
     query = db.query(models.AmenityOrder)
     
     if guest_id:
@@ -98,76 +237,330 @@ def list_amenity_orders(
     if status:
         query = query.filter(models.AmenityOrder.status == status)
     
-    return query.order_by(models.AmenityOrder.created_at.desc()).all()
+    keyset = [models.AmenityOrder.created_at, models.AmenityOrder.id]
+    return paginate(query, keyset, limit, cursor, descending=True)
+
+@router.get("/amenity-orders", response_model=List[schemas.AmenityOrderDetail])
+@query_budget(1)
+async def list_amenity_orders(
+    guest_id: str = None,
+    status: str = None,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    cursor: str = None,
+    db: DBSession = Depends(get_db)
+):
+    """List amenity orders with optional filtering, newest first.
+    
+    Pass the X-Next-Cursor response header back as cursor to fetch the next page.
+    """
+    orders, next_cursor = await run_db(db, _list_amenity_orders, guest_id, status, limit, cursor)
+    headers = {NEXT_CURSOR_HEADER: next_cursor} if next_cursor else None
+    return rows_response(orders, schemas.AmenityOrderDetail, headers)
+
+# Writes go through one UPDATE ... RETURNING per request, shared by the
+# single-order and bulk endpoints, so there is no SELECT before or refresh after
+def _bulk_update(db: Session, order_ids: List[str], values: dict, *criteria):
+    """Apply values to order_ids with one UPDATE ... RETURNING.
+    
+    The rows also carry previous_status, read in the same statement, which
+    tells the rollups what changed. Returns the updated rows and the ids
+    that did not match.
+    """
+    orders = update_returning_previous(db, models.AmenityOrder.__table__, order_ids, values, *criteria)
+    rollups.status_changed(db, orders)
+    updated = {order.id for order in orders}
+    return orders, [order_id for order_id in order_ids if order_id not in updated]
+
+def _completed_at(now: datetime):
+    """completed_at for an UPDATE that completes orders: ones already completed keep theirs"""
+    table = models.AmenityOrder.__table__
+    return case((table.c.status == "completed", table.c.completed_at), else_=now)
+
+def _commit_and_publish(db: Session, orders):
+    db.commit()
+    for order in orders:
+        _publish_status(order)
+
+def _check_status(new_status: str):
+    if new_status not in ORDER_STATUSES:
+        raise HTTPException(status_code=400, detail=f"Invalid status. Must be one of: {ORDER_STATUSES}")
+
+def _check_bulk_size(order_ids: List[str]):
+    if len(order_ids) > MAX_BULK_IDS:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail=f"At most {MAX_BULK_IDS} order ids per request"
+        )
+
+def _not_found(order_ids: List[str]) -> List[dict]:
+    return [{"id": order_id, "detail": "Amenity order not found"} for order_id in order_ids]
+
+def _assign(db: Session, order_ids: List[str], assignment: schemas.AssignmentRequest):
+    """Returns the assigned rows, the unmatched ids and which of those are completed"""
+    table = models.AmenityOrder.__table__
+    orders, unmatched = _bulk_update(db, order_ids, {
+        "assigned_to": assignment.staff_id,
+        "assigned_to_name": assignment.staff_name,
+        "status": "assigned",
+        "updated_at": datetime.utcnow()
+    }, table.c.status != "completed")
+    
+    # Only on the error path: tell completed orders apart from unknown ids
+    completed = set(db.execute(
+        table.select().with_only_columns(table.c.id).where(table.c.id.in_(unmatched))
+    ).scalars()) if unmatched else set()
+    
+    _commit_and_publish(db, orders)
+    return orders, unmatched, completed
+
+def _assign_amenity_order(db: Session, order_id: str, assignment: schemas.AssignmentRequest):
+    orders, _, completed = _assign(db, [order_id], assignment)
+    if completed:
+        raise HTTPException(status_code=400, detail="Cannot assign completed order")
+    if not orders:
+        raise HTTPException(status_code=404, detail="Amenity order not found")
+    return orders[0]
 
 @router.patch("/amenity-orders/{order_id}/assign", response_model=schemas.AmenityOrderDetail)
-def assign_amenity_order(
+@query_budget(3)
+async def assign_amenity_order(
     order_id: str,
     assignment: schemas.AssignmentRequest,
-    db: Session = Depends(get_db)
+    db: DBSession = Depends(get_db)
 ):
     """Assign staff member to amenity order"""
-    order = db.query(models.AmenityOrder).filter(models.AmenityOrder.id == order_id).first()
-    if not order:
-        raise HTTPException(status_code=404, detail="Amenity order not found")
-    
-    if order.status == "completed":
-        raise HTTPException(status_code=400, detail="Cannot assign completed order")
+    return await run_db(db, _assign_amenity_order, order_id, assignment)
+
+def _record_completed(db: Session, order: models.AmenityOrder):
+    """Stage AMENITY_COMPLETED; callers skip orders that were already completed"""
+    record_event(db, models.OutboxEvent, EventTypes.AMENITY_COMPLETED, {
+        "order_id": order.id,
+        "guest_id": order.guest_id,
+        "amenity_id": order.amenity_id,
+        "total_amount": order.total_amount,
+        "completed_at": order.completed_at.isoformat()
+    })
+
+def _set_status(db: Session, order_ids: List[str], new_status: str):
+    now = datetime.utcnow()
+    values = {"status": new_status, "updated_at": now}
     
-    order.assigned_to = assignment.staff_id
-    order.assigned_to_name = assignment.staff_name
-    order.status = "assigned"
-    order.updated_at = datetime.utcnow()
+    # Set completed_at timestamp if status is completed
+    if new_status == "completed":
+        values["completed_at"] = _completed_at(now)
     
-    db.commit()
-    db.refresh(order)
+    orders, unmatched = _bulk_update(db, order_ids, values)
+    if new_status == "completed":
+        for order in orders:
+            if order.previous_status != "completed":
+                _record_completed(db, order)
     
-    return order
+    _commit_and_publish(db, orders)
+    return orders, unmatched
+
+def _update_amenity_order_status(db: Session, order_id: str, status_update: schemas.StatusUpdate):
+    orders, _ = _set_status(db, [order_id], status_update.status)
+    if not orders:
+        raise HTTPException(status_code=404, detail="Amenity order not found")
+    return orders[0]
 
 @router.patch("/amenity-orders/{order_id}/status", response_model=schemas.AmenityOrderDetail)
-def update_amenity_order_status(
+@query_budget(3)
+async def update_amenity_order_status(
     order_id: str,
     status_update: schemas.StatusUpdate,
-    db: Session = Depends(get_db)
+    db: DBSession = Depends(get_db)
 ):
     """Update amenity order status"""
-    order = db.query(models.AmenityOrder).filter(models.AmenityOrder.id == order_id).first()
-    if not order:
-        raise HTTPException(status_code=404, detail="Amenity order not found")
-    
-    valid_statuses = ["requested", "assigned", "in_progress", "completed", "cancelled"]
-    if status_update.status not in valid_statuses:
-        raise HTTPException(status_code=400, detail=f"Invalid status. Must be one of: {valid_statuses}")
-    
-    order.status = status_update.status
-    order.updated_at = datetime.utcnow()
-    
-    # Set completed_at timestamp if status is completed
-    if status_update.status == "completed":
-        order.completed_at = datetime.utcnow()
-    
-    db.commit()
-    db.refresh(order)
+    _check_status(status_update.status)
+    return await run_db(db, _update_amenity_order_status, order_id, status_update)
+
+def _complete(db: Session, order_ids: List[str], completion: schemas.CompletionRequest):
+    now = datetime.utcnow()
+    orders, unmatched = _bulk_update(db, order_ids, {
+        "status": "completed",
+        "staff_notes": completion.notes,
+        "completed_at": _completed_at(now),
+        "updated_at": now
+    })
+    for order in orders:
+        if order.previous_status != "completed":
+            _record_completed(db, order)
     
-    return order
+    _commit_and_publish(db, orders)
+    return orders, unmatched
+
+def _complete_amenity_order(db: Session, order_id: str, completion: schemas.CompletionRequest):
+    orders, _ = _complete(db, [order_id], completion)
+    if not orders:
+        raise HTTPException(status_code=404, detail="Amenity order not found")
+    return orders[0]
 
 @router.patch("/amenity-orders/{order_id}/complete", response_model=schemas.AmenityOrderDetail)
-def complete_amenity_order(
+@query_budget(3)
+async def complete_amenity_order(
     order_id: str,
     completion: schemas.CompletionRequest,
-    db: Session = Depends(get_db)
+    db: DBSession = Depends(get_db)
 ):
     """Mark amenity order as completed"""
-    order = db.query(models.AmenityOrder).filter(models.AmenityOrder.id == order_id).first()
-    if not order:
-        raise HTTPException(status_code=404, detail="Amenity order not found")
+    return await run_db(db, _complete_amenity_order, order_id, completion)
+
+# Bulk Amenity Order Endpoints
+def _assign_amenity_orders(db: Session, bulk: schemas.BulkAssignmentRequest):
+    orders, unmatched, completed = _assign(db, list(dict.fromkeys(bulk.order_ids)), bulk)
+    errors = [
+        {"id": order_id, "detail": "Cannot assign completed order"}
+        for order_id in unmatched if order_id in completed
+    ] + _not_found([order_id for order_id in unmatched if order_id not in completed])
+    return {"updated": orders, "errors": errors}
+
+@router.patch("/amenity-orders/assign", response_model=schemas.BulkAmenityOrderUpdateResponse)
+@query_budget(3)
+async def assign_amenity_orders(bulk: schemas.BulkAssignmentRequest, db: DBSession = Depends(get_db)):
+    """Assign a staff member to several amenity orders in one transaction.
     
-    order.status = "completed"
-    order.staff_notes = completion.notes
-    order.completed_at = datetime.utcnow()
-    order.updated_at = datetime.utcnow()
+    Completed and unknown orders are reported in errors; the others are assigned.
+    """
+    _check_bulk_size(bulk.order_ids)
+    return await run_db(db, _assign_amenity_orders, bulk)
+
+def _update_amenity_orders_status(db: Session, bulk: schemas.BulkStatusUpdate):
+    orders, unmatched = _set_status(db, list(dict.fromkeys(bulk.order_ids)), bulk.status)
+    return {"updated": orders, "errors": _not_found(unmatched)}
+
+@router.patch("/amenity-orders/status", response_model=schemas.BulkAmenityOrderUpdateResponse)
+@query_budget(3)
+async def update_amenity_orders_status(bulk: schemas.BulkStatusUpdate, db: DBSession = Depends(get_db)):
+    """Set the status of several amenity orders in one transaction.
     
-    db.commit()
-    db.refresh(order)
+    Ids that do not exist are reported in errors; the others are updated.
+    """
+    _check_status(bulk.status)
+    _check_bulk_size(bulk.order_ids)
+    return await run_db(db, _update_amenity_orders_status, bulk)
+
+def _complete_amenity_orders(db: Session, bulk: schemas.BulkCompletionRequest):
+    orders, unmatched = _complete(db, list(dict.fromkeys(bulk.order_ids)), bulk)
+    return {"updated": orders, "errors": _not_found(unmatched)}
+
+@router.patch("/amenity-orders/complete", response_model=schemas.BulkAmenityOrderUpdateResponse)
+@query_budget(3)
+async def complete_amenity_orders(bulk: schemas.BulkCompletionRequest, db: DBSession = Depends(get_db)):
+    """Mark several amenity orders as completed in one transaction"""
+    _check_bulk_size(bulk.order_ids)
+    return await run_db(db, _complete_amenity_orders, bulk)
+
+# Guest Spend Endpoints
+def _created_between(column, date_from: Optional[date], date_to: Optional[date]):
+    """created_at filters for an inclusive range of days"""
+    criteria = []
+    if date_from:
+        criteria.append(column >= datetime.combine(date_from, time.min))
+    if date_to:
+        criteria.append(column < datetime.combine(date_to + timedelta(days=1), time.min))
+    return criteria
+
+def _spend_summary(guest_id: Optional[str], date_from: Optional[date], date_to: Optional[date], rows) -> dict:
+    groups = [
+        {"status": order_status, "category": category, "order_count": count, "total_amount": total or 0.0}
+        for order_status, category, count, total in rows
+    ]
+    return {
+        "guest_id": guest_id,
+        "date_from": date_from,
+        "date_to": date_to,
+        "order_count": sum(group["order_count"] for group in groups),
+        "billable_amount": sum(group["total_amount"] for group in groups if group["status"] != "cancelled"),
+        "groups": groups
+    }
+
+def _spend_groups(db: Session, guest_id: Optional[str], date_from: Optional[date], date_to: Optional[date]):
+    order, amenity = models.AmenityOrder, models.Amenity
+    query = db.query(order.status, amenity.category, func.count(), func.sum(order.total_amount)).outerjoin(
+        amenity, amenity.id == order.amenity_id
+    )
+    if guest_id:
+        query = query.filter(order.guest_id == guest_id)
+    query = query.filter(*_created_between(order.created_at, date_from, date_to))
+    return query.group_by(order.status, amenity.category).all()
+
+@router.get("/spend-summary", response_model=schemas.SpendSummary)
+@query_budget(1)
+async def get_spend_summary(
+    guest_id: str = None,
+    date_from: date = None,
+    date_to: date = None,
+    db: DBSession = Depends(get_db)
+):
+    """Amenity order count and spend of a guest and/or date range, by status and category.
+    
+    Aggregated in the database, so building a folio does not page through
+    the guest's orders.
+    """
+    if not guest_id and not date_from:
+        raise HTTPException(status_code=400, detail="Pass guest_id, date_from or both")
+    
+    rows = await run_db(db, _spend_groups, guest_id, date_from, date_to)
+    return _spend_summary(guest_id, date_from, date_to, rows)
+
+# Report Endpoints
+def _report_range(date_from: Optional[date], date_to: Optional[date]):
+    date_to = date_to or datetime.utcnow().date()
+    date_from = date_from or date_to - timedelta(days=DEFAULT_REPORT_DAYS - 1)
+    if date_from > date_to:
+        raise HTTPException(status_code=400, detail="date_from must not be after date_to")
+    return date_from, date_to
+
+def _revenue_by_category(db: Session, date_from: date, date_to: date):
+    stats = models.AmenityDailyStats
+    return db.query(
+        stats.day,
+        stats.category,
+        func.sum(stats.order_count).label("order_count"),
+        func.sum(stats.revenue).label("revenue")
+    ).filter(
+        stats.day.between(date_from, date_to)
+    ).group_by(stats.day, stats.category).order_by(stats.day, stats.category).all()
+
+@router.get("/reports/revenue", response_model=List[schemas.CategoryRevenue])
+@query_budget(1)
+async def get_revenue_report(date_from: date = None, date_to: date = None, db: DBSession = Depends(get_db)):
+    """Amenity orders and revenue per category per day, cancelled orders excluded.
+    
+    Defaults to the last 30 days. Read from the daily rollups, so the cost
+    does not grow with the number of orders.
+    """
+    date_from, date_to = _report_range(date_from, date_to)
+    return rows_response(await run_db(db, _revenue_by_category, date_from, date_to), schemas.CategoryRevenue)
+
+def _amenity_report(db: Session, date_from: date, date_to: date):
+    stats, amenity = models.AmenityDailyStats, models.Amenity
+    order_count = func.sum(stats.order_count)
+    completed_count = func.sum(stats.completed_count)
+    # Joins the catalog for each amenity's duration, not the orders
+    return db.query(
+        stats.amenity_id,
+        func.max(stats.amenity_name).label("amenity_name"),
+        func.max(stats.category).label("category"),
+        order_count.label("order_count"),
+        func.sum(stats.revenue).label("revenue"),
+        (order_count * func.max(amenity.duration_minutes)).label("booked_minutes"),
+        completed_count.label("completed_count"),
+        (func.sum(stats.completion_seconds) / func.nullif(completed_count, 0) / 60).label("average_completion_minutes")
+    ).outerjoin(
+        amenity, amenity.id == stats.amenity_id
+    ).filter(
+        stats.day.between(date_from, date_to)
+    ).group_by(stats.amenity_id).order_by(order_count.desc(), stats.amenity_id).all()
+
+@router.get("/reports/amenities", response_model=List[schemas.AmenityReport])
+@query_budget(1)
+async def get_amenity_report(date_from: date = None, date_to: date = None, db: DBSession = Depends(get_db)):
+    """Utilization and average completion time per amenity over a range of days (default the last 30).
     
-    return order
\ No newline at end of file
+    Busiest amenities first. Completion time runs from order creation to
+    completion, averaged over the completed orders.
+    """
+    date_from, date_to = _report_range(date_from, date_to)
+    return rows_response(await run_db(db, _amenity_report, date_from, date_to), schemas.AmenityReport)
\ No newline at end of file
@@ -1,6 +1,6 @@
 from pydantic import BaseModel
-from typing import List, Optional
-from datetime import datetime
+from typing import Any, Dict, List, Optional
+from datetime import date, datetime
 
 # Amenity Schemas
 class AmenityBase(BaseModel):
@@ -22,6 +22,15 @@ class AmenityResponse(AmenityBase):
     class Config:
         from_attributes = True
 
+class ImportRowError(BaseModel):
+    row: int  # index in the catalog, from 0
+    errors: List[Dict[str, Any]]
+
+class BulkImportResponse(BaseModel):
+    imported: int
+    rejected: int
+    errors: List[ImportRowError]  # the first MAX_REPORTED_ERRORS rejected rows
+
 # Amenity Order Schemas
 class AmenityOrderCreate(BaseModel):
     guest_id: str
@@ -68,4 +77,54 @@ class CompletionRequest(BaseModel):
 
 # Status Update Schemas
 class StatusUpdate(BaseModel):
-    status: str
\ No newline at end of file
+    status: str
+
+# Bulk Update Schemas
+class BulkAssignmentRequest(AssignmentRequest):
+    order_ids: List[str]
+
+class BulkStatusUpdate(StatusUpdate):
+    order_ids: List[str]
+
+class BulkCompletionRequest(CompletionRequest):
+    order_ids: List[str]
+
+class BulkUpdateError(BaseModel):
+    id: str
+    detail: str
+
+class BulkAmenityOrderUpdateResponse(BaseModel):
+    updated: List[AmenityOrderDetail]
+    errors: List[BulkUpdateError]  # ids that were not updated, and why
+
+# Spend Summary Schemas
+class SpendGroup(BaseModel):
+    status: str
+    category: Optional[str]  # the amenity's category
+    order_count: int
+    total_amount: float
+
+class SpendSummary(BaseModel):
+    guest_id: Optional[str]
+    date_from: Optional[date]
+    date_to: Optional[date]
+    order_count: int
+    billable_amount: float  # every status except cancelled
+    groups: List[SpendGroup]
+
+# Report Schemas
+class CategoryRevenue(BaseModel):
+    day: date
+    category: Optional[str]  # the amenity's category
+    order_count: int
+    revenue: float
+
+class AmenityReport(BaseModel):
+    amenity_id: str
+    amenity_name: Optional[str]
+    category: Optional[str]
+    order_count: int  # cancelled orders excluded
+    revenue: float
+    booked_minutes: Optional[int]  # order_count times the amenity's duration
+    completed_count: int
+    average_completion_minutes: Optional[float]
\ No newline at end of file
@@ -0,0 +1,31 @@
+"""GET /api/amenities carries an ETag and Cache-Control, and revalidates with If-None-Match"""
+from shared.caching import CATALOG_CACHE_CONTROL
+
+def test_amenities_carry_etag_and_cache_control(client, amenity):
+    amenity()
+
+    response = client.get("/api/amenities")
+
+    assert response.status_code == 200
+    assert response.headers["etag"].startswith('"')
+    assert response.headers["cache-control"] == CATALOG_CACHE_CONTROL
+
+def test_matching_etag_gets_empty_304(client, amenity):
+    amenity()
+    etag = client.get("/api/amenities").headers["etag"]
+
+    response = client.get("/api/amenities", headers={"If-None-Match": etag})
+
+    assert response.status_code == 304
+    assert response.content == b""
+    assert response.headers["etag"] == etag
+
+def test_etag_changes_after_an_amenity_write(client, amenity):
+    etag = client.get("/api/amenities", params={"category": "airport"}).headers["etag"]
+
+    amenity("Airport transfer", 60.0, "airport")
+    response = client.get("/api/amenities", params={"category": "airport"}, headers={"If-None-Match": etag})
+
+    assert response.status_code == 200
+    assert response.headers["etag"] != etag
+    assert [a["name"] for a in response.json()] == ["Airport transfer"]
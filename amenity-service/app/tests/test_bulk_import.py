@@ -0,0 +1,23 @@
+"""Bulk amenity import: upserts by (category, name), skips and reports invalid rows"""
+
+CATEGORY = "import-test"
+CATALOG_NDJSON = f"""{{"name": "Massage", "price": 90, "category": "{CATEGORY}", "duration_minutes": 60}}
+{{"name": "Sauna", "price": 20, "category": "{CATEGORY}", "duration_minutes": 30}}
+{{"name": "Yoga", "price": "free", "category": "{CATEGORY}", "duration_minutes": 45}}
+"""
+
+def _imported(client):
+    return {a["name"]: a for a in client.get("/api/amenities", params={"category": CATEGORY}).json()}
+
+def test_import_is_idempotent_and_reports_invalid_rows(client):
+    first = client.post("/api/amenities/bulk", content=CATALOG_NDJSON, headers={"Content-Type": "application/x-ndjson"})
+    ids = {name: amenity["id"] for name, amenity in _imported(client).items()}
+    second = client.post("/api/amenities/bulk", content=CATALOG_NDJSON, params={"format": "ndjson"})
+
+    for response in (first, second):
+        assert response.status_code == 200
+        body = response.json()
+        assert (body["imported"], body["rejected"]) == (2, 1)
+        assert [(error["row"], error["errors"][0]["loc"]) for error in body["errors"]] == [(2, ["price"])]
+    assert sorted(ids) == ["Massage", "Sauna"]
+    assert {name: amenity["id"] for name, amenity in _imported(client).items()} == ids
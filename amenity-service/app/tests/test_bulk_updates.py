@@ -0,0 +1,69 @@
+"""Bulk assign, status and complete apply to the valid ids and report the rest"""
+from app.routers import MAX_BULK_IDS
+
+def _order(client, order_id):
+    return client.get(f"/api/amenity-orders/{order_id}").json()
+
+def test_bulk_status_reports_unknown_ids(client, amenity_order):
+    first, second = amenity_order()["order_id"], amenity_order()["order_id"]
+
+    response = client.patch("/api/amenity-orders/status", json={
+        "order_ids": [first, "missing-order", second, second],
+        "status": "in_progress"
+    })
+
+    assert response.status_code == 200
+    body = response.json()
+    assert sorted(o["id"] for o in body["updated"]) == sorted([first, second])
+    assert body["errors"] == [{"id": "missing-order", "detail": "Amenity order not found"}]
+    assert _order(client, first)["status"] == _order(client, second)["status"] == "in_progress"
+
+def test_bulk_assign_skips_completed_and_unknown_orders(client, amenity_order):
+    open_order = amenity_order()["order_id"]
+    done = amenity_order()["order_id"]
+    client.patch(f"/api/amenity-orders/{done}/complete", json={})
+
+    response = client.patch("/api/amenity-orders/assign", json={
+        "order_ids": [open_order, done, "missing-order"],
+        "staff_id": "s1",
+        "staff_name": "Staff One"
+    })
+
+    assert response.status_code == 200
+    body = response.json()
+    assert [o["id"] for o in body["updated"]] == [open_order]
+    assert body["errors"] == [
+        {"id": done, "detail": "Cannot assign completed order"},
+        {"id": "missing-order", "detail": "Amenity order not found"}
+    ]
+    assigned = _order(client, open_order)
+    assert (assigned["status"], assigned["assigned_to"], assigned["assigned_to_name"]) == ("assigned", "s1", "Staff One")
+    completed = _order(client, done)
+    assert (completed["status"], completed["assigned_to"]) == ("completed", None)
+
+def test_bulk_complete_keeps_earlier_completion_times(client, amenity_order):
+    open_order = amenity_order()["order_id"]
+    done = amenity_order()["order_id"]
+    completed_at = client.patch(f"/api/amenity-orders/{done}/complete", json={}).json()["completed_at"]
+
+    response = client.patch("/api/amenity-orders/complete", json={
+        "order_ids": [open_order, done, "missing-order"],
+        "notes": "all done"
+    })
+
+    assert response.status_code == 200
+    body = response.json()
+    assert sorted(o["id"] for o in body["updated"]) == sorted([open_order, done])
+    assert body["errors"] == [{"id": "missing-order", "detail": "Amenity order not found"}]
+    assert _order(client, open_order)["status"] == "completed"
+    assert _order(client, open_order)["completed_at"] is not None
+    assert _order(client, done)["completed_at"] == completed_at
+    assert _order(client, done)["staff_notes"] == "all done"
+
+def test_bulk_requests_are_capped(client):
+    response = client.patch("/api/amenity-orders/status", json={
+        "order_ids": [f"order-{n}" for n in range(MAX_BULK_IDS + 1)],
+        "status": "in_progress"
+    })
+
+    assert response.status_code == 422
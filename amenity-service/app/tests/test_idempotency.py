@@ -0,0 +1,54 @@
+"""Idempotency-Key handling of amenity order creation"""
+import uuid
+
+from shared.idempotency import MAX_KEY_LENGTH, REPLAYED_HEADER
+
+def _order_body(amenity, guest_id, notes=None):
+    return {
+        "guest_id": guest_id,
+        "guest_name": "Guest",
+        "amenity_id": amenity["id"],
+        "scheduled_for": "2030-06-01T10:00:00",
+        "guest_notes": notes
+    }
+
+def test_retry_replays_the_stored_response(client, amenity):
+    guest_id = f"guest-{uuid.uuid4()}"
+    body = _order_body(amenity(), guest_id)
+    headers = {"Idempotency-Key": str(uuid.uuid4())}
+
+    first = client.post("/api/amenity-orders", json=body, headers=headers)
+    retry = client.post("/api/amenity-orders", json=body, headers=headers)
+
+    assert first.status_code == retry.status_code == 200
+    assert REPLAYED_HEADER not in first.headers
+    assert retry.headers[REPLAYED_HEADER] == "true"
+    assert retry.json() == first.json()
+    assert len(client.get("/api/amenity-orders", params={"guest_id": guest_id}).json()) == 1
+
+def test_key_reused_with_another_body_is_rejected(client, amenity):
+    item = amenity()
+    headers = {"Idempotency-Key": str(uuid.uuid4())}
+
+    first = client.post("/api/amenity-orders", json=_order_body(item, "guest-1"), headers=headers)
+    reused = client.post("/api/amenity-orders", json=_order_body(item, "guest-1", notes="late"), headers=headers)
+
+    assert first.status_code == 200
+    assert reused.status_code == 422
+    assert REPLAYED_HEADER not in reused.headers
+
+def test_distinct_keys_create_distinct_orders(client, amenity):
+    item = amenity()
+    first = client.post("/api/amenity-orders", json=_order_body(item, "guest-1"), headers={"Idempotency-Key": str(uuid.uuid4())})
+    second = client.post("/api/amenity-orders", json=_order_body(item, "guest-1"), headers={"Idempotency-Key": str(uuid.uuid4())})
+
+    assert first.json()["order_id"] != second.json()["order_id"]
+
+def test_overlong_key_is_rejected(client, amenity):
+    response = client.post(
+        "/api/amenity-orders",
+        json=_order_body(amenity(), "guest-1"),
+        headers={"Idempotency-Key": "k" * (MAX_KEY_LENGTH + 1)}
+    )
+
+    assert response.status_code == 400
@@ -0,0 +1,81 @@
+"""Every budgeted route stays within its @query_budget.
+
+conftest turns on DB_QUERY_BUDGET_STRICT, so a route over budget raises
+QueryBudgetExceeded out of the TestClient call.
+"""
+import pytest
+
+from app.main import app
+
+# (method, route, request options); "json" names a seeded body when it is a
+# string, and "order" picks the seeded order that fills {order_id}
+BUDGETED_CALLS = [
+    ("GET", "/api/amenities", {}),
+    ("POST", "/api/amenities", {"json": {"name": "Taxi", "price": 40.0, "category": "transport", "duration_minutes": 20}}),
+    ("POST", "/api/amenity-orders", {"json": "order"}),
+    ("GET", "/api/amenity-orders/{order_id}", {}),
+    ("GET", "/api/amenity-orders/{order_id}/events", {"order": "completed_order_id"}),
+    ("GET", "/api/amenity-orders", {"params": {"guest_id": "budget-guest", "limit": 2}}),
+    ("PATCH", "/api/amenity-orders/{order_id}/assign", {"json": {"staff_id": "s1", "staff_name": "Staff"}}),
+    ("PATCH", "/api/amenity-orders/{order_id}/status", {"json": {"status": "in_progress"}, "order": "status_order_id"}),
+    ("PATCH", "/api/amenity-orders/{order_id}/complete", {"json": {"notes": "done"}, "order": "complete_order_id"}),
+    ("PATCH", "/api/amenity-orders/assign", {"json": "bulk_assign"}),
+    ("PATCH", "/api/amenity-orders/status", {"json": "bulk_status"}),
+    ("PATCH", "/api/amenity-orders/complete", {"json": "bulk_complete"}),
+    ("GET", "/api/spend-summary", {"params": {"guest_id": "budget-guest"}}),
+    ("GET", "/api/reports/revenue", {}),
+    ("GET", "/api/reports/amenities", {}),
+]
+
+# Streams that never end on their own; their budget is covered by the route table check
+UNBOUNDED_STREAMS = {("GET", "/api/guests/{guest_id}/amenity-order-events")}
+
+def _budgeted_routes():
+    return {
+        (method, route.path)
+        for route in app.routes
+        if getattr(getattr(route, "endpoint", None), "query_budget", None) is not None
+        for method in route.methods
+    }
+
+@pytest.fixture(scope="module")
+def seeded(client):
+    amenity = client.post("/api/amenities", json={
+        "name": "Spa", "price": 100.0, "category": "wellness", "duration_minutes": 30
+    }).json()
+    order_body = {
+        "guest_id": "budget-guest",
+        "guest_name": "Budget Guest",
+        "amenity_id": amenity["id"],
+        "scheduled_for": "2030-06-01T10:00:00"
+    }
+    order_ids = [client.post("/api/amenity-orders", json=order_body).json()["order_id"] for _ in range(10)]
+    # A completed order's stream is answered with the final status and closed
+    client.patch(f"/api/amenity-orders/{order_ids[1]}/complete", json={})
+    return {
+        "order_id": order_ids[0],
+        "completed_order_id": order_ids[1],
+        "status_order_id": order_ids[2],
+        "complete_order_id": order_ids[3],
+        "order": order_body,
+        "bulk_assign": {"order_ids": order_ids[4:6], "staff_id": "s1", "staff_name": "Staff"},
+        "bulk_status": {"order_ids": order_ids[6:8], "status": "in_progress"},
+        "bulk_complete": {"order_ids": order_ids[8:10], "notes": "done"},
+    }
+
+def test_every_budgeted_route_is_exercised():
+    called = {(method, route) for method, route, _ in BUDGETED_CALLS}
+    assert _budgeted_routes() - UNBOUNDED_STREAMS == called
+
+@pytest.mark.parametrize("method,route,options", BUDGETED_CALLS, ids=[f"{m} {r}" for m, r, _ in BUDGETED_CALLS])
+def test_route_within_budget(client, seeded, method, route, options):
+    options = dict(options)
+    if isinstance(options.get("json"), str):
+        options["json"] = seeded[options["json"]]
+    path = route.format(order_id=seeded[options.pop("order", "order_id")])
+
+    response = client.request(method, path, **options)
+
+    assert response.status_code == 200, response.text
+    budget = next(r.endpoint.query_budget for r in app.routes if r.path == route and method in r.methods)
+    assert int(response.headers["x-db-queries"]) <= budget
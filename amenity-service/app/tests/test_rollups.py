@@ -0,0 +1,61 @@
+"""Rollups kept from the delta journal match a rebuild from the orders"""
+import pytest
+
+from app import models, rollups
+from app.database import SessionLocal
+
+@pytest.fixture
+def db():
+    session = SessionLocal()
+    yield session
+    session.close()
+
+def _rollup_rows(db):
+    return {
+        (row.day, row.amenity_id): (
+            row.amenity_name, row.category, row.order_count, round(row.revenue, 6),
+            row.completed_count, round(row.completion_seconds, 3)
+        )
+        for row in db.query(models.AmenityDailyStats).all()
+    }
+
+def _set_status(client, order_id, status):
+    response = client.patch(f"/api/amenity-orders/{order_id}/status", json={"status": status})
+    assert response.status_code == 200, response.text
+
+def test_folded_rollups_equal_a_rebuild(client, db, amenity, amenity_order):
+    spa, taxi = amenity("Spa", 100.0, "wellness"), amenity("Taxi", 40.0, "transport")
+    completed = amenity_order(spa)["order_id"]
+    cancelled = amenity_order(spa)["order_id"]
+    restored = amenity_order(taxi)["order_id"]
+    reopened = amenity_order(taxi)["order_id"]
+    bulk = [amenity_order(spa)["order_id"] for _ in range(2)]
+
+    response = client.patch(f"/api/amenity-orders/{completed}/complete", json={"notes": "done"})
+    assert response.status_code == 200
+    client.patch(f"/api/amenity-orders/{completed}/complete", json={"notes": "again"})  # no change
+    _set_status(client, cancelled, "cancelled")
+    _set_status(client, restored, "cancelled")
+    _set_status(client, restored, "requested")
+    _set_status(client, reopened, "completed")
+    _set_status(client, reopened, "in_progress")
+    response = client.patch("/api/amenity-orders/complete", json={"order_ids": bulk})
+    assert response.status_code == 200
+
+    rollups.fold_pending(db)
+    folded = _rollup_rows(db)
+    assert db.query(models.AmenityDailyStatsDelta).count() == 0
+
+    rollups.rebuild(db)
+    assert folded == _rollup_rows(db)
+
+def test_rows_back_to_zero_are_dropped(client, db, amenity, amenity_order):
+    item = amenity("Late checkout", 25.0, "rooms")
+    order_id = amenity_order(item)["order_id"]
+    rollups.fold_pending(db)
+    assert db.query(models.AmenityDailyStats).filter_by(amenity_id=item["id"]).count() == 1
+
+    _set_status(client, order_id, "cancelled")
+    rollups.fold_pending(db)
+
+    assert db.query(models.AmenityDailyStats).filter_by(amenity_id=item["id"]).count() == 0
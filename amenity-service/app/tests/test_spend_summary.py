@@ -0,0 +1,26 @@
+"""Spend summary: a guest's amenity orders grouped by status and category, cancelled ones not billed"""
+
+GUEST_ID = "guest-spend-1"
+
+def test_summary_groups_orders_and_bills_all_but_cancelled(client, amenity, amenity_order):
+    spa, dinner = amenity("Spa", 100.0, "wellness"), amenity("Private dinner", 80.0, "dining")
+    amenity_order(spa, guest_id=GUEST_ID)
+    done = amenity_order(spa, guest_id=GUEST_ID)["order_id"]
+    client.patch(f"/api/amenity-orders/{done}/complete", json={})
+    cancelled = amenity_order(dinner, guest_id=GUEST_ID)["order_id"]
+    client.patch(f"/api/amenity-orders/{cancelled}/status", json={"status": "cancelled"})
+    amenity_order(dinner, guest_id="guest-spend-2")
+
+    response = client.get("/api/spend-summary", params={"guest_id": GUEST_ID})
+
+    assert response.status_code == 200
+    body = response.json()
+    assert (body["guest_id"], body["order_count"], body["billable_amount"]) == (GUEST_ID, 3, 200.0)
+    assert sorted((g["status"], g["category"], g["order_count"], g["total_amount"]) for g in body["groups"]) == [
+        ("cancelled", "dining", 1, 80.0),
+        ("completed", "wellness", 1, 100.0),
+        ("requested", "wellness", 1, 100.0)
+    ]
+
+def test_summary_needs_a_guest_or_a_date(client):
+    assert client.get("/api/spend-summary").status_code == 400
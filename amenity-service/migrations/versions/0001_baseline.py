@@ -0,0 +1,61 @@
+"""baseline schema
+
+Tables as previously created by Base.metadata.create_all. Databases that
+already have them are left untouched, so this is safe to run on existing
+deployments.
+
+Revision ID: 0001
+Revises:
+Create Date: 2026-10-17
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "0001"
+down_revision = None
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    existing = set(sa.inspect(op.get_bind()).get_table_names())
+
+    if "amenities" not in existing:
+        op.create_table(
+            "amenities",
+            sa.Column("id", sa.String(), primary_key=True),
+            sa.Column("name", sa.String(), nullable=False),
+            sa.Column("description", sa.Text()),
+            sa.Column("price", sa.Float(), nullable=False),
+            sa.Column("category", sa.String()),
+            sa.Column("duration_minutes", sa.Integer()),
+            sa.Column("available", sa.Boolean()),
+            sa.Column("image_url", sa.String(), nullable=True),
+            sa.Column("created_at", sa.DateTime()),
+        )
+
+    if "amenity_orders" not in existing:
+        op.create_table(
+            "amenity_orders",
+            sa.Column("id", sa.String(), primary_key=True),
+            sa.Column("guest_id", sa.String(), nullable=False),
+            sa.Column("guest_name", sa.String()),
+            sa.Column("amenity_id", sa.String(), nullable=False),
+            sa.Column("amenity_name", sa.String()),
+            sa.Column("status", sa.String()),
+            sa.Column("total_amount", sa.Float()),
+            sa.Column("scheduled_for", sa.DateTime()),
+            sa.Column("assigned_to", sa.String()),
+            sa.Column("assigned_to_name", sa.String()),
+            sa.Column("guest_notes", sa.Text()),
+            sa.Column("staff_notes", sa.Text()),
+            sa.Column("created_at", sa.DateTime()),
+            sa.Column("updated_at", sa.DateTime()),
+            sa.Column("completed_at", sa.DateTime()),
+        )
+
+
+def downgrade():
+    op.drop_table("amenity_orders")
+    op.drop_table("amenities")
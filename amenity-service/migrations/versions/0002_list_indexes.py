@@ -0,0 +1,29 @@
+"""indexes for amenity order list queries
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-17
+"""
+from alembic import op
+
+
+revision = "0002"
+down_revision = "0001"
+branch_labels = None
+depends_on = None
+
+INDEXES = [
+    ("ix_amenity_orders_created_at_id", "amenity_orders", ["created_at", "id"]),
+    ("ix_amenity_orders_guest_id_created_at_id", "amenity_orders", ["guest_id", "created_at", "id"]),
+    ("ix_amenity_orders_status_created_at_id", "amenity_orders", ["status", "created_at", "id"]),
+]
+
+
+def upgrade():
+    for name, table, columns in INDEXES:
+        op.create_index(name, table, columns, if_not_exists=True)
+
+
+def downgrade():
+    for name, table, _ in reversed(INDEXES):
+        op.drop_index(name, table_name=table, if_exists=True)
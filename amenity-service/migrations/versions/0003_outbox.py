@@ -0,0 +1,40 @@
+"""transactional outbox for domain events
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2026-10-17
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "0003"
+down_revision = "0002"
+branch_labels = None
+depends_on = None
+
+PENDING = sa.text("published_at IS NULL")
+
+
+def upgrade():
+    op.create_table(
+        "amenity_outbox",
+        sa.Column("id", sa.String(), primary_key=True),
+        sa.Column("event_type", sa.String(), nullable=False),
+        sa.Column("payload", sa.JSON(), nullable=False),
+        sa.Column("attempts", sa.Integer()),
+        sa.Column("created_at", sa.DateTime()),
+        sa.Column("published_at", sa.DateTime(), nullable=True),
+    )
+    op.create_index(
+        "ix_amenity_outbox_pending_created_at",
+        "amenity_outbox",
+        ["created_at"],
+        postgresql_where=PENDING,
+        sqlite_where=PENDING
+    )
+
+
+def downgrade():
+    op.drop_index("ix_amenity_outbox_pending_created_at", table_name="amenity_outbox")
+    op.drop_table("amenity_outbox")
@@ -0,0 +1,33 @@
+"""daily amenity rollups for reporting
+
+Revision ID: 0005
+Revises: 0004
+Create Date: 2026-10-17
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "0005"
+down_revision = "0004"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        "amenity_daily_stats",
+        sa.Column("day", sa.Date(), primary_key=True),
+        sa.Column("amenity_id", sa.String(), primary_key=True),
+        sa.Column("amenity_name", sa.String()),
+        sa.Column("category", sa.String()),
+        sa.Column("order_count", sa.Integer(), nullable=False),
+        sa.Column("revenue", sa.Float(), nullable=False),
+        sa.Column("completed_count", sa.Integer(), nullable=False),
+        sa.Column("completion_seconds", sa.Float(), nullable=False),
+    )
+    # Existing orders are counted by running python -m app.rollups once
+
+
+def downgrade():
+    op.drop_table("amenity_daily_stats")
@@ -0,0 +1,33 @@
+"""journal of daily amenity rollup changes
+
+Revision ID: 0006
+Revises: 0005
+Create Date: 2026-10-17
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "0006"
+down_revision = "0005"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        "amenity_daily_stats_deltas",
+        sa.Column("id", sa.String(), primary_key=True),
+        sa.Column("day", sa.Date(), nullable=False),
+        sa.Column("amenity_id", sa.String(), nullable=False),
+        sa.Column("amenity_name", sa.String()),
+        sa.Column("category", sa.String()),
+        sa.Column("order_count", sa.Integer(), nullable=False),
+        sa.Column("revenue", sa.Float(), nullable=False),
+        sa.Column("completed_count", sa.Integer(), nullable=False),
+        sa.Column("completion_seconds", sa.Float(), nullable=False),
+    )
+
+
+def downgrade():
+    op.drop_table("amenity_daily_stats_deltas")
@@ -0,0 +1,264 @@
+"""Drive a mixed workload against a running service and report latencies.
+
+    python benchmarks/run.py restaurant --base-url http://localhost:8002 \\
+        --concurrency 32 --duration 60 --output results/restaurant-$(git rev-parse --short HEAD).json
+    python benchmarks/run.py amenity --base-url http://localhost:8003 --baseline results/amenity-main.json
+
+Each worker loops over weighted operations (catalog reads, order creation,
+status updates, list queries) until the duration is up. Requests made
+during the warmup are not counted. The report is JSON with throughput
+and p50/p95/p99 latency, overall and per operation. With --baseline, the
+differences against an earlier report are printed as well.
+"""
+import sys
+import json
+import math
+import random
+import asyncio
+import argparse
+import subprocess
+import time
+from collections import defaultdict
+from datetime import datetime
+from typing import Dict, List, Optional
+
+import httpx
+
+ORDER_PAGES = 10  # pages of existing orders fetched up front for reads/updates
+
+class State:
+    """Ids the workload picks from, grown as orders are created"""
+    
+    def __init__(self):
+        self.catalog_ids: List[str] = []
+        self.order_ids: List[str] = []
+        self.guest_ids: List[str] = []
+
+# Restaurant workload
+async def menu(client: httpx.AsyncClient, state: State, rng: random.Random):
+    return await client.get("/api/menu")
+
+async def list_orders(client, state, rng):
+    params = {"limit": 50}
+    if state.guest_ids and rng.random() < 0.5:
+        params["guest_id"] = rng.choice(state.guest_ids)
+    return await client.get("/api/orders", params=params)
+
+async def get_order(client, state, rng):
+    return await client.get(f"/api/orders/{rng.choice(state.order_ids)}")
+
+async def create_order(client, state, rng):
+    items = [
+        {"menu_item_id": item_id, "quantity": rng.randint(1, 3)}
+        for item_id in rng.sample(state.catalog_ids, min(len(state.catalog_ids), rng.randint(1, 5)))
+    ]
+    response = await client.post("/api/orders", json={
+        "guest_id": rng.choice(state.guest_ids),
+        "room_number": str(rng.randint(101, 950)),
+        "order_type": "room_service",
+        "items": items
+    })
+    if response.status_code == 200:
+        state.order_ids.append(response.json()["order_id"])
+    return response
+
+async def update_order_status(client, state, rng):
+    status = rng.choice(["in_progress", "ready", "delivered"])
+    return await client.patch(f"/api/orders/{rng.choice(state.order_ids)}/status", json={"status": status})
+
+# Amenity workload
+async def amenities(client, state, rng):
+    return await client.get("/api/amenities")
+
+async def list_amenity_orders(client, state, rng):
+    params = {"limit": 50}
+    if state.guest_ids and rng.random() < 0.5:
+        params["guest_id"] = rng.choice(state.guest_ids)
+    return await client.get("/api/amenity-orders", params=params)
+
+async def get_amenity_order(client, state, rng):
+    return await client.get(f"/api/amenity-orders/{rng.choice(state.order_ids)}")
+
+async def create_amenity_order(client, state, rng):
+    response = await client.post("/api/amenity-orders", json={
+        "guest_id": rng.choice(state.guest_ids),
+        "guest_name": "Benchmark Guest",
+        "amenity_id": rng.choice(state.catalog_ids),
+        "scheduled_for": datetime.utcnow().replace(microsecond=0).isoformat()
+    })
+    if response.status_code == 200:
+        state.order_ids.append(response.json()["order_id"])
+    return response
+
+async def update_amenity_order_status(client, state, rng):
+    status = rng.choice(["assigned", "in_progress", "completed"])
+    return await client.patch(f"/api/amenity-orders/{rng.choice(state.order_ids)}/status", json={"status": status})
+
+# operation name -> (weight, coroutine)
+WORKLOADS = {
+    "restaurant": {
+        "menu": (40, menu),
+        "list_orders": (20, list_orders),
+        "get_order": (10, get_order),
+        "create_order": (15, create_order),
+        "update_order_status": (15, update_order_status),
+    },
+    "amenity": {
+        "amenities": (40, amenities),
+        "list_orders": (20, list_amenity_orders),
+        "get_order": (10, get_amenity_order),
+        "create_order": (15, create_amenity_order),
+        "update_order_status": (15, update_amenity_order_status),
+    },
+}
+
+async def load_state(client: httpx.AsyncClient, service: str) -> State:
+    """Collect catalog, order and guest ids from the service itself"""
+    state = State()
+    if service == "restaurant":
+        response = await client.get("/api/menu")
+        response.raise_for_status()
+        state.catalog_ids = [item["id"] for items in response.json()["categories"].values() for item in items]
+        orders_path = "/api/orders"
+    else:
+        response = await client.get("/api/amenities")
+        response.raise_for_status()
+        state.catalog_ids = [amenity["id"] for amenity in response.json()]
+        orders_path = "/api/amenity-orders"
+    
+    cursor = None
+    for _ in range(ORDER_PAGES):
+        response = await client.get(orders_path, params={"limit": 500, **({"cursor": cursor} if cursor else {})})
+        response.raise_for_status()
+        for order in response.json():
+            state.order_ids.append(order["id"])
+            state.guest_ids.append(order["guest_id"])
+        cursor = response.headers.get("x-next-cursor")
+        if not cursor:
+            break
+    
+    state.guest_ids = sorted(set(state.guest_ids)) or ["benchmark-guest"]
+    if not state.catalog_ids or not state.order_ids:
+        raise SystemExit("Service has no catalog or orders; run benchmarks/seed.py first")
+    return state
+
+def percentile(sorted_values: List[float], p: float) -> float:
+    """Nearest-rank percentile of an ascending list"""
+    if not sorted_values:
+        return 0.0
+    return sorted_values[max(0, math.ceil(p / 100 * len(sorted_values)) - 1)]
+
+def summarize(latencies: List[float], errors: int, elapsed: float) -> Dict:
+    values = sorted(latencies)
+    return {
+        "requests": len(values),
+        "errors": errors,
+        "throughput_rps": round(len(values) / elapsed, 2) if elapsed else 0.0,
+        "mean_ms": round(sum(values) / len(values) * 1000, 3) if values else 0.0,
+        "p50_ms": round(percentile(values, 50) * 1000, 3),
+        "p95_ms": round(percentile(values, 95) * 1000, 3),
+        "p99_ms": round(percentile(values, 99) * 1000, 3),
+        "max_ms": round(values[-1] * 1000, 3) if values else 0.0,
+    }
+
+async def run(args) -> Dict:
+    workload = WORKLOADS[args.service]
+    names = list(workload)
+    weights = [workload[name][0] for name in names]
+    latencies = defaultdict(list)
+    errors = defaultdict(int)
+    
+    limits = httpx.Limits(max_connections=args.concurrency, max_keepalive_connections=args.concurrency)
+    async with httpx.AsyncClient(base_url=args.base_url, limits=limits, timeout=args.timeout) as client:
+        state = await load_state(client, args.service)
+        
+        started_at = time.perf_counter()
+        measure_from = started_at + args.warmup
+        deadline = measure_from + args.duration
+        
+        async def worker(worker_id: int):
+            rng = random.Random(args.seed * 1000 + worker_id)
+            while True:
+                name = rng.choices(names, weights)[0]
+                request_started_at = time.perf_counter()
+                if request_started_at >= deadline:
+                    return
+                try:
+                    response = await workload[name][1](client, state, rng)
+                    failed = response.status_code >= 400
+                except httpx.HTTPError:
+                    failed = True
+                if request_started_at < measure_from:
+                    continue
+                latencies[name].append(time.perf_counter() - request_started_at)
+                errors[name] += failed
+        
+        await asyncio.gather(*(worker(i) for i in range(args.concurrency)))
+        elapsed = time.perf_counter() - measure_from
+    
+    return {
+        "service": args.service,
+        "base_url": args.base_url,
+        "git_commit": _git_commit(),
+        "started_at": datetime.utcnow().isoformat(timespec="seconds"),
+        "config": {
+            "concurrency": args.concurrency,
+            "duration_s": args.duration,
+            "warmup_s": args.warmup,
+            "seed": args.seed,
+            "weights": dict(zip(names, weights)),
+        },
+        "total": summarize([v for name in names for v in latencies[name]], sum(errors.values()), elapsed),
+        "operations": {name: summarize(latencies[name], errors[name], elapsed) for name in names},
+    }
+
+def _git_commit() -> Optional[str]:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+def compare(baseline: Dict, report: Dict) -> str:
+    """Render per-operation changes against a baseline report"""
+    lines = [f"{'operation':<22}{'metric':<16}{'baseline':>12}{'current':>12}{'change':>10}"]
+    rows = [("total", baseline["total"], report["total"])] + [
+        (name, baseline["operations"][name], stats)
+        for name, stats in report["operations"].items() if name in baseline["operations"]
+    ]
+    for name, before, after in rows:
+        for metric in ("throughput_rps", "p50_ms", "p95_ms", "p99_ms"):
+            change = (after[metric] - before[metric]) / before[metric] * 100 if before[metric] else 0.0
+            lines.append(f"{name:<22}{metric:<16}{before[metric]:>12.2f}{after[metric]:>12.2f}{change:>+9.1f}%")
+    return "\n".join(lines)
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark a service with a mixed workload")
+    parser.add_argument("service", choices=WORKLOADS)
+    parser.add_argument("--base-url", default=None, help="defaults to the docker-compose host port")
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--duration", type=float, default=30, help="measured seconds")
+    parser.add_argument("--warmup", type=float, default=5, help="seconds excluded from the report")
+    parser.add_argument("--timeout", type=float, default=30)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--output", help="write the JSON report here instead of stdout")
+    parser.add_argument("--baseline", help="earlier JSON report to compare against")
+    args = parser.parse_args()
+    args.base_url = args.base_url or {"restaurant": "http://localhost:8002", "amenity": "http://localhost:8003"}[args.service]
+    
+    report = asyncio.run(run(args))
+    
+    body = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(body + "\n")
+    else:
+        print(body)
+    
+    if args.baseline:
+        with open(args.baseline) as f:
+            print(compare(json.load(f), report), file=sys.stderr)
+
+if __name__ == "__main__":
+    main()
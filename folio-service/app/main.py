@@ -0,0 +1,108 @@
+"""Guest folio: restaurant and amenity spend in one call.
+
+Checkout tooling asks this service instead of downloading a guest's order
+history from both services. It requests /api/spend-summary from the
+restaurant and amenity services concurrently, over pooled keep-alive
+connections, and adds the two up. It keeps no state of its own.
+
+If one service fails or times out (FOLIO_UPSTREAM_TIMEOUT), the folio is
+still returned, degraded: that service's section is null, its error is
+under "errors", "complete" is false and billable_amount only covers the
+service that answered. Only when both fail is the answer a 502.
+"""
+import os
+import asyncio
+from datetime import date
+from typing import Optional, Tuple
+
+import httpx
+from fastapi import FastAPI, HTTPException, status
+
+from shared.instrumentation import PrometheusMiddleware, mark_process_dead, metrics_response
+
+RESTAURANT_SERVICE_URL = os.getenv("RESTAURANT_SERVICE_URL", "http://restaurant-service:80")
+AMENITY_SERVICE_URL = os.getenv("AMENITY_SERVICE_URL", "http://amenity-service:80")
+FOLIO_UPSTREAM_TIMEOUT = float(os.getenv("FOLIO_UPSTREAM_TIMEOUT", "5"))  # seconds
+FOLIO_MAX_CONNECTIONS = int(os.getenv("FOLIO_MAX_CONNECTIONS", "100"))  # per upstream service
+
+app = FastAPI(
+    title="Folio Service",
+    description="Guest folio combining restaurant and amenity spend",
+    version="1.0.0"
+)
+
+app.add_middleware(PrometheusMiddleware)
+
+_clients = {}
+
+@app.on_event("startup")
+async def on_startup():
+    limits = httpx.Limits(max_connections=FOLIO_MAX_CONNECTIONS, max_keepalive_connections=FOLIO_MAX_CONNECTIONS)
+    for name, base_url in (("restaurant", RESTAURANT_SERVICE_URL), ("amenity", AMENITY_SERVICE_URL)):
+        _clients[name] = httpx.AsyncClient(base_url=base_url, limits=limits, timeout=FOLIO_UPSTREAM_TIMEOUT)
+
+@app.on_event("shutdown")
+async def on_shutdown():
+    await asyncio.gather(*(client.aclose() for client in _clients.values()))
+    mark_process_dead()
+
+async def _spend_summary(name: str, params: dict) -> Tuple[Optional[dict], Optional[str]]:
+    """Return the service's summary, or None and why it could not be fetched"""
+    try:
+        response = await _clients[name].get("/api/spend-summary", params=params)
+        response.raise_for_status()
+    except httpx.HTTPError as e:
+        return None, f"Could not get the {name} spend summary: {e!r}"
+    return response.json(), None
+
+@app.get("/api/folio/{guest_id}")
+async def get_folio(guest_id: str, date_from: Optional[date] = None, date_to: Optional[date] = None):
+    """A guest's spend in both services, optionally limited to a date range.
+    
+    Degraded, with "complete": false, while one of the services is down.
+    """
+    params = {"guest_id": guest_id}
+    if date_from:
+        params["date_from"] = date_from.isoformat()
+    if date_to:
+        params["date_to"] = date_to.isoformat()
+    
+    (restaurant, restaurant_error), (amenities, amenity_error) = await asyncio.gather(
+        _spend_summary("restaurant", params),
+        _spend_summary("amenity", params)
+    )
+    errors = {
+        name: error
+        for name, error in (("restaurant", restaurant_error), ("amenity", amenity_error))
+        if error
+    }
+    if len(errors) == 2:
+        raise HTTPException(status_code=status.HTTP_502_BAD_GATEWAY, detail=errors)
+    
+    answered = [summary for summary in (restaurant, amenities) if summary is not None]
+    return {
+        "guest_id": guest_id,
+        "date_from": date_from,
+        "date_to": date_to,
+        "complete": not errors,
+        "billable_amount": round(sum(summary["billable_amount"] for summary in answered), 2),
+        "restaurant": restaurant,
+        "amenities": amenities,
+        "errors": errors
+    }
+
+@app.get("/")
+async def read_root():
+    return {"message": "Folio Service is running"}
+
+@app.get("/health")
+async def health_check():
+    return {"status": "healthy"}
+
+@app.get("/metrics", include_in_schema=False)
+async def metrics():
+    return metrics_response()
+
+if __name__ == "__main__":
+    import uvicorn
+    uvicorn.run(app, host="0.0.0.0", port=8000)
\ No newline at end of file
@@ -0,0 +1,35 @@
+"""Fixtures for the in-process tests of the folio service.
+
+The upstream services are replaced by httpx.MockTransport handlers, so no
+other service needs to run. Run from the service directory:
+
+    cd folio-service && python -m pytest app/tests
+"""
+import os
+import sys
+
+import httpx
+import pytest
+
+SERVICE_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
+sys.path[:0] = [SERVICE_DIR, os.path.dirname(SERVICE_DIR)]
+
+from fastapi.testclient import TestClient
+
+from app import main
+
+@pytest.fixture
+def upstreams(monkeypatch):
+    """Install a MockTransport handler per upstream service: upstreams(restaurant=..., amenity=...)"""
+    def install(**handlers):
+        clients = {
+            name: httpx.AsyncClient(base_url=f"http://{name}-service", transport=httpx.MockTransport(handler))
+            for name, handler in handlers.items()
+        }
+        monkeypatch.setattr(main, "_clients", clients)
+    return install
+
+@pytest.fixture
+def client():
+    # Not entered as a context manager: startup would replace the mocked clients
+    return TestClient(main.app)
@@ -0,0 +1,72 @@
+"""Folio aggregation of the two spend summaries, including while one service is down"""
+import httpx
+
+def _summary(request: httpx.Request, billable_amount: float) -> httpx.Response:
+    return httpx.Response(200, json={
+        "guest_id": request.url.params["guest_id"],
+        "date_from": request.url.params.get("date_from"),
+        "date_to": request.url.params.get("date_to"),
+        "order_count": 2,
+        "billable_amount": billable_amount,
+        "groups": []
+    })
+
+def restaurant_up(request):
+    assert request.url.path == "/api/spend-summary"
+    return _summary(request, 10.25)
+
+def amenity_up(request):
+    return _summary(request, 100.1)
+
+def service_unavailable(request):
+    return httpx.Response(503, json={"detail": "Service unavailable"})
+
+def timing_out(request):
+    raise httpx.ReadTimeout("timed out", request=request)
+
+def refusing(request):
+    raise httpx.ConnectError("connection refused", request=request)
+
+def test_folio_adds_up_both_services(client, upstreams):
+    upstreams(restaurant=restaurant_up, amenity=amenity_up)
+
+    response = client.get("/api/folio/guest-1", params={"date_from": "2030-06-01", "date_to": "2030-06-30"})
+
+    assert response.status_code == 200
+    body = response.json()
+    assert (body["complete"], body["errors"], body["billable_amount"]) == (True, {}, 110.35)
+    assert body["restaurant"]["billable_amount"] == 10.25
+    assert body["amenities"]["billable_amount"] == 100.1
+    # The date range is passed on to both services
+    for section in (body["restaurant"], body["amenities"]):
+        assert (section["date_from"], section["date_to"]) == ("2030-06-01", "2030-06-30")
+
+def test_folio_is_degraded_while_a_service_is_down(client, upstreams):
+    upstreams(restaurant=restaurant_up, amenity=service_unavailable)
+
+    response = client.get("/api/folio/guest-1")
+
+    assert response.status_code == 200
+    body = response.json()
+    assert (body["complete"], body["billable_amount"], body["amenities"]) == (False, 10.25, None)
+    assert body["restaurant"]["billable_amount"] == 10.25
+    assert list(body["errors"]) == ["amenity"]
+    assert "503" in body["errors"]["amenity"]
+
+def test_folio_is_degraded_while_a_service_times_out(client, upstreams):
+    upstreams(restaurant=timing_out, amenity=amenity_up)
+
+    response = client.get("/api/folio/guest-1")
+
+    assert response.status_code == 200
+    body = response.json()
+    assert (body["complete"], body["billable_amount"], body["restaurant"]) == (False, 100.1, None)
+    assert "ReadTimeout" in body["errors"]["restaurant"]
+
+def test_folio_fails_when_both_services_are_down(client, upstreams):
+    upstreams(restaurant=refusing, amenity=timing_out)
+
+    response = client.get("/api/folio/guest-1")
+
+    assert response.status_code == 502
+    assert set(response.json()["detail"]) == {"restaurant", "amenity"}
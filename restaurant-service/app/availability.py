@@ -0,0 +1,122 @@
+import os
+from collections import defaultdict
+from datetime import date, datetime, timedelta
+from typing import Dict, List, Optional, Set, Tuple
+
+from fastapi import HTTPException, status
+from sqlalchemy.orm import Session
+
+from . import models
+
+RESERVATION_DURATION = timedelta(minutes=int(os.getenv("RESERVATION_DURATION_MINUTES", "120")))
+RESERVATION_SLOT = timedelta(minutes=int(os.getenv("RESERVATION_SLOT_MINUTES", "30")))
+RESTAURANT_OPENS = os.getenv("RESTAURANT_OPENS", "12:00")  # first seating
+RESTAURANT_LAST_SEATING = os.getenv("RESTAURANT_LAST_SEATING", "22:00")
+MAX_AVAILABILITY_DAYS = 14
+
+# Upper bound on any stored reservation length; gives the starts_at index scan
+# a lower bound so overlap lookups stay independent of booking history
+MAX_RESERVATION_LENGTH = timedelta(hours=12)
+
+Reservation = models.TableReservation
+Table = models.RestaurantTable
+
+def _parse_time(value: str) -> datetime:
+    return datetime.strptime(value, "%H:%M")
+
+def reservation_window(reservation_date: str, reservation_time: str) -> Tuple[datetime, datetime]:
+    """Return the (start, end) seating window for a requested date and time"""
+    try:
+        starts_at = datetime.strptime(f"{reservation_date} {reservation_time}", "%Y-%m-%d %H:%M")
+    except ValueError:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="reservation_date must be YYYY-MM-DD and reservation_time HH:MM"
+        )
+    return starts_at, starts_at + RESERVATION_DURATION
+
+def _overlapping(query, starts_at: datetime, ends_at: datetime):
+    return query.filter(
+        Reservation.status != "cancelled",
+        Reservation.starts_at > starts_at - MAX_RESERVATION_LENGTH,
+        Reservation.starts_at < ends_at,
+        Reservation.ends_at > starts_at
+    )
+
+def _suitable_tables(db: Session, persons_count: int) -> List[int]:
+    """Active tables that seat the party, smallest first"""
+    rows = db.query(Table.table_number).filter(
+        Table.active == True,
+        Table.capacity >= persons_count
+    ).order_by(Table.capacity, Table.table_number).all()
+    return [table_number for table_number, in rows]
+
+def _booked_tables(db: Session, starts_at: datetime, ends_at: datetime) -> Set[int]:
+    query = db.query(Reservation.table_number)
+    return {table_number for table_number, in _overlapping(query, starts_at, ends_at).distinct()}
+
+def allocate_table(db: Session, persons_count: int, starts_at: datetime, ends_at: datetime) -> Optional[int]:
+    """Pick the smallest free table for the window, or None if fully booked.
+
+    The chosen table's inventory row is locked (SELECT ... FOR UPDATE) and the
+    overlap re-checked under the lock, so concurrent requests racing for the
+    same table serialize and the loser moves on to the next candidate.
+    The lock is held until the caller commits the reservation.
+    """
+    booked = _booked_tables(db, starts_at, ends_at)
+
+    for table_number in _suitable_tables(db, persons_count):
+        if table_number in booked:
+            continue
+
+        db.query(Table).filter(Table.table_number == table_number).with_for_update().one()
+
+        query = db.query(Reservation.id).filter(Reservation.table_number == table_number)
+        if _overlapping(query, starts_at, ends_at).first() is None:
+            return table_number
+
+    return None
+
+def table_availability(db: Session, persons_count: int, date_from: date, date_to: date) -> List[Dict]:
+    """List bookable seating slots between two dates with the tables free at each"""
+    if date_to < date_from or (date_to - date_from).days >= MAX_AVAILABILITY_DAYS:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"date_to must be on or after date_from and within {MAX_AVAILABILITY_DAYS} days"
+        )
+
+    tables = _suitable_tables(db, persons_count)
+    if not tables:
+        return []
+
+    opens = _parse_time(RESTAURANT_OPENS).time()
+    last_seating = _parse_time(RESTAURANT_LAST_SEATING).time()
+    range_start = datetime.combine(date_from, opens)
+    range_end = datetime.combine(date_to, last_seating) + RESERVATION_DURATION
+
+    # One indexed range query for the whole period, then slot the rows in memory
+    query = db.query(Reservation.table_number, Reservation.starts_at, Reservation.ends_at)
+    booked = defaultdict(list)
+    for table_number, starts_at, ends_at in _overlapping(query, range_start, range_end):
+        booked[table_number].append((starts_at, ends_at))
+
+    slots = []
+    day = date_from
+    while day <= date_to:
+        slot = datetime.combine(day, opens)
+        while slot <= datetime.combine(day, last_seating):
+            slot_end = slot + RESERVATION_DURATION
+            free = [
+                table_number for table_number in tables
+                if not any(s < slot_end and e > slot for s, e in booked[table_number])
+            ]
+            if free:
+                slots.append({
+                    "date": slot.strftime("%Y-%m-%d"),
+                    "time": slot.strftime("%H:%M"),
+                    "available_tables": free
+                })
+            slot += RESERVATION_SLOT
+        day += timedelta(days=1)
+
+    return slots
@@ -0,0 +1,35 @@
+"""Bulk menu catalog import.
+
+Binds the shared catalog import (shared.bulk_import) to the menu_items
+table, the menu schema and the menu cache.
+
+Usage: python -m app.bulk_import <file|-> [--format json|ndjson|csv]
+"""
+import sys
+import uuid
+import asyncio
+from typing import Dict, List
+
+from sqlalchemy.orm import Session
+
+from shared.bulk_import import (
+    IMPORT_BATCH_SIZE, MAX_REPORTED_ERRORS, ImportResult, run_import_cli, upsert_rows, validate_rows
+)
+
+from . import models, schemas
+from .cache import menu_cache
+
+CATALOG_NAMESPACE = uuid.UUID("34355fb8-3ab4-46e4-8aa7-eb67e51b8c3f")
+
+def import_catalog(db: Session, rows: List[Dict], batch_size: int = IMPORT_BATCH_SIZE) -> ImportResult:
+    """Upsert the valid catalog rows in one transaction and report the invalid ones"""
+    values, errors = validate_rows(rows, schemas.MenuItemCreate, CATALOG_NAMESPACE)
+    if values:
+        upsert_rows(db, models.MenuItem.__table__, values, batch_size)
+        db.commit()
+        menu_cache.invalidate()
+    return ImportResult(imported=len(values), rejected=len(errors), errors=errors[:MAX_REPORTED_ERRORS])
+
+if __name__ == "__main__":
+    from . import database
+    sys.exit(asyncio.run(run_import_cli(sys.argv[1:], "Upsert a menu catalog", "menu", import_catalog, database)))
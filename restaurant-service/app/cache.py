@@ -0,0 +1,83 @@
+import os
+import time
+import threading
+from dataclasses import dataclass
+from typing import Dict, List, Optional
+
+from sqlalchemy.orm import Session
+
+from shared.caching import body_etag
+
+from . import models, schemas
+
+MENU_CACHE_TTL = float(os.getenv("MENU_CACHE_TTL", "300"))  # seconds
+
+@dataclass(frozen=True)
+class MenuSnapshot:
+    version: int
+    etag: str
+    categories: Dict[str, List[schemas.MenuItemResponse]]
+    body: bytes
+
+class MenuCache:
+    """In-process snapshot of the available menu.
+
+    Holds the category grouping and the pre-encoded JSON body so that
+    GET /api/menu does not hit the database or re-serialize on every call.
+    Any endpoint that writes menu items must call invalidate(); the TTL
+    covers writes made by other workers or replicas.
+    """
+
+    def __init__(self, ttl: float = MENU_CACHE_TTL):
+        self.ttl = ttl
+        self.version = 0
+        self._snapshot = None
+        self._loaded_at = 0.0
+        self._lock = threading.Lock()
+
+    def _is_fresh(self) -> bool:
+        return self._snapshot is not None and time.monotonic() - self._loaded_at < self.ttl
+
+    def peek(self) -> Optional[MenuSnapshot]:
+        """Return the current snapshot if it is still fresh, without touching the database"""
+        return self._snapshot if self._is_fresh() else None
+
+    def get(self, db: Session) -> MenuSnapshot:
+        """Return the current snapshot, rebuilding it if stale"""
+        if self._is_fresh():
+            return self._snapshot
+
+        # Build outside the lock: on the async path the query yields to the
+        # event loop, and a thread lock held across it would block the loop
+        version = self.version
+        snapshot = self._build(db, version)
+        with self._lock:
+            # Only publish if no write landed while we were loading
+            if version == self.version:
+                self._snapshot = snapshot
+                self._loaded_at = time.monotonic()
+        return snapshot
+
+    def invalidate(self):
+        """Drop the snapshot after a menu write"""
+        with self._lock:
+            self.version += 1
+            self._snapshot = None
+
+    @staticmethod
+    def _build(db: Session, version: int) -> MenuSnapshot:
+        items = db.query(models.MenuItem).filter(models.MenuItem.available == True).all()
+
+        # Group items by category
+        categories = {}
+        for item in items:
+            categories.setdefault(item.category, []).append(
+                schemas.MenuItemResponse.model_validate(item)
+            )
+
+        body = schemas.MenuResponse(categories=categories).model_dump_json().encode()
+        etag = body_etag(body)
+        return MenuSnapshot(version=version, etag=etag, categories=categories, body=body)
+
+
+menu_cache = MenuCache()
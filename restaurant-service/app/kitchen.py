@@ -0,0 +1,199 @@
+import os
+import time
+import uuid
+import bisect
+import threading
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional, Tuple
+
+from sqlalchemy.orm import Session
+
+from shared.responses import dump_rows
+from shared.streaming import order_topic
+
+from . import models, schemas
+
+KITCHEN_QUEUE_TTL = float(os.getenv("KITCHEN_QUEUE_TTL", "60"))  # seconds
+KITCHEN_ACTIVE_STATUSES = ("received", "in_progress")
+# Used for items that were removed from the menu after being ordered
+DEFAULT_PREPARATION_TIME = 15  # minutes
+
+
+@dataclass(frozen=True)
+class Ticket:
+    order_id: str
+    room_number: Optional[str]
+    order_type: Optional[str]
+    status: str
+    items: List[dict]
+    special_requests: Optional[str]
+    created_at: datetime
+    due_at: datetime
+
+    @property
+    def key(self) -> Tuple[datetime, str]:
+        return (self.due_at, self.order_id)
+
+    @classmethod
+    def from_order(cls, order: models.RestaurantOrder, preparation_time: int) -> "Ticket":
+        return cls(
+            order_id=order.id,
+            room_number=order.room_number,
+            order_type=order.order_type,
+            status=order.status,
+            items=[{"name": item["name"], "quantity": item["quantity"]} for item in order.items],
+            special_requests=order.special_requests,
+            created_at=order.created_at,
+            due_at=order.created_at + timedelta(minutes=preparation_time)
+        )
+
+
+class KitchenQueue:
+    """In-process index of active orders, sorted by due time.
+
+    create_order and update_order_status apply each committed change, so
+    serving the queue is a slice of an already sorted list, and the encoded
+    body is reused until the next change. The index is loaded from the
+    database on startup and again once the TTL expires.
+
+    Other workers and replicas announce their changes on the SSE fan-out
+    (remote_change): an order reaching a final status is dropped at once,
+    any other change makes the next read reload. Without the fan-out their
+    writes show up only after the TTL.
+    """
+
+    def __init__(self, ttl: float = KITCHEN_QUEUE_TTL):
+        self.ttl = ttl
+        self.version = 0
+        self._tickets: Dict[str, Ticket] = {}
+        self._keys: List[Tuple[datetime, str]] = []  # (due_at, order_id), ascending
+        self._loaded_at: Optional[float] = None
+        # Changes applied while a load is reading, replayed onto its result
+        self._journal: Optional[List[Tuple[str, Ticket]]] = None
+        self._bodies: Dict[int, Tuple[int, bytes]] = {}  # limit -> (version, body)
+        # ETags must not repeat across restarts, when version starts over
+        self._etag_prefix = uuid.uuid4().hex[:8]
+        self._lock = threading.Lock()
+
+    def needs_load(self) -> bool:
+        """True if the index is stale and no other request is reloading it"""
+        if self._journal is not None:
+            return False
+        return self._loaded_at is None or time.monotonic() - self._loaded_at >= self.ttl
+
+    def load(self, db: Session):
+        """Rebuild the index from the active orders in the database"""
+        with self._lock:
+            if self._journal is not None:
+                return
+            self._journal = []
+
+        try:
+            # Query outside the lock: on the async path it yields to the event loop
+            tickets = self._read(db)
+        except Exception:
+            with self._lock:
+                self._journal = None
+            raise
+
+        with self._lock:
+            self._tickets = {ticket.order_id: ticket for ticket in tickets}
+            self._keys = sorted(ticket.key for ticket in tickets)
+            for action, ticket in self._journal:
+                self._apply(action, ticket)
+            self._journal = None
+            self._loaded_at = time.monotonic()
+            self.version += 1
+
+    @staticmethod
+    def _read(db: Session) -> List[Ticket]:
+        orders = db.query(models.RestaurantOrder).filter(
+            models.RestaurantOrder.status.in_(KITCHEN_ACTIVE_STATUSES)
+        ).all()
+
+        # One lookup for the preparation times of every item on the queue
+        menu_item_ids = {item["menu_item_id"] for order in orders for item in order.items}
+        preparation_times = dict(
+            db.query(models.MenuItem.id, models.MenuItem.preparation_time).filter(
+                models.MenuItem.id.in_(menu_item_ids)
+            ).all()
+        ) if menu_item_ids else {}
+
+        return [
+            Ticket.from_order(order, max(
+                (preparation_times.get(item["menu_item_id"], DEFAULT_PREPARATION_TIME) for item in order.items),
+                default=DEFAULT_PREPARATION_TIME
+            ))
+            for order in orders
+        ]
+
+    def order_created(self, order: models.RestaurantOrder, preparation_time: int):
+        """Add a committed new order"""
+        if order.status in KITCHEN_ACTIVE_STATUSES:
+            self._change("upsert", Ticket.from_order(order, preparation_time))
+
+    def order_updated(self, order: models.RestaurantOrder):
+        """Apply a committed status change"""
+        current = self._tickets.get(order.id)
+        if order.status not in KITCHEN_ACTIVE_STATUSES:
+            self._change("remove", current or order.id)
+        elif current is not None:
+            # Due time does not depend on status, keep the one already computed
+            preparation_time = (current.due_at - current.created_at) // timedelta(minutes=1)
+            self._change("upsert", Ticket.from_order(order, preparation_time))
+        else:
+            # Back on the queue (e.g. ready -> in_progress): its due time needs
+            # the menu, so reload instead of querying on the write path
+            self._loaded_at = None
+
+    def remote_change(self, topics: List[str], final: bool):
+        """Apply an order event another process shared on the SSE fan-out"""
+        prefix = order_topic("")
+        order_id = next((topic[len(prefix):] for topic in topics if topic.startswith(prefix)), None)
+        if order_id is None:
+            return
+        if final:
+            if order_id in self._tickets:
+                self._change("remove", order_id)
+        else:
+            # A new order or a status change: building its ticket needs the
+            # order and the menu, so reload on the next read
+            self._loaded_at = None
+
+    def _change(self, action: str, ticket):
+        with self._lock:
+            if self._journal is not None:
+                self._journal.append((action, ticket))
+            self._apply(action, ticket)
+            self.version += 1
+
+    def _apply(self, action: str, ticket):
+        order_id = ticket if isinstance(ticket, str) else ticket.order_id
+        previous = self._tickets.pop(order_id, None)
+        if previous is not None:
+            del self._keys[bisect.bisect_left(self._keys, previous.key)]
+        if action == "upsert":
+            self._tickets[order_id] = ticket
+            bisect.insort(self._keys, ticket.key)
+
+    def etag(self, version: int) -> str:
+        return f'"kitchen-{self._etag_prefix}-{version}"'
+
+    def top(self, limit: int) -> Tuple[int, bytes]:
+        """Return the version and JSON body of the limit tickets due first"""
+        with self._lock:
+            version = self.version
+            cached = self._bodies.get(limit)
+            if cached is not None and cached[0] == version:
+                return cached
+            tickets = [self._tickets[order_id] for _, order_id in self._keys[:limit]]
+
+        body = dump_rows(tickets, schemas.KitchenTicket)
+        with self._lock:
+            if version == self.version:
+                self._bodies[limit] = (version, body)
+        return version, body
+
+
+kitchen_queue = KitchenQueue()
@@ -1,27 +1,79 @@
+import asyncio
+import logging
+import contextlib
 from fastapi import FastAPI
-from .database import engine, Base
+from shared.idempotency import IDEMPOTENCY_STORE, run_purge
+from shared.instrumentation import PrometheusMiddleware, instrument_engine, mark_process_dead, metrics_response
+from shared.outbox import OUTBOX_RELAY_ENABLED, OutboxRelay
+from shared.rabbitmq import rabbitmq_manager
+from shared.responses import DefaultResponse
+from shared.streaming import SSE_FANOUT_ENABLED, order_events
+from .database import SessionLocal, dispose_engine, engine, get_db, run_db
+from .kitchen import kitchen_queue
+from . import models, rollups
 from .routers import router as restaurant_router
 
-# Create database tables
-Base.metadata.create_all(bind=engine)
+logger = logging.getLogger(__name__)
 
 app = FastAPI(
     title="Restaurant Service",
     description="Microservice for managing restaurant operations in hotel",
-    version="1.0.0"
+    version="1.0.0",
+    default_response_class=DefaultResponse
 )
 
+# Per-route latency, status codes and SQL time per request, exposed on /metrics
+app.add_middleware(PrometheusMiddleware)
+instrument_engine(engine)
+
+# No DDL here: the schema is migrated once per deploy with "alembic upgrade head"
+
+_background_tasks = []
+
+@app.on_event("startup")
+async def on_startup():
+    if OUTBOX_RELAY_ENABLED:
+        relay = OutboxRelay(models.OutboxEvent, SessionLocal, run_db)
+        _background_tasks.append(asyncio.create_task(relay.run()))
+    if IDEMPOTENCY_STORE == "database":
+        _background_tasks.append(asyncio.create_task(run_purge(models.IdempotencyKey, SessionLocal, run_db)))
+    _background_tasks.append(asyncio.create_task(rollups.run_folding()))
+    if SSE_FANOUT_ENABLED:
+        order_events.add_listener(kitchen_queue.remote_change)
+        _background_tasks.append(asyncio.create_task(order_events.run_fanout(rabbitmq_manager, "restaurant.order-events")))
+    
+    # Warm the kitchen queue; if this fails the first request loads it
+    try:
+        async with contextlib.asynccontextmanager(get_db)() as db:
+            await run_db(db, kitchen_queue.load)
+    except Exception:
+        logger.exception("Could not load the kitchen queue on startup")
+
+@app.on_event("shutdown")
+async def on_shutdown():
+    for task in _background_tasks:
+        task.cancel()
+        with contextlib.suppress(asyncio.CancelledError):
+            await task
+    await rabbitmq_manager.close()
+    await dispose_engine()
+    mark_process_dead()
+
 # Include routers
 app.include_router(restaurant_router)
 
 @app.get("/")
-def read_root():
+async def read_root():
     return {"message": "Restaurant Service is running"}
 
 @app.get("/health")
-def health_check():
+async def health_check():
     return {"status": "healthy"}
 
+@app.get("/metrics", include_in_schema=False)
+async def metrics():
+    return metrics_response()
+
 if __name__ == "__main__":
     import uvicorn
     uvicorn.run(app, host="0.0.0.0", port=8000)
\ No newline at end of file
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, String, Integer, Float, DateTime, Boolean, JSON, Text
+from sqlalchemy import Column, String, Integer, Float, Date, DateTime, Boolean, JSON, Text, Index
 from .database import Base
 import uuid
 from datetime import datetime
@@ -29,6 +29,13 @@ class RestaurantOrder(Base):
     special_requests = Column(Text)
     created_at = Column(DateTime, default=datetime.utcnow)
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    
+    # Keyset-friendly indexes for list_orders: (created_at, id) is the page order
+    __table_args__ = (
+        Index("ix_restaurant_orders_created_at_id", "created_at", "id"),
+        Index("ix_restaurant_orders_guest_id_created_at_id", "guest_id", "created_at", "id"),
+        Index("ix_restaurant_orders_status_created_at_id", "status", "created_at", "id"),
+    )
 
 class TableReservation(Base):
     __tablename__ = "table_reservations"
@@ -42,4 +49,79 @@ class TableReservation(Base):
     table_number = Column(Integer)
     status = Column(String, default="confirmed")  # confirmed, cancelled, completed
     special_requests = Column(Text)
-    created_at = Column(DateTime, default=datetime.utcnow)
\ No newline at end of file
+    starts_at = Column(DateTime)  # reservation_date + reservation_time
+    ends_at = Column(DateTime)  # starts_at + seating duration
+    created_at = Column(DateTime, default=datetime.utcnow)
+    
+    # Keyset-friendly indexes for list_reservations, plus the overlap lookup
+    __table_args__ = (
+        Index("ix_table_reservations_date_time_id", "reservation_date", "reservation_time", "id"),
+        Index("ix_table_reservations_guest_id_date_time_id", "guest_id", "reservation_date", "reservation_time", "id"),
+        Index("ix_table_reservations_starts_at_table_number", "starts_at", "table_number"),
+    )
+
+class RestaurantTable(Base):
+    __tablename__ = "restaurant_tables"
+    
+    table_number = Column(Integer, primary_key=True, autoincrement=False)
+    capacity = Column(Integer, nullable=False)  # seats
+    active = Column(Boolean, default=True)
+
+class OutboxEvent(Base):
+    __tablename__ = "restaurant_outbox"
+    
+    id = Column(String, primary_key=True, default=lambda: str(uuid.uuid4()))
+    event_type = Column(String, nullable=False)  # EventTypes value, used as routing key
+    payload = Column(JSON, nullable=False)
+    attempts = Column(Integer, default=0)
+    created_at = Column(DateTime, default=datetime.utcnow)
+    published_at = Column(DateTime, nullable=True)  # NULL until the broker confirms
+    
+    # Partial index over the relay's pending scan
+    __table_args__ = (
+        Index(
+            "ix_restaurant_outbox_pending_created_at",
+            "created_at",
+            postgresql_where=published_at.is_(None),
+            sqlite_where=published_at.is_(None)
+        ),
+    )
+
+class IdempotencyKey(Base):
+    __tablename__ = "restaurant_idempotency_keys"
+    
+    scope = Column(String, primary_key=True)  # endpoint the key was sent to
+    key = Column(String, primary_key=True)  # Idempotency-Key header
+    request_hash = Column(String, nullable=False)  # sha256 of the request body
+    response = Column(JSON, nullable=False)
+    created_at = Column(DateTime, default=datetime.utcnow)
+    expires_at = Column(DateTime, nullable=False)
+    
+    __table_args__ = (
+        Index("ix_restaurant_idempotency_keys_expires_at", "expires_at"),
+    )
+
+class DailyItemSales(Base):
+    __tablename__ = "restaurant_daily_item_sales"
+    
+    day = Column(Date, primary_key=True)  # day the orders were placed (UTC)
+    menu_item_id = Column(String, primary_key=True)
+    name = Column(String)
+    category = Column(String)
+    order_count = Column(Integer, nullable=False, default=0)  # orders with this item, cancelled ones excluded
+    quantity = Column(Integer, nullable=False, default=0)
+    revenue = Column(Float, nullable=False, default=0.0)
+
+class DailyItemSalesDelta(Base):
+    __tablename__ = "restaurant_daily_item_sales_deltas"
+    
+    # Journal of changes to restaurant_daily_item_sales, written by order
+    # requests and summed into it by the rollup job
+    id = Column(String, primary_key=True, default=lambda: str(uuid.uuid4()))
+    day = Column(Date, nullable=False)
+    menu_item_id = Column(String, nullable=False)
+    name = Column(String)
+    category = Column(String)
+    order_count = Column(Integer, nullable=False)
+    quantity = Column(Integer, nullable=False)
+    revenue = Column(Float, nullable=False)
\ No newline at end of file
@@ -1,126 +1,332 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, Request, Response, status
+from fastapi.responses import StreamingResponse
+from sqlalchemy import func
 from sqlalchemy.orm import Session
-from typing import List
+from typing import List, Optional
 import uuid
-from datetime import datetime
+from datetime import date, datetime, time, timedelta
 
-from .database import get_db
-from . import models, schemas
+from shared.bulk_import import CatalogError, detect_format, dialect_insert, parse_catalog
+from shared.caching import CATALOG_CACHE_CONTROL, etag_matches
+from shared.idempotency import IdempotentRequest, commit_with_response, create_store, replay_stored
+from shared.instrumentation import query_budget
+from shared.outbox import record_event
+from shared.pagination import paginate, DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE, NEXT_CURSOR_HEADER
+from shared.rabbitmq import EventTypes
+from shared.responses import rows_response
+from shared.streaming import SSE_HEADERS, format_event, guest_topic, order_events, order_topic
+from shared.updates import update_returning_previous
+
+from .database import DBSession, get_db, run_db
+from . import models, rollups, schemas
+from .cache import menu_cache
+from .kitchen import kitchen_queue
+from .availability import allocate_table, reservation_window, table_availability, RESERVATION_DURATION
+from .bulk_import import import_catalog
 
 router = APIRouter(prefix="/api", tags=["restaurant"])
 
+idempotency_store = create_store(models.IdempotencyKey)
+
+ORDER_STATUSES = ["received", "in_progress", "ready", "delivered", "cancelled"]
+FINAL_ORDER_STATUSES = {"delivered", "cancelled"}
+# Most ids accepted by one bulk update
+MAX_BULK_IDS = 500
+# Days covered by a report when no date_from is given
+DEFAULT_REPORT_DAYS = 30
+TOP_ITEM_SORTS = ["revenue", "quantity", "order_count"]
+
 # Menu Endpoints
 @router.get("/menu", response_model=schemas.MenuResponse)
-def get_menu(db: Session = Depends(get_db)):
+@query_budget(1)
+async def get_menu(request: Request, db: DBSession = Depends(get_db)):
     """Get restaurant menu with items grouped by categories"""
-    items = db.query(models.MenuItem).filter(models.MenuItem.available == True).all()
+    snapshot = menu_cache.peek() or await run_db(db, menu_cache.get)
+    headers = {"ETag": snapshot.etag, "Cache-Control": CATALOG_CACHE_CONTROL}
     
-    # Group items by category
-    categories = {}
-    for item in items:
-        if item.category not in categories:
-            categories[item.category] = []
-        categories[item.category].append(item)
+    if etag_matches(request.headers.get("if-none-match"), snapshot.etag):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
     
-    return {"categories": categories}
+    return Response(content=snapshot.body, media_type="application/json", headers=headers)
 
-@router.post("/menu/items", response_model=schemas.MenuItemResponse)
-def create_menu_item(item: schemas.MenuItemCreate, db: Session = Depends(get_db)):
-    """Create new menu item (admin only)"""
+def _create_menu_item(db: Session, item: schemas.MenuItemCreate):
     db_item = models.MenuItem(**item.dict())
     db.add(db_item)
     db.commit()
-    db.refresh(db_item)
+    menu_cache.invalidate()
     return db_item
 
+@router.post("/menu/items", response_model=schemas.MenuItemResponse)
+@query_budget(1)
+async def create_menu_item(item: schemas.MenuItemCreate, db: DBSession = Depends(get_db)):
+    """Create new menu item (admin only)"""
+    return await run_db(db, _create_menu_item, item)
+
+@router.post("/menu/items/bulk", response_model=schemas.BulkImportResponse)
+async def import_menu_items(request: Request, format: str = None, db: DBSession = Depends(get_db)):
+    """Upsert a JSON, NDJSON or CSV menu catalog (admin only)
+    
+    The format comes from the format query parameter or the Content-Type header.
+    Invalid rows are skipped and listed by index under "errors"; the valid
+    ones are imported.
+    """
+    content = await request.body()
+    try:
+        rows = parse_catalog(content, format or detect_format(request.headers.get("content-type")))
+        result = await run_db(db, import_catalog, rows)
+    except CatalogError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    
+    return result
+
 # Order Endpoints
-@router.post("/orders", response_model=schemas.OrderResponse)
-def create_order(order: schemas.OrderCreate, db: Session = Depends(get_db)):
-    """Create new restaurant order"""
+def _create_order(db: Session, order: schemas.OrderCreate, idempotency: Optional[IdempotentRequest] = None):
+    # A retry gets the first attempt's response without touching the menu or orders
+    replayed = replay_stored(db, idempotency)
+    if replayed is not None:
+        return replayed
+    
     total_amount = 0
     order_items = []
     max_preparation_time = 0
     
+    # Merge duplicate lines so each menu item is priced once
+    quantities = {}
     for item in order.items:
-        menu_item = db.query(models.MenuItem).filter(
-            models.MenuItem.id == item.menu_item_id,
+        quantities[item.menu_item_id] = quantities.get(item.menu_item_id, 0) + item.quantity
+    
+    # Fetch all requested items in a single round trip
+    menu_items = {
+        menu_item.id: menu_item
+        for menu_item in db.query(models.MenuItem).filter(
+            models.MenuItem.id.in_(quantities),
             models.MenuItem.available == True
-        ).first()
+        ).all()
+    }
+    
+    for menu_item_id, quantity in quantities.items():
+        menu_item = menu_items.get(menu_item_id)
         
         if not menu_item:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
-                detail=f"Menu item {item.menu_item_id} not found or unavailable"
+                detail=f"Menu item {menu_item_id} not found or unavailable"
             )
         
-        item_total = menu_item.price * item.quantity
+        item_total = menu_item.price * quantity
         total_amount += item_total
         max_preparation_time = max(max_preparation_time, menu_item.preparation_time)
         
         order_items.append({
             "menu_item_id": menu_item.id,
             "name": menu_item.name,
-            "quantity": item.quantity,
+            "quantity": quantity,
             "price": menu_item.price,
             "item_total": item_total
         })
     
     # Create order
     db_order = models.RestaurantOrder(
+        id=str(uuid.uuid4()),
         guest_id=order.guest_id,
         room_number=order.room_number,
         order_type=order.order_type,
         items=order_items,
         total_amount=total_amount,
         special_requests=order.special_requests,
-        status="received"
+        status="received",
+        created_at=datetime.utcnow()
     )
     
     db.add(db_order)
-    db.commit()
-    db.refresh(db_order)
-    
-    return {
+    rollups.order_created(db, db_order, menu_items)
+    # Staged in the same transaction, published by the outbox relay
+    record_event(db, models.OutboxEvent, EventTypes.ORDER_CREATED, {
+        "order_id": db_order.id,
+        "guest_id": order.guest_id,
+        "room_number": order.room_number,
+        "order_type": order.order_type,
+        "total_amount": total_amount,
+        "status": "received"
+    })
+    response = {
         "order_id": db_order.id,
         "status": db_order.status,
         "total_amount": total_amount,
         "estimated_preparation_time": max_preparation_time,
         "message": "Order received successfully"
     }
+    
+    replayed = commit_with_response(db, idempotency, response)
+    if replayed is not None:
+        return replayed
+    
+    _publish_status(db_order)
+    kitchen_queue.order_created(db_order, max_preparation_time)
+    return response
+
+@router.post("/orders", response_model=schemas.OrderResponse)
+@query_budget(6)
+async def create_order(
+    order: schemas.OrderCreate,
+    response: Response,
+    idempotency_key: Optional[str] = Header(None),
+    db: DBSession = Depends(get_db)
+):
+    """Create new restaurant order.
+    
+    Send an Idempotency-Key header to make retries safe: a repeated key
+    returns the first response (with Idempotent-Replayed: true) instead of
+    creating another order.
+    """
+    idempotency = IdempotentRequest.from_header(idempotency_store, "orders", idempotency_key, order, response)
+    return await run_db(db, _create_order, order, idempotency)
+
+def _get_order(db: Session, order_id: str):
+    return db.query(models.RestaurantOrder).filter(models.RestaurantOrder.id == order_id).first()
 
 @router.get("/orders/{order_id}", response_model=schemas.OrderDetailResponse)
-def get_order(order_id: str, db: Session = Depends(get_db)):
+@query_budget(1)
+async def get_order(order_id: str, db: DBSession = Depends(get_db)):
     """Get order details"""
-    order = db.query(models.RestaurantOrder).filter(models.RestaurantOrder.id == order_id).first()
+    order = await run_db(db, _get_order, order_id)
     if not order:
         raise HTTPException(status_code=404, detail="Order not found")
     return order
 
+def _set_status(db: Session, order_ids: List[str], new_status: str):
+    """Set the status of order_ids with one UPDATE ... RETURNING, returning the updated rows.
+    
+    Shared by the single-order and bulk endpoints, so there is no SELECT
+    before the write or refresh after it. The rows also carry
+    previous_status, read in the same statement, which tells the rollups
+    what changed.
+    """
+    orders = update_returning_previous(db, models.RestaurantOrder.__table__, order_ids, {
+        "status": new_status,
+        "updated_at": datetime.utcnow()
+    })
+    rollups.status_changed(db, orders)
+    for order in orders:
+        if order.previous_status == order.status:
+            continue  # no change, nothing for consumers
+        record_event(db, models.OutboxEvent, EventTypes.ORDER_UPDATED, {
+            "order_id": order.id,
+            "guest_id": order.guest_id,
+            "status": order.status,
+            "updated_at": order.updated_at.isoformat()
+        })
+    db.commit()
+    
+    for order in orders:
+        _publish_status(order)
+        kitchen_queue.order_updated(order)
+    return orders
+
+def _check_status(new_status: str):
+    if new_status not in ORDER_STATUSES:
+        raise HTTPException(status_code=400, detail=f"Invalid status. Must be one of: {ORDER_STATUSES}")
+
+def _update_order_status(db: Session, order_id: str, status_update: schemas.StatusUpdate):
+    orders = _set_status(db, [order_id], status_update.status)
+    if not orders:
+        raise HTTPException(status_code=404, detail="Order not found")
+    return orders[0]
+
 @router.patch("/orders/{order_id}/status", response_model=schemas.OrderDetailResponse)
-def update_order_status(order_id: str, status_update: schemas.StatusUpdate, db: Session = Depends(get_db)):
+@query_budget(3)
+async def update_order_status(order_id: str, status_update: schemas.StatusUpdate, db: DBSession = Depends(get_db)):
     """Update order status"""
+    _check_status(status_update.status)
+    return await run_db(db, _update_order_status, order_id, status_update)
+
+def _update_orders_status(db: Session, bulk: schemas.BulkStatusUpdate):
+    order_ids = list(dict.fromkeys(bulk.order_ids))
+    orders = _set_status(db, order_ids, bulk.status)
+    
+    updated = {order.id for order in orders}
+    return {
+        "updated": orders,
+        "errors": [
+            {"id": order_id, "detail": "Order not found"}
+            for order_id in order_ids if order_id not in updated
+        ]
+    }
+
+@router.patch("/orders/status", response_model=schemas.BulkOrderUpdateResponse)
+@query_budget(3)
+async def update_orders_status(bulk: schemas.BulkStatusUpdate, db: DBSession = Depends(get_db)):
+    """Set the status of several orders in one transaction.
+    
+    Ids that do not exist are reported in errors; the others are updated.
+    """
+    _check_status(bulk.status)
+    if len(bulk.order_ids) > MAX_BULK_IDS:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail=f"At most {MAX_BULK_IDS} order ids per request"
+        )
+    
+    return await run_db(db, _update_orders_status, bulk)
+
+def _status_frame(order: models.RestaurantOrder) -> bytes:
+    return format_event("status", {
+        "order_id": order.id,
+        "guest_id": order.guest_id,
+        "status": order.status,
+        "updated_at": order.updated_at.isoformat()
+    })
+
+def _publish_status(order: models.RestaurantOrder):
+    """Push the committed state to the order's and the guest's SSE subscribers"""
+    order_events.publish(
+        [order_topic(order.id), guest_topic(order.guest_id)],
+        _status_frame(order),
+        final=order.status in FINAL_ORDER_STATUSES
+    )
+
+def _order_status_snapshot(db: Session, order_id: str):
     order = db.query(models.RestaurantOrder).filter(models.RestaurantOrder.id == order_id).first()
     if not order:
         raise HTTPException(status_code=404, detail="Order not found")
     
-    valid_statuses = ["received", "in_progress", "ready", "delivered", "cancelled"]
-    if status_update.status not in valid_statuses:
-        raise HTTPException(status_code=400, detail=f"Invalid status. Must be one of: {valid_statuses}")
+    snapshot = _status_frame(order), order.status in FINAL_ORDER_STATUSES
+    # Hand the connection back to the pool before the stream starts
+    db.close()
+    return snapshot
+
+@router.get("/orders/{order_id}/events", response_class=StreamingResponse)
+@query_budget(1)
+async def stream_order_status(order_id: str, db: DBSession = Depends(get_db)):
+    """Stream an order's status changes as server-sent events.
     
-    order.status = status_update.status
-    order.updated_at = datetime.utcnow()
-    db.commit()
-    db.refresh(order)
+    The current status is sent first; the stream ends once the order is
+    delivered or cancelled.
+    """
+    subscription = order_events.subscribe(order_topic(order_id))
+    try:
+        current, final = await run_db(db, _order_status_snapshot, order_id)
+    except Exception:
+        subscription.close()
+        raise
     
-    return order
+    if final:
+        subscription.close()
+        return Response(content=current, media_type="text/event-stream", headers=SSE_HEADERS)
+    return StreamingResponse(
+        subscription.stream(current, close_on_final=True),
+        media_type="text/event-stream",
+        headers=SSE_HEADERS
+    )
 
-@router.get("/orders", response_model=List[schemas.OrderDetailResponse])
-def list_orders(
-    guest_id: str = None,
-    status: str = None,
-    db: Session = Depends(get_db)
-):
-    """List orders with optional filtering"""
+@router.get("/guests/{guest_id}/order-events", response_class=StreamingResponse)
+@query_budget(0)
+async def stream_guest_orders(guest_id: str):
+    """Stream status changes of all of a guest's orders as server-sent events"""
+    subscription = order_events.subscribe(guest_topic(guest_id))
+    return StreamingResponse(subscription.stream(), media_type="text/event-stream", headers=SSE_HEADERS)
+
+def _list_orders(db: Session, guest_id: str, status: str, limit: int, cursor: str):
     query = db.query(models.RestaurantOrder)
     
     if guest_id:
@@ -129,23 +335,180 @@ def list_orders(
     if status:
         query = query.filter(models.RestaurantOrder.status == status)
     
-    return query.order_by(models.RestaurantOrder.created_at.desc()).all()
+    keyset = [models.RestaurantOrder.created_at, models.RestaurantOrder.id]
+    return paginate(query, keyset, limit, cursor, descending=True)
+
+@router.get("/orders", response_model=List[schemas.OrderDetailResponse])
+@query_budget(1)
+async def list_orders(
+    guest_id: str = None,
+    status: str = None,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    cursor: str = None,
+    db: DBSession = Depends(get_db)
+):
+    """List orders with optional filtering, newest first.
+    
+    Pass the X-Next-Cursor response header back as cursor to fetch the next page.
+    """
+    orders, next_cursor = await run_db(db, _list_orders, guest_id, status, limit, cursor)
+    headers = {NEXT_CURSOR_HEADER: next_cursor} if next_cursor else None
+    return rows_response(orders, schemas.OrderDetailResponse, headers)
+
+# Guest Spend Endpoints
+def _created_between(column, date_from: Optional[date], date_to: Optional[date]):
+    """created_at filters for an inclusive range of days"""
+    criteria = []
+    if date_from:
+        criteria.append(column >= datetime.combine(date_from, time.min))
+    if date_to:
+        criteria.append(column < datetime.combine(date_to + timedelta(days=1), time.min))
+    return criteria
+
+def _spend_summary(guest_id: Optional[str], date_from: Optional[date], date_to: Optional[date], rows) -> dict:
+    groups = [
+        {"status": order_status, "order_type": order_type, "order_count": count, "total_amount": total or 0.0}
+        for order_status, order_type, count, total in rows
+    ]
+    return {
+        "guest_id": guest_id,
+        "date_from": date_from,
+        "date_to": date_to,
+        "order_count": sum(group["order_count"] for group in groups),
+        "billable_amount": sum(group["total_amount"] for group in groups if group["status"] != "cancelled"),
+        "groups": groups
+    }
+
+def _spend_groups(db: Session, guest_id: Optional[str], date_from: Optional[date], date_to: Optional[date]):
+    order = models.RestaurantOrder
+    query = db.query(order.status, order.order_type, func.count(), func.sum(order.total_amount))
+    if guest_id:
+        query = query.filter(order.guest_id == guest_id)
+    query = query.filter(*_created_between(order.created_at, date_from, date_to))
+    return query.group_by(order.status, order.order_type).all()
+
+@router.get("/spend-summary", response_model=schemas.SpendSummary)
+@query_budget(1)
+async def get_spend_summary(
+    guest_id: str = None,
+    date_from: date = None,
+    date_to: date = None,
+    db: DBSession = Depends(get_db)
+):
+    """Order count and spend of a guest and/or date range, by status and order type.
+    
+    Aggregated in the database, so building a folio does not page through
+    the guest's orders.
+    """
+    if not guest_id and not date_from:
+        raise HTTPException(status_code=400, detail="Pass guest_id, date_from or both")
+    
+    rows = await run_db(db, _spend_groups, guest_id, date_from, date_to)
+    return _spend_summary(guest_id, date_from, date_to, rows)
+
+# Report Endpoints
+def _report_range(date_from: Optional[date], date_to: Optional[date]):
+    date_to = date_to or datetime.utcnow().date()
+    date_from = date_from or date_to - timedelta(days=DEFAULT_REPORT_DAYS - 1)
+    if date_from > date_to:
+        raise HTTPException(status_code=400, detail="date_from must not be after date_to")
+    return date_from, date_to
+
+def _revenue_by_category(db: Session, date_from: date, date_to: date):
+    sales = models.DailyItemSales
+    return db.query(
+        sales.day,
+        sales.category,
+        func.sum(sales.quantity).label("quantity"),
+        func.sum(sales.revenue).label("revenue")
+    ).filter(
+        sales.day.between(date_from, date_to)
+    ).group_by(sales.day, sales.category).order_by(sales.day, sales.category).all()
+
+@router.get("/reports/revenue", response_model=List[schemas.CategoryRevenue])
+@query_budget(1)
+async def get_revenue_report(date_from: date = None, date_to: date = None, db: DBSession = Depends(get_db)):
+    """Quantity sold and revenue per menu category per day, cancelled orders excluded.
+    
+    Defaults to the last 30 days. Read from the daily rollups, so the cost
+    does not grow with the number of orders.
+    """
+    date_from, date_to = _report_range(date_from, date_to)
+    return rows_response(await run_db(db, _revenue_by_category, date_from, date_to), schemas.CategoryRevenue)
+
+def _top_menu_items(db: Session, date_from: date, date_to: date, sort: str, limit: int):
+    sales = models.DailyItemSales
+    totals = {name: func.sum(getattr(sales, name)).label(name) for name in TOP_ITEM_SORTS}
+    return db.query(
+        sales.menu_item_id,
+        func.max(sales.name).label("name"),
+        func.max(sales.category).label("category"),
+        *totals.values()
+    ).filter(
+        sales.day.between(date_from, date_to)
+    ).group_by(sales.menu_item_id).order_by(totals[sort].desc(), sales.menu_item_id).limit(limit).all()
+
+@router.get("/reports/top-items", response_model=List[schemas.TopMenuItem])
+@query_budget(1)
+async def get_top_menu_items(
+    date_from: date = None,
+    date_to: date = None,
+    sort: str = "revenue",
+    limit: int = Query(10, ge=1, le=100),
+    db: DBSession = Depends(get_db)
+):
+    """Best-selling menu items over a range of days (default the last 30), by revenue, quantity or orders"""
+    if sort not in TOP_ITEM_SORTS:
+        raise HTTPException(status_code=400, detail=f"Invalid sort. Must be one of: {TOP_ITEM_SORTS}")
+    date_from, date_to = _report_range(date_from, date_to)
+    items = await run_db(db, _top_menu_items, date_from, date_to, sort, limit)
+    return rows_response(items, schemas.TopMenuItem)
+
+# Kitchen Display Endpoints
+@router.get("/kitchen/queue", response_model=List[schemas.KitchenTicket])
+@query_budget(2)
+async def get_kitchen_queue(
+    request: Request,
+    limit: int = Query(50, ge=1, le=200),
+    db: DBSession = Depends(get_db)
+):
+    """Active orders (received, in progress), the ones due first on top.
+    
+    Served from memory; send the ETag back in If-None-Match to get a 304
+    while the queue is unchanged. Each worker keeps its own index: changes
+    made by other workers reach it over the SSE fan-out, or after
+    KITCHEN_QUEUE_TTL seconds when SSE_FANOUT_ENABLED is off.
+    """
+    if kitchen_queue.needs_load():
+        await run_db(db, kitchen_queue.load)
+    
+    version, body = kitchen_queue.top(limit)
+    headers = {"ETag": kitchen_queue.etag(version), "Cache-Control": "no-cache"}
+    if etag_matches(request.headers.get("if-none-match"), headers["ETag"]):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    return Response(content=body, media_type="application/json", headers=headers)
 
 # Table Reservation Endpoints
-@router.post("/table-reservations", response_model=schemas.TableReservationResponse)
-def create_table_reservation(reservation: schemas.TableReservationCreate, db: Session = Depends(get_db)):
-    """Create table reservation"""
-    # Simple table assignment logic (in real app, check availability)
-    table_number = (hash(f"{reservation.reservation_date}{reservation.reservation_time}") % 10) + 1
+def _create_table_reservation(db: Session, reservation: schemas.TableReservationCreate):
+    starts_at, ends_at = reservation_window(reservation.reservation_date, reservation.reservation_time)
+    table_number = allocate_table(db, reservation.persons_count, starts_at, ends_at)
+    
+    if table_number is None:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail=f"No table available for {reservation.persons_count} persons at "
+                   f"{reservation.reservation_date} {reservation.reservation_time}"
+        )
     
     db_reservation = models.TableReservation(
         **reservation.dict(),
-        table_number=table_number
+        table_number=table_number,
+        starts_at=starts_at,
+        ends_at=ends_at
     )
     
     db.add(db_reservation)
     db.commit()
-    db.refresh(db_reservation)
     
     return {
         "reservation_id": db_reservation.id,
@@ -154,20 +517,93 @@ def create_table_reservation(reservation: schemas.TableReservationCreate, db: Se
         "message": "Table reserved successfully"
     }
 
+@router.post("/table-reservations", response_model=schemas.TableReservationResponse)
+@query_budget(5)
+async def create_table_reservation(reservation: schemas.TableReservationCreate, db: DBSession = Depends(get_db)):
+    """Create table reservation"""
+    return await run_db(db, _create_table_reservation, reservation)
+
+def _get_reservation(db: Session, reservation_id: str):
+    return db.query(models.TableReservation).filter(models.TableReservation.id == reservation_id).first()
+
 @router.get("/table-reservations/{reservation_id}", response_model=schemas.TableReservationDetail)
-def get_reservation(reservation_id: str, db: Session = Depends(get_db)):
+@query_budget(1)
+async def get_reservation(reservation_id: str, db: DBSession = Depends(get_db)):
     """Get reservation details"""
-    reservation = db.query(models.TableReservation).filter(models.TableReservation.id == reservation_id).first()
+    reservation = await run_db(db, _get_reservation, reservation_id)
     if not reservation:
         raise HTTPException(status_code=404, detail="Reservation not found")
     return reservation
 
-@router.get("/table-reservations", response_model=List[schemas.TableReservationDetail])
-def list_reservations(guest_id: str = None, db: Session = Depends(get_db)):
-    """List table reservations"""
+def _list_reservations(db: Session, guest_id: str, limit: int, cursor: str):
     query = db.query(models.TableReservation)
     
     if guest_id:
         query = query.filter(models.TableReservation.guest_id == guest_id)
     
-    return query.order_by(models.TableReservation.reservation_date, models.TableReservation.reservation_time).all()
\ No newline at end of file
+    keyset = [
+        models.TableReservation.reservation_date,
+        models.TableReservation.reservation_time,
+        models.TableReservation.id
+    ]
+    return paginate(query, keyset, limit, cursor)
+
+@router.get("/table-reservations", response_model=List[schemas.TableReservationDetail])
+@query_budget(1)
+async def list_reservations(
+    guest_id: str = None,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    cursor: str = None,
+    db: DBSession = Depends(get_db)
+):
+    """List table reservations by date and time.
+    
+    Pass the X-Next-Cursor response header back as cursor to fetch the next page.
+    """
+    reservations, next_cursor = await run_db(db, _list_reservations, guest_id, limit, cursor)
+    headers = {NEXT_CURSOR_HEADER: next_cursor} if next_cursor else None
+    return rows_response(reservations, schemas.TableReservationDetail, headers)
+
+@router.get("/table-availability", response_model=schemas.TableAvailabilityResponse)
+@query_budget(2)
+async def get_table_availability(
+    persons_count: int = Query(..., ge=1),
+    date_from: date = Query(...),
+    date_to: date = None,
+    db: DBSession = Depends(get_db)
+):
+    """List free seating slots for a party size over a date range"""
+    slots = await run_db(db, table_availability, persons_count, date_from, date_to or date_from)
+    return {
+        "persons_count": persons_count,
+        "duration_minutes": int(RESERVATION_DURATION.total_seconds() // 60),
+        "slots": slots
+    }
+
+# Table Inventory Endpoints
+def _list_tables(db: Session):
+    return db.query(models.RestaurantTable).order_by(models.RestaurantTable.table_number).all()
+
+@router.get("/tables", response_model=List[schemas.RestaurantTableResponse])
+@query_budget(1)
+async def list_tables(db: DBSession = Depends(get_db)):
+    """List restaurant tables and their capacity"""
+    return rows_response(await run_db(db, _list_tables), schemas.RestaurantTableResponse)
+
+def _upsert_table(db: Session, table: schemas.RestaurantTableCreate):
+    # INSERT ... ON CONFLICT ... RETURNING instead of merge()'s SELECT plus write
+    values = table.model_dump()
+    stmt = dialect_insert(db)(models.RestaurantTable.__table__).values(**values)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[models.RestaurantTable.table_number],
+        set_={name: stmt.excluded[name] for name in values if name != "table_number"}
+    ).returning(*models.RestaurantTable.__table__.c)
+    db_table = db.execute(stmt).one()
+    db.commit()
+    return db_table
+
+@router.post("/tables", response_model=schemas.RestaurantTableResponse)
+@query_budget(1)
+async def upsert_table(table: schemas.RestaurantTableCreate, db: DBSession = Depends(get_db)):
+    """Add a table or change its capacity/active flag (admin only)"""
+    return await run_db(db, _upsert_table, table)
\ No newline at end of file
@@ -1,6 +1,6 @@
 from pydantic import BaseModel
 from typing import List, Optional, Dict, Any
-from datetime import datetime
+from datetime import date, datetime
 
 # Menu Schemas
 class MenuItemBase(BaseModel):
@@ -28,6 +28,15 @@ class MenuCategory(BaseModel):
 class MenuResponse(BaseModel):
     categories: Dict[str, List[MenuItemResponse]]
 
+class ImportRowError(BaseModel):
+    row: int  # index in the catalog, from 0
+    errors: List[Dict[str, Any]]
+
+class BulkImportResponse(BaseModel):
+    imported: int
+    rejected: int
+    errors: List[ImportRowError]  # the first MAX_REPORTED_ERRORS rejected rows
+
 # Order Schemas
 class OrderItem(BaseModel):
     menu_item_id: str
@@ -99,6 +108,88 @@ class TableReservationDetail(BaseModel):
     class Config:
         from_attributes = True
 
+# Table Inventory Schemas
+class RestaurantTableBase(BaseModel):
+    table_number: int
+    capacity: int
+    active: bool = True
+
+class RestaurantTableCreate(RestaurantTableBase):
+    pass
+
+class RestaurantTableResponse(RestaurantTableBase):
+    class Config:
+        from_attributes = True
+
+class TableAvailabilitySlot(BaseModel):
+    date: str  # YYYY-MM-DD
+    time: str  # HH:MM
+    available_tables: List[int]
+
+class TableAvailabilityResponse(BaseModel):
+    persons_count: int
+    duration_minutes: int
+    slots: List[TableAvailabilitySlot]
+
+# Kitchen Queue Schemas
+class KitchenTicketItem(BaseModel):
+    name: str
+    quantity: int
+
+class KitchenTicket(BaseModel):
+    order_id: str
+    room_number: Optional[str]
+    order_type: Optional[str]
+    status: str
+    items: List[KitchenTicketItem]
+    special_requests: Optional[str]
+    created_at: datetime
+    due_at: datetime  # created_at + longest preparation_time of its items
+    
+    class Config:
+        from_attributes = True
+
 # Status Update Schemas
 class StatusUpdate(BaseModel):
-    status: str
\ No newline at end of file
+    status: str
+
+class BulkStatusUpdate(StatusUpdate):
+    order_ids: List[str]
+
+class BulkUpdateError(BaseModel):
+    id: str
+    detail: str
+
+class BulkOrderUpdateResponse(BaseModel):
+    updated: List[OrderDetailResponse]
+    errors: List[BulkUpdateError]  # ids that were not updated, and why
+
+# Spend Summary Schemas
+class SpendGroup(BaseModel):
+    status: str
+    order_type: Optional[str]
+    order_count: int
+    total_amount: float
+
+class SpendSummary(BaseModel):
+    guest_id: Optional[str]
+    date_from: Optional[date]
+    date_to: Optional[date]
+    order_count: int
+    billable_amount: float  # every status except cancelled
+    groups: List[SpendGroup]
+
+# Report Schemas
+class CategoryRevenue(BaseModel):
+    day: date
+    category: Optional[str]  # menu category
+    quantity: int
+    revenue: float
+
+class TopMenuItem(BaseModel):
+    menu_item_id: str
+    name: Optional[str]
+    category: Optional[str]
+    order_count: int
+    quantity: int
+    revenue: float
\ No newline at end of file
@@ -0,0 +1,59 @@
+"""Bulk menu import: upserts by (category, name), skips and reports invalid rows"""
+import json
+
+CATEGORY = "import-test"
+CATALOG_CSV = f"""name,price,category,preparation_time
+Espresso,2.5,{CATEGORY},5
+Latte,3.5,{CATEGORY},
+Mocha,4.0,{CATEGORY},8
+"""
+
+def _import(client, body, content_type):
+    return client.post("/api/menu/items/bulk", content=body, headers={"Content-Type": content_type})
+
+def _imported_items(client, category=CATEGORY):
+    return {item["name"]: item for item in client.get("/api/menu").json()["categories"].get(category, [])}
+
+def test_csv_catalog_is_imported(client):
+    response = _import(client, CATALOG_CSV, "text/csv")
+
+    assert response.status_code == 200
+    assert response.json() == {"imported": 3, "rejected": 0, "errors": []}
+    items = _imported_items(client)
+    assert sorted(items) == ["Espresso", "Latte", "Mocha"]
+    assert items["Latte"]["preparation_time"] == 15  # empty cell, schema default
+
+def test_reimport_updates_instead_of_duplicating(client):
+    _import(client, CATALOG_CSV, "text/csv")
+    ids = {name: item["id"] for name, item in _imported_items(client).items()}
+
+    response = _import(client, CATALOG_CSV.replace("Mocha,4.0", "Mocha,4.5"), "text/csv")
+
+    assert response.json()["imported"] == 3
+    items = _imported_items(client)
+    assert {name: item["id"] for name, item in items.items()} == ids
+    assert items["Mocha"]["price"] == 4.5
+
+def test_invalid_rows_are_reported_and_the_rest_imported(client):
+    rows = [
+        {"name": "Flat white", "price": 3.8, "category": CATEGORY + "-mixed"},
+        {"name": "Cortado", "price": "cheap", "category": CATEGORY + "-mixed"},
+        {"name": "Ristretto", "category": CATEGORY + "-mixed"},
+        {"name": "Macchiato", "price": 3.0, "category": CATEGORY + "-mixed"},
+    ]
+
+    response = _import(client, json.dumps(rows), "application/json")
+
+    assert response.status_code == 200
+    body = response.json()
+    assert (body["imported"], body["rejected"]) == (2, 2)
+    assert [error["row"] for error in body["errors"]] == [1, 2]
+    assert body["errors"][0]["errors"][0]["loc"] == ["price"]
+    assert body["errors"][1]["errors"][0]["type"] == "missing"
+    assert sorted(_imported_items(client, CATEGORY + "-mixed")) == ["Flat white", "Macchiato"]
+
+def test_unparseable_catalog_is_rejected(client):
+    response = _import(client, "[{", "application/json")
+
+    assert response.status_code == 400
+    assert "Could not parse json catalog" in response.json()["detail"]
@@ -0,0 +1,36 @@
+"""Bulk status updates apply to the known ids and report the rest"""
+
+def _status(client, order_id):
+    return client.get(f"/api/orders/{order_id}").json()["status"]
+
+def test_mixed_ids_update_known_orders_and_report_unknown(client, order):
+    first, second = order()["order_id"], order()["order_id"]
+
+    response = client.patch("/api/orders/status", json={
+        "order_ids": [first, "missing-order", second, first],
+        "status": "ready"
+    })
+
+    assert response.status_code == 200
+    body = response.json()
+    assert sorted(o["id"] for o in body["updated"]) == sorted([first, second])
+    assert {o["status"] for o in body["updated"]} == {"ready"}
+    assert body["errors"] == [{"id": "missing-order", "detail": "Order not found"}]
+    assert _status(client, first) == _status(client, second) == "ready"
+
+def test_invalid_status_changes_nothing(client, order):
+    order_id = order()["order_id"]
+
+    response = client.patch("/api/orders/status", json={"order_ids": [order_id], "status": "eaten"})
+
+    assert response.status_code == 400
+    assert _status(client, order_id) == "received"
+
+def test_only_unknown_ids_update_nothing(client):
+    response = client.patch("/api/orders/status", json={"order_ids": ["nope-1", "nope-2"], "status": "ready"})
+
+    assert response.status_code == 200
+    assert response.json() == {
+        "updated": [],
+        "errors": [{"id": "nope-1", "detail": "Order not found"}, {"id": "nope-2", "detail": "Order not found"}]
+    }
@@ -0,0 +1,53 @@
+"""Idempotency-Key handling of order creation"""
+import uuid
+
+from shared.idempotency import MAX_KEY_LENGTH, REPLAYED_HEADER
+
+def _order_body(menu_item, guest_id, quantity=1):
+    return {
+        "guest_id": guest_id,
+        "order_type": "room_service",
+        "items": [{"menu_item_id": menu_item["id"], "quantity": quantity}]
+    }
+
+def test_retry_replays_the_stored_response(client, menu_item):
+    guest_id = f"guest-{uuid.uuid4()}"
+    body = _order_body(menu_item(), guest_id)
+    headers = {"Idempotency-Key": str(uuid.uuid4())}
+
+    first = client.post("/api/orders", json=body, headers=headers)
+    retry = client.post("/api/orders", json=body, headers=headers)
+
+    assert first.status_code == retry.status_code == 200
+    assert REPLAYED_HEADER not in first.headers
+    assert retry.headers[REPLAYED_HEADER] == "true"
+    assert retry.json() == first.json()
+    assert len(client.get("/api/orders", params={"guest_id": guest_id}).json()) == 1
+
+def test_key_reused_with_another_body_is_rejected(client, menu_item):
+    item = menu_item()
+    headers = {"Idempotency-Key": str(uuid.uuid4())}
+
+    first = client.post("/api/orders", json=_order_body(item, "guest-1"), headers=headers)
+    reused = client.post("/api/orders", json=_order_body(item, "guest-1", quantity=2), headers=headers)
+
+    assert first.status_code == 200
+    assert reused.status_code == 422
+    assert REPLAYED_HEADER not in reused.headers
+
+def test_requests_without_a_key_are_not_deduplicated(client, menu_item):
+    body = _order_body(menu_item(), "guest-1")
+
+    first = client.post("/api/orders", json=body)
+    second = client.post("/api/orders", json=body)
+
+    assert first.json()["order_id"] != second.json()["order_id"]
+
+def test_overlong_key_is_rejected(client, menu_item):
+    response = client.post(
+        "/api/orders",
+        json=_order_body(menu_item(), "guest-1"),
+        headers={"Idempotency-Key": "k" * (MAX_KEY_LENGTH + 1)}
+    )
+
+    assert response.status_code == 400
@@ -0,0 +1,52 @@
+"""PrometheusMiddleware keeps event streams out of the request latency and in-flight metrics"""
+from fastapi import FastAPI
+from fastapi.responses import StreamingResponse
+from fastapi.testclient import TestClient
+from prometheus_client import REGISTRY
+
+from shared.instrumentation import PrometheusMiddleware
+
+STREAM_ROUTE = "/instrumentation-test/stream"
+PLAIN_ROUTE = "/instrumentation-test/plain"
+
+def _value(name, **labels):
+    return REGISTRY.get_sample_value(name, labels) or 0.0
+
+def _gauges():
+    return _value("http_requests_in_flight"), _value("http_streams_open")
+
+app = FastAPI()
+app.add_middleware(PrometheusMiddleware)
+seen_while_streaming = []
+seen_while_handling = []
+
+@app.get(STREAM_ROUTE)
+async def stream():
+    async def events():
+        seen_while_streaming.append(_gauges())
+        yield b"event: ping\ndata: {}\n\n"
+    return StreamingResponse(events(), media_type="text/event-stream")
+
+@app.get(PLAIN_ROUTE)
+async def plain():
+    seen_while_handling.append(_gauges())
+    return {"ok": True}
+
+def test_event_streams_are_counted_apart_from_requests():
+    client = TestClient(app)
+    in_flight, streams = _gauges()
+
+    assert client.get(STREAM_ROUTE).text == "event: ping\ndata: {}\n\n"
+    assert client.get(PLAIN_ROUTE).json() == {"ok": True}
+
+    assert seen_while_streaming == [(in_flight, streams + 1)]
+    assert seen_while_handling == [(in_flight + 1, streams)]
+    assert _gauges() == (in_flight, streams)
+
+    stream_labels = {"method": "GET", "route": STREAM_ROUTE}
+    plain_labels = {"method": "GET", "route": PLAIN_ROUTE}
+    assert _value("http_stream_duration_seconds_count", **stream_labels) == 1
+    assert _value("http_request_duration_seconds_count", **stream_labels) == 0
+    assert _value("http_request_duration_seconds_count", **plain_labels) == 1
+    assert _value("http_stream_duration_seconds_count", **plain_labels) == 0
+    assert _value("http_responses_total", status="200", **stream_labels) == 1
@@ -0,0 +1,64 @@
+"""Kitchen queue: sorted by due time, finished orders drop off"""
+import pytest
+
+from shared.streaming import order_topic
+
+from app import models
+from app.database import SessionLocal
+from app.kitchen import kitchen_queue
+
+@pytest.fixture
+def dish(client):
+    """Factory for menu items with a preparation time"""
+    def create(preparation_time):
+        response = client.post("/api/menu/items", json={
+            "name": f"Dish {preparation_time}",
+            "price": 10.0,
+            "category": "mains",
+            "preparation_time": preparation_time
+        })
+        assert response.status_code == 200, response.text
+        return response.json()
+    return create
+
+def _queue(client, limit=3):
+    response = client.get("/api/kitchen/queue", params={"limit": limit})
+    assert response.status_code == 200
+    return [ticket["order_id"] for ticket in response.json()]
+
+def test_queue_is_ordered_by_due_time(client, order, dish):
+    # Other tests' orders take 15 minutes, so these are due first
+    slow = order(dish(3))["order_id"]
+    fast = order(dish(1))["order_id"]
+    medium = order(dish(2))["order_id"]
+
+    assert _queue(client) == [fast, medium, slow]
+
+    client.patch(f"/api/orders/{medium}/status", json={"status": "in_progress"})
+    assert _queue(client) == [fast, medium, slow]
+
+    client.patch(f"/api/orders/{fast}/status", json={"status": "delivered"})
+    client.patch(f"/api/orders/{slow}/status", json={"status": "ready"})
+    assert _queue(client, limit=200)[0] == medium
+    assert not {fast, slow} & set(_queue(client, limit=200))
+
+def test_other_workers_changes_arrive_over_the_fanout(client, order, dish):
+    first = order(dish(1))["order_id"]
+    second = order(dish(2))["order_id"]
+    queue = _queue(client, limit=200)
+    assert queue.index(first) < queue.index(second)
+
+    # Another worker delivers the first order and marks the second ready
+    db = SessionLocal()
+    for order_id, status in ((first, "delivered"), (second, "ready")):
+        db.query(models.RestaurantOrder).filter(models.RestaurantOrder.id == order_id).update({"status": status})
+    db.commit()
+    db.close()
+
+    kitchen_queue.remote_change([order_topic(first), "guest:guest-1"], final=True)
+    queue = _queue(client, limit=200)
+    assert first not in queue and second in queue
+
+    # Non-final events make the next read reload from the database
+    kitchen_queue.remote_change([order_topic(second), "guest:guest-1"], final=False)
+    assert second not in _queue(client, limit=200)
@@ -0,0 +1,32 @@
+"""GET /api/menu carries an ETag and Cache-Control, and revalidates with If-None-Match"""
+from shared.caching import CATALOG_CACHE_CONTROL
+
+def test_menu_carries_etag_and_cache_control(client, menu_item):
+    menu_item()
+
+    response = client.get("/api/menu")
+
+    assert response.status_code == 200
+    assert response.headers["etag"].startswith('"')
+    assert response.headers["cache-control"] == CATALOG_CACHE_CONTROL
+
+def test_matching_etag_gets_empty_304(client, menu_item):
+    menu_item()
+    etag = client.get("/api/menu").headers["etag"]
+
+    for if_none_match in (etag, f'"other", W/{etag}', "*"):
+        response = client.get("/api/menu", headers={"If-None-Match": if_none_match})
+        assert response.status_code == 304
+        assert response.content == b""
+        assert response.headers["etag"] == etag
+    assert client.get("/api/menu", headers={"If-None-Match": '"other"'}).status_code == 200
+
+def test_etag_changes_after_a_menu_write(client, menu_item):
+    etag = client.get("/api/menu").headers["etag"]
+
+    menu_item("Scones", 5.0, "pastries")
+    response = client.get("/api/menu", headers={"If-None-Match": etag})
+
+    assert response.status_code == 200
+    assert response.headers["etag"] != etag
+    assert [item["name"] for item in response.json()["categories"]["pastries"]] == ["Scones"]
@@ -0,0 +1,134 @@
+"""Order status streams: subscribers get their own orders' events, in order.
+
+The guest stream never ends, which TestClient cannot read, so these tests
+call the ASGI app directly and disconnect once the expected frames arrived.
+"""
+import json
+import types
+import asyncio
+
+import httpx
+import pytest
+
+from shared.streaming import EventBroadcaster, guest_topic
+
+from app import routers
+from app.main import app
+
+@pytest.fixture
+def broadcaster(monkeypatch):
+    # A broadcaster bound to this test's event loop, not the TestClient's
+    broadcaster = EventBroadcaster()
+    monkeypatch.setattr(routers, "order_events", broadcaster)
+    return broadcaster
+
+def _parse(frame: str) -> dict:
+    fields = dict(line.split(": ", 1) for line in frame.splitlines())
+    return {"event": fields["event"], **json.loads(fields["data"])}
+
+async def _read_events(path: str, count: int) -> list:
+    """GET path and collect SSE events until count arrived or the response ended"""
+    events, done = [], asyncio.Event()
+    requested = False
+
+    async def receive():
+        nonlocal requested
+        if not requested:
+            requested = True
+            return {"type": "http.request", "body": b"", "more_body": False}
+        await done.wait()
+        return {"type": "http.disconnect"}
+
+    async def send(message):
+        if message["type"] != "http.response.body":
+            return
+        for frame in message.get("body", b"").decode().split("\n\n"):
+            if frame and not frame.startswith(":"):
+                events.append(_parse(frame))
+        if len(events) >= count or not message.get("more_body", False):
+            done.set()
+
+    scope = {
+        "type": "http", "http_version": "1.1", "method": "GET", "scheme": "http",
+        "path": path, "raw_path": path.encode(), "root_path": "", "query_string": b"",
+        "headers": [], "server": ("testserver", 80), "client": ("testclient", 50000),
+    }
+    await asyncio.wait_for(app(scope, receive, send), timeout=5)
+    return events
+
+async def _subscribed(broadcaster: EventBroadcaster, count: int = 1):
+    while broadcaster.subscriber_count() < count:
+        await asyncio.sleep(0.01)
+
+def test_guest_stream_only_carries_that_guests_orders(client, order, broadcaster):
+    mine = order(guest_id="guest-sse-1")["order_id"]
+    theirs = order(guest_id="guest-sse-2")["order_id"]
+
+    async def scenario():
+        stream = asyncio.ensure_future(_read_events("/api/guests/guest-sse-1/order-events", 2))
+        await _subscribed(broadcaster)
+        async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://test") as api:
+            for order_id, status in ((theirs, "in_progress"), (mine, "in_progress"), (theirs, "ready"), (mine, "ready")):
+                response = await api.patch(f"/api/orders/{order_id}/status", json={"status": status})
+                assert response.status_code == 200
+        return await stream
+
+    events = asyncio.run(scenario())
+
+    assert [(e["event"], e["order_id"], e["status"]) for e in events] == [
+        ("status", mine, "in_progress"),
+        ("status", mine, "ready"),
+    ]
+    assert {e["guest_id"] for e in events} == {"guest-sse-1"}
+
+def test_order_stream_starts_with_current_status_and_ends_when_final(client, order, broadcaster):
+    order_id = order()["order_id"]
+
+    async def scenario():
+        stream = asyncio.ensure_future(_read_events(f"/api/orders/{order_id}/events", 10))
+        await _subscribed(broadcaster)
+        async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://test") as api:
+            await api.patch(f"/api/orders/{order_id}/status", json={"status": "in_progress"})
+            await api.patch(f"/api/orders/{order_id}/status", json={"status": "delivered"})
+        return await stream
+
+    events = asyncio.run(scenario())
+
+    assert [e["status"] for e in events] == ["received", "in_progress", "delivered"]
+
+class FakeFanout:
+    """Stands in for the RabbitMQ fan-out exchange between two processes"""
+
+    def __init__(self, *peers: EventBroadcaster):
+        self.peers = peers
+
+    async def publish(self, message, routing_key):
+        for peer in self.peers:
+            await peer._on_message(types.SimpleNamespace(body=message.body, headers=message.headers))
+
+def test_fanout_delivers_other_workers_events_to_matching_subscribers():
+    writer, reader = EventBroadcaster(), EventBroadcaster()
+    heard, echoed = [], []
+    reader.add_listener(lambda topics, final: heard.append((topics, final)))
+    writer.add_listener(lambda topics, final: echoed.append((topics, final)))
+
+    async def scenario():
+        loop = asyncio.get_running_loop()
+        fanout = FakeFanout(writer, reader)
+        for broadcaster in (writer, reader):
+            broadcaster._loop, broadcaster._exchange = loop, fanout
+
+        subscription = reader.subscribe(guest_topic("guest-a"))
+        writer.publish([guest_topic("guest-b")], b"event: status\ndata: {}\n\n")
+        writer.publish([guest_topic("guest-a")], b"event: status\ndata: {\"n\":1}\n\n", final=True)
+        frame = await asyncio.wait_for(subscription.queue.get(), timeout=5)
+        subscription.close()
+        return frame, subscription.queue.qsize()
+
+    frame, left = asyncio.run(scenario())
+
+    assert frame == (b"event: status\ndata: {\"n\":1}\n\n", True)
+    assert left == 0
+    # Listeners hear every event from other processes, none of their own
+    assert heard == [([guest_topic("guest-b")], False), ([guest_topic("guest-a")], True)]
+    assert echoed == []
@@ -0,0 +1,76 @@
+"""Outbox relay: only broker-confirmed rows are stamped, the rest are retried"""
+import asyncio
+
+import pytest
+
+from shared.outbox import OutboxRelay, record_event
+
+from app import models
+from app.database import SessionLocal, run_db
+
+class FakeManager:
+    """publish_many that confirms each message for which the next scripted predicate holds"""
+
+    def __init__(self, *results):
+        self.results = list(results)
+        self.calls = []
+
+    async def publish_many(self, exchange_name, messages, exchange_type="fanout"):
+        messages = list(messages)
+        self.calls.append((exchange_name, exchange_type, messages))
+        confirms = self.results.pop(0)
+        return [confirms(message["data"]["order_id"]) for _, message in messages]
+
+@pytest.fixture
+def db():
+    session = SessionLocal()
+    # Other tests leave their order events pending; start from an empty outbox
+    session.query(models.OutboxEvent).delete()
+    session.commit()
+    yield session
+    session.close()
+
+def _stage(db, count):
+    for n in range(count):
+        record_event(db, models.OutboxEvent, "order.updated", {"order_id": f"order-{n}"})
+    db.commit()
+
+def _published(db):
+    db.expire_all()
+    return {
+        event.payload["order_id"]: (event.published_at is not None, event.attempts)
+        for event in db.query(models.OutboxEvent).all()
+    }
+
+def test_only_confirmed_rows_are_marked_published(db):
+    _stage(db, 4)
+    manager = FakeManager(lambda order_id: order_id in ("order-0", "order-2"))
+    relay = OutboxRelay(models.OutboxEvent, SessionLocal, run_db, manager=manager)
+
+    confirmed = asyncio.run(relay.relay_once(db))
+
+    assert confirmed == 2
+    exchange_name, exchange_type, messages = manager.calls[0]
+    assert exchange_type == "topic"
+    assert [key for key, _ in messages] == ["order.updated"] * 4
+    assert sorted(message["data"]["order_id"] for _, message in messages) == [f"order-{n}" for n in range(4)]
+    assert _published(db) == {
+        "order-0": (True, 1),
+        "order-1": (False, 1),
+        "order-2": (True, 1),
+        "order-3": (False, 1),
+    }
+
+def test_unconfirmed_rows_are_retried(db):
+    _stage(db, 3)
+    manager = FakeManager(lambda order_id: order_id == "order-0", lambda order_id: True)
+    relay = OutboxRelay(models.OutboxEvent, SessionLocal, run_db, manager=manager)
+
+    asyncio.run(relay.relay_once(db))
+    retried = asyncio.run(relay.relay_once(db))
+
+    assert retried == 2
+    assert sorted(message["data"]["order_id"] for _, message in manager.calls[1][2]) == ["order-1", "order-2"]
+    assert _published(db) == {"order-0": (True, 1), "order-1": (True, 2), "order-2": (True, 2)}
+    assert asyncio.run(relay.relay_once(db)) == 0
+    assert len(manager.calls) == 2
@@ -0,0 +1,55 @@
+"""Keyset pagination of the order list through X-Next-Cursor"""
+import uuid
+
+import pytest
+
+from shared.pagination import NEXT_CURSOR_HEADER, encode_cursor
+
+@pytest.fixture
+def guest_orders(menu_item, order):
+    """Five orders of one new guest, newest first as the list returns them"""
+    guest_id = f"guest-{uuid.uuid4()}"
+    item = menu_item()
+    ids = [order(item, guest_id=guest_id)["order_id"] for _ in range(5)]
+    return guest_id, ids[::-1]
+
+def test_pages_follow_the_next_cursor(client, guest_orders):
+    guest_id, expected = guest_orders
+    params = {"guest_id": guest_id, "limit": 2}
+    seen = []
+    pages = 0
+
+    while True:
+        response = client.get("/api/orders", params=params)
+        assert response.status_code == 200
+        seen += [row["id"] for row in response.json()]
+        pages += 1
+        cursor = response.headers.get(NEXT_CURSOR_HEADER)
+        if not cursor:
+            break
+        params["cursor"] = cursor
+
+    assert seen == expected
+    assert pages == 3
+
+def test_last_page_has_no_cursor(client, guest_orders):
+    guest_id, expected = guest_orders
+
+    response = client.get("/api/orders", params={"guest_id": guest_id, "limit": len(expected)})
+
+    assert [row["id"] for row in response.json()] == expected
+    assert NEXT_CURSOR_HEADER not in response.headers
+
+@pytest.mark.parametrize("cursor", [
+    "not a cursor",
+    "%%%",
+    encode_cursor("2030-01-01T00:00:00"),  # wrong number of values
+    encode_cursor("yesterday", "some-id"),  # not a timestamp
+    encode_cursor("2030-01-01T00:00:00", {"id": "x"}),  # not a scalar
+    encode_cursor(None, "some-id"),
+], ids=["garbage", "not-base64", "short", "bad-timestamp", "object", "null"])
+def test_malformed_cursor_is_a_bad_request(client, cursor):
+    response = client.get("/api/orders", params={"cursor": cursor})
+
+    assert response.status_code == 400
+    assert response.json()["detail"] == "Invalid cursor"
@@ -0,0 +1,101 @@
+"""Every budgeted route stays within its @query_budget.
+
+conftest turns on DB_QUERY_BUDGET_STRICT, so a route over budget raises
+QueryBudgetExceeded out of the TestClient call.
+"""
+import pytest
+
+from app.main import app
+
+RESERVATION_DATE = "2030-06-01"
+
+# (method, route, request options); "json" names a seeded body when it is a
+# string, and "order" picks the seeded order that fills {order_id}
+BUDGETED_CALLS = [
+    ("GET", "/api/menu", {}),
+    ("POST", "/api/menu/items", {"json": {"name": "Soup", "price": 8.0, "category": "mains"}}),
+    ("POST", "/api/orders", {"json": "order"}),
+    ("GET", "/api/orders/{order_id}", {}),
+    ("PATCH", "/api/orders/{order_id}/status", {"json": {"status": "in_progress"}}),
+    ("PATCH", "/api/orders/status", {"json": "bulk_status"}),
+    ("GET", "/api/orders/{order_id}/events", {"order": "delivered_order_id"}),
+    ("GET", "/api/orders", {"params": {"guest_id": "budget-guest", "limit": 2}}),
+    ("GET", "/api/spend-summary", {"params": {"guest_id": "budget-guest"}}),
+    ("GET", "/api/reports/revenue", {}),
+    ("GET", "/api/reports/top-items", {}),
+    ("GET", "/api/kitchen/queue", {}),
+    ("POST", "/api/table-reservations", {"json": "reservation"}),
+    ("GET", "/api/table-reservations/{reservation_id}", {}),
+    ("GET", "/api/table-reservations", {"params": {"limit": 2}}),
+    ("GET", "/api/table-availability", {"params": {"persons_count": 2, "date_from": RESERVATION_DATE}}),
+    ("GET", "/api/tables", {}),
+    ("POST", "/api/tables", {"json": {"table_number": 2, "capacity": 4}}),
+]
+
+# Streams that never end on their own; their budget is covered by the route table check
+UNBOUNDED_STREAMS = {("GET", "/api/guests/{guest_id}/order-events")}
+
+def _budgeted_routes():
+    return {
+        (method, route.path)
+        for route in app.routes
+        if getattr(getattr(route, "endpoint", None), "query_budget", None) is not None
+        for method in route.methods
+    }
+
+@pytest.fixture(scope="module")
+def seeded(client):
+    item = client.post("/api/menu/items", json={"name": "Tea", "price": 3.0, "category": "drinks"}).json()
+    order_body = {"guest_id": "budget-guest", "order_type": "room_service", "items": [{"menu_item_id": item["id"], "quantity": 1}]}
+    order_ids = [client.post("/api/orders", json=order_body).json()["order_id"] for _ in range(4)]
+    # A delivered order's stream is answered with the final status and closed
+    client.patch(f"/api/orders/{order_ids[3]}/status", json={"status": "delivered"})
+    client.post("/api/tables", json={"table_number": 1, "capacity": 4})
+    reservation = {
+        "guest_id": "budget-guest",
+        "guest_name": "Budget Guest",
+        "persons_count": 2,
+        "reservation_date": RESERVATION_DATE,
+        "reservation_time": "19:00"
+    }
+    reservation_id = client.post("/api/table-reservations", json=reservation).json()["reservation_id"]
+    return {
+        "order_id": order_ids[0],
+        "delivered_order_id": order_ids[3],
+        "reservation_id": reservation_id,
+        "order": order_body,
+        "bulk_status": {"order_ids": order_ids[1:3], "status": "in_progress"},
+        "reservation": dict(reservation, reservation_time="21:30"),
+    }
+
+def test_every_budgeted_route_is_exercised():
+    called = {(method, route) for method, route, _ in BUDGETED_CALLS}
+    assert _budgeted_routes() - UNBOUNDED_STREAMS == called
+
+@pytest.mark.parametrize("method,route,options", BUDGETED_CALLS, ids=[f"{m} {r}" for m, r, _ in BUDGETED_CALLS])
+def test_route_within_budget(client, seeded, method, route, options):
+    options = dict(options)
+    if isinstance(options.get("json"), str):
+        options["json"] = seeded[options["json"]]
+    path = route.format(**dict(seeded, order_id=seeded[options.pop("order", "order_id")]))
+
+    response = client.request(method, path, **options)
+
+    assert response.status_code == 200, response.text
+    budget = next(r.endpoint.query_budget for r in app.routes if r.path == route and method in r.methods)
+    assert int(response.headers["x-db-queries"]) <= budget
+
+def test_create_order_queries_do_not_grow_with_items(client, menu_item):
+    items = [menu_item(name=f"Dish {n}", price=5.0 + n, category="mains") for n in range(10)]
+
+    single = client.post("/api/orders", json={
+        "guest_id": "budget-guest", "order_type": "room_service",
+        "items": [{"menu_item_id": items[0]["id"], "quantity": 1}]
+    })
+    many = client.post("/api/orders", json={
+        "guest_id": "budget-guest", "order_type": "room_service",
+        "items": [{"menu_item_id": item["id"], "quantity": 2} for item in items]
+    })
+
+    assert single.status_code == many.status_code == 200
+    assert single.headers["x-db-queries"] == many.headers["x-db-queries"]
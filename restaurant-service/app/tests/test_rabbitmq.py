@@ -0,0 +1,245 @@
+"""Message codecs, and RabbitMQManager publishing and consuming against fakes instead of a broker"""
+import json
+import uuid
+import asyncio
+from datetime import datetime, timezone
+from decimal import Decimal
+
+import pytest
+
+from shared.rabbitmq import RabbitMQManager, _OrderedAcker, decode_body, get_codec
+
+ORDER_ID = uuid.UUID("0b6f2c6e-3f55-4a8e-9d43-2f0c1d7e5a10")
+PAYLOAD = {
+    "order_id": ORDER_ID,
+    "created_at": datetime(2030, 6, 1, 12, 30, 5, 250000),
+    "completed_at": datetime(2030, 6, 1, 13, 0, tzinfo=timezone.utc),
+    "total_amount": Decimal("42.10"),
+    "items": [{"name": "Tea", "quantity": 2, "price": 3.5}],
+    "notes": None,
+}
+DECODED = {
+    "order_id": str(ORDER_ID),
+    "created_at": "2030-06-01T12:30:05.250000",
+    "completed_at": "2030-06-01T13:00:00+00:00",
+    "total_amount": "42.10",
+    "items": [{"name": "Tea", "quantity": 2, "price": 3.5}],
+    "notes": None,
+}
+
+def _codec(name):
+    if name != "json":
+        pytest.importorskip(name)
+    return get_codec(name)
+
+@pytest.mark.parametrize("name", ["json", "orjson", "msgpack"])
+def test_codecs_round_trip_uuid_datetime_and_decimal(name):
+    codec = _codec(name)
+
+    body = codec.encode(PAYLOAD)
+
+    assert codec.decode(body) == DECODED
+    # Consumers pick the decoder from the message's content type
+    assert decode_body(body, codec.content_type) == DECODED
+
+def test_json_codecs_share_a_wire_format():
+    orjson_codec = _codec("orjson")
+
+    assert orjson_codec.content_type == get_codec("json").content_type
+    assert decode_body(orjson_codec.encode(PAYLOAD), None) == DECODED  # legacy messages carry no content type
+    assert orjson_codec.decode(get_codec("json").encode(PAYLOAD)) == DECODED
+
+def test_msgpack_body_is_not_mistaken_for_json():
+    body = _codec("msgpack").encode(PAYLOAD)
+
+    with pytest.raises(ValueError):
+        decode_body(body, "application/json")
+
+def test_unknown_content_type_is_rejected():
+    with pytest.raises(ValueError, match="Unsupported content type"):
+        decode_body(b"<order/>", "application/xml")
+
+def test_unknown_codec_and_unencodable_values_are_rejected():
+    with pytest.raises(ValueError, match="Unknown codec"):
+        get_codec("yaml")
+    with pytest.raises(TypeError):
+        get_codec("json").encode({"value": object()})
+
+class FakeExchange:
+    """Confirms after a per-key delay; keys starting with "fail" are nacked"""
+
+    def __init__(self, delays):
+        self.delays = delays
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.published = []
+
+    async def publish(self, message, routing_key):
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            await asyncio.sleep(self.delays.get(routing_key, 0))
+            if routing_key.startswith("fail"):
+                raise RuntimeError("nacked")
+            self.published.append(routing_key)
+        finally:
+            self.in_flight -= 1
+
+def _manager(exchange, publish_window):
+    manager = RabbitMQManager(url="amqp://unused/", publish_window=publish_window, codec="json")
+    manager.channel = object()  # connected as far as publish_many is concerned
+    manager._exchanges[("events", "topic")] = exchange
+    return manager
+
+def test_publish_many_reports_confirms_in_input_order():
+    keys = ["a", "fail-b", "c", "d", "fail-e", "f", "g"]
+    # Later messages confirm first, so results must be mapped back by position
+    exchange = FakeExchange({key: 0.01 * (len(keys) - n) for n, key in enumerate(keys)})
+    manager = _manager(exchange, publish_window=3)
+
+    confirmed = asyncio.run(manager.publish_many("events", [(key, {"n": n}) for n, key in enumerate(keys)], "topic"))
+
+    assert confirmed == [True, False, True, True, False, True, True]
+    assert exchange.max_in_flight == 3
+    assert sorted(exchange.published) == ["a", "c", "d", "f", "g"]
+    assert (manager.stats.published, manager.stats.confirmed, manager.stats.failed) == (7, 5, 2)
+
+def test_publish_window_bounds_messages_in_flight():
+    exchange = FakeExchange({})
+    manager = _manager(exchange, publish_window=1)
+
+    confirmed = asyncio.run(manager.publish_many("events", [(str(n), {}) for n in range(5)], "topic"))
+
+    assert confirmed == [True] * 5
+    assert exchange.max_in_flight == 1
+    assert exchange.published == ["0", "1", "2", "3", "4"]
+
+class FakeDelivery:
+    """Incoming message recording how it was settled in a shared log"""
+
+    def __init__(self, name, log, body=b"{}", content_type="application/json"):
+        self.name = name
+        self.log = log
+        self.body = body
+        self.content_type = content_type
+
+    async def ack(self, multiple=False):
+        self.log.append(("ack", self.name, multiple))
+
+    async def reject(self, requeue=True):
+        self.log.append(("reject", self.name, requeue))
+
+def test_acker_settles_in_delivery_order():
+    log = []
+    m1, m2, m3, m4, m5 = (FakeDelivery(n, log) for n in range(1, 6))
+    acker = _OrderedAcker()
+
+    async def scenario():
+        for message in (m1, m2, m3, m4, m5):
+            acker.track(message)
+        # Later deliveries finish first and wait for the ones before them
+        await acker.settle(m3, True)
+        await acker.settle(m2, True)
+        assert log == []
+        await acker.settle(m1, True)
+        await acker.settle(m5, False)
+        assert log == [("ack", 3, True)]
+        await acker.settle(m4, True)
+
+    asyncio.run(scenario())
+
+    assert log == [("ack", 3, True), ("ack", 4, True), ("reject", 5, False)]
+
+def test_acker_rejects_failures_between_successes():
+    log = []
+    messages = [FakeDelivery(n, log) for n in range(1, 5)]
+    acker = _OrderedAcker()
+
+    async def scenario():
+        for message in messages:
+            acker.track(message)
+        for message, ok in zip(reversed(messages), (True, False, True, True)):
+            await acker.settle(message, ok)
+
+    asyncio.run(scenario())
+
+    # 1 ok, 2 ok, 3 failed, 4 ok
+    assert log == [("ack", 2, True), ("reject", 3, False), ("ack", 4, True)]
+
+class FakeQueue:
+    def __init__(self, name, arguments):
+        self.name = name
+        self.arguments = arguments
+        self.on_message = None
+
+    async def bind(self, exchange):
+        pass
+
+    async def consume(self, on_message):
+        self.on_message = on_message
+        return "consumer-tag"
+
+    async def cancel(self, consumer_tag):
+        self.on_message = None
+
+class FakeChannel:
+    def __init__(self):
+        self.queues = {}
+
+    async def set_qos(self, prefetch_count):
+        self.prefetch_count = prefetch_count
+
+    async def declare_exchange(self, name, exchange_type, durable=True):
+        return name
+
+    async def declare_queue(self, name, durable=True, arguments=None):
+        self.queues[name] = FakeQueue(name, arguments)
+        return self.queues[name]
+
+    async def close(self):
+        pass
+
+class FakeConnection:
+    def __init__(self, channel):
+        self._channel = channel
+
+    async def channel(self):
+        return self._channel
+
+def test_consumer_acks_in_order_and_dead_letters_failures():
+    log, handled = [], []
+    channel = FakeChannel()
+    manager = RabbitMQManager(url="amqp://unused/", codec="json")
+    manager.channel = object()
+    manager.connection = FakeConnection(channel)
+
+    async def callback(message):
+        # Higher "delay" finishes later; "fail" raises
+        await asyncio.sleep(message["delay"])
+        if message.get("fail"):
+            raise ValueError("bad message")
+        handled.append(message["n"])
+
+    deliveries = [
+        FakeDelivery(1, log, json.dumps({"n": 1, "delay": 0.03}).encode()),
+        FakeDelivery(2, log, json.dumps({"n": 2, "delay": 0.01}).encode()),
+        FakeDelivery(3, log, json.dumps({"n": 3, "delay": 0.0, "fail": True}).encode()),
+        FakeDelivery(4, log, b"not json"),
+        FakeDelivery(5, log, json.dumps({"n": 5, "delay": 0.0}).encode()),
+    ]
+
+    async def scenario():
+        consumer = asyncio.ensure_future(manager.consume_messages("orders", callback, workers=5))
+        while "orders" not in channel.queues or channel.queues["orders"].on_message is None:
+            await asyncio.sleep(0.001)
+        on_message = channel.queues["orders"].on_message
+        await asyncio.gather(*(on_message(delivery) for delivery in deliveries))
+        await manager.stop_consuming()
+        await consumer
+
+    asyncio.run(scenario())
+
+    assert channel.queues["orders"].arguments == {"x-dead-letter-exchange": "orders.dlx"}
+    assert "orders.dead-letter" in channel.queues
+    assert sorted(handled) == [1, 2, 5]
+    assert log == [("ack", 2, True), ("reject", 3, False), ("reject", 4, False), ("ack", 5, True)]
@@ -0,0 +1,59 @@
+"""Table reservations: overlapping bookings conflict, availability skips booked tables"""
+import pytest
+
+# Only this table seats the party, so other tests' tables and bookings do not interfere
+TABLE_NUMBER = 90
+PERSONS = 11
+
+@pytest.fixture(scope="module")
+def large_table(client):
+    response = client.post("/api/tables", json={"table_number": TABLE_NUMBER, "capacity": PERSONS + 1})
+    assert response.status_code == 200, response.text
+    return response.json()
+
+def _reserve(client, reservation_date, reservation_time):
+    return client.post("/api/table-reservations", json={
+        "guest_id": "guest-1",
+        "guest_name": "Guest One",
+        "persons_count": PERSONS,
+        "reservation_date": reservation_date,
+        "reservation_time": reservation_time
+    })
+
+def test_overlapping_reservation_is_rejected(client, large_table):
+    first = _reserve(client, "2031-03-01", "19:00")
+    overlapping = _reserve(client, "2031-03-01", "20:00")
+
+    assert first.status_code == 200
+    assert first.json()["table_number"] == TABLE_NUMBER
+    assert overlapping.status_code == 409
+
+def test_adjacent_reservations_share_the_table(client, large_table):
+    # Seatings last two hours: 19:00 ends exactly when 21:00 starts
+    first = _reserve(client, "2031-03-02", "19:00")
+    adjacent = _reserve(client, "2031-03-02", "21:00")
+    before = _reserve(client, "2031-03-02", "17:00")
+
+    assert [r.status_code for r in (first, adjacent, before)] == [200, 200, 200]
+    assert {r.json()["table_number"] for r in (first, adjacent, before)} == {TABLE_NUMBER}
+
+def test_availability_excludes_booked_tables(client, large_table):
+    assert _reserve(client, "2031-03-03", "19:00").status_code == 200
+
+    response = client.get("/api/table-availability", params={"persons_count": PERSONS, "date_from": "2031-03-03"})
+
+    assert response.status_code == 200
+    body = response.json()
+    assert body["duration_minutes"] == 120
+    free_times = [slot["time"] for slot in body["slots"]]
+    assert all(slot["available_tables"] == [TABLE_NUMBER] for slot in body["slots"])
+    # Any seating from 17:30 to 20:30 would overlap 19:00-21:00
+    assert free_times == [
+        "12:00", "12:30", "13:00", "13:30", "14:00", "14:30", "15:00", "15:30",
+        "16:00", "16:30", "17:00", "21:00", "21:30", "22:00"
+    ]
+
+def test_unbooked_day_offers_every_slot(client, large_table):
+    response = client.get("/api/table-availability", params={"persons_count": PERSONS, "date_from": "2031-03-04"})
+
+    assert len(response.json()["slots"]) == 21  # 12:00 to 22:00 every 30 minutes
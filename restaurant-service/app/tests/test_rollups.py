@@ -0,0 +1,66 @@
+"""Rollups kept from the delta journal match a rebuild from the orders"""
+import pytest
+
+from app import models, rollups
+from app.database import SessionLocal
+
+@pytest.fixture
+def db():
+    session = SessionLocal()
+    yield session
+    session.close()
+
+def _rollup_rows(db):
+    return {
+        (row.day, row.menu_item_id): (row.name, row.category, row.order_count, row.quantity, round(row.revenue, 6))
+        for row in db.query(models.DailyItemSales).all()
+    }
+
+def _set_status(client, order_id, status):
+    response = client.patch(f"/api/orders/{order_id}/status", json={"status": status})
+    assert response.status_code == 200, response.text
+
+def test_folded_rollups_equal_a_rebuild(client, db, menu_item, order):
+    tea, soup, cake = menu_item("Tea", 3.0, "drinks"), menu_item("Soup", 8.5, "mains"), menu_item("Cake", 4.25, "desserts")
+    kept = order(tea, soup)["order_id"]
+    cancelled = order(soup)["order_id"]
+    restored = order(tea, cake)["order_id"]
+    only_cake = order(cake)["order_id"]
+
+    _set_status(client, kept, "delivered")
+    _set_status(client, cancelled, "cancelled")
+    _set_status(client, cancelled, "cancelled")  # no change, nothing journaled
+    _set_status(client, restored, "cancelled")
+    _set_status(client, restored, "received")
+    response = client.patch("/api/orders/status", json={"order_ids": [only_cake], "status": "cancelled"})
+    assert response.status_code == 200
+
+    rollups.fold_pending(db)
+    folded = _rollup_rows(db)
+    assert db.query(models.DailyItemSalesDelta).count() == 0
+
+    rollups.rebuild(db)
+    assert folded == _rollup_rows(db)
+
+def test_rows_back_to_zero_are_dropped(client, db, menu_item, order):
+    item = menu_item("Seasonal special", 12.0, "mains")
+    order_id = order(item)["order_id"]
+    rollups.fold_pending(db)
+    assert db.query(models.DailyItemSales).filter_by(menu_item_id=item["id"]).count() == 1
+
+    _set_status(client, order_id, "cancelled")
+    rollups.fold_pending(db)
+
+    assert db.query(models.DailyItemSales).filter_by(menu_item_id=item["id"]).count() == 0
+
+def test_category_is_restored_when_a_dropped_row_comes_back(client, db, menu_item, order):
+    item = menu_item("Lemonade", 4.0, "drinks")
+    order_id = order(item)["order_id"]
+    _set_status(client, order_id, "cancelled")
+    rollups.fold_pending(db)
+
+    _set_status(client, order_id, "received")
+    rollups.fold_pending(db)
+
+    row = db.query(models.DailyItemSales).filter_by(menu_item_id=item["id"]).one()
+    assert (row.category, row.order_count) == ("drinks", 1)
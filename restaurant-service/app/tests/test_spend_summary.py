@@ -0,0 +1,40 @@
+"""Spend summary: a guest's orders grouped by status and order type, cancelled ones not billed"""
+from datetime import date
+
+GUEST_ID = "guest-spend-1"
+
+def test_summary_groups_orders_and_bills_all_but_cancelled(client, menu_item, order):
+    tea, cake = menu_item("Tea", 3.0), menu_item("Cake", 4.5, "desserts")
+    order(tea, guest_id=GUEST_ID)
+    order(tea, cake, guest_id=GUEST_ID)
+    cancelled = order(cake, guest_id=GUEST_ID)["order_id"]
+    client.patch(f"/api/orders/{cancelled}/status", json={"status": "cancelled"})
+    order(tea, guest_id="guest-spend-2")
+
+    response = client.get("/api/spend-summary", params={"guest_id": GUEST_ID})
+
+    assert response.status_code == 200
+    body = response.json()
+    assert (body["guest_id"], body["order_count"], body["billable_amount"]) == (GUEST_ID, 3, 10.5)
+    assert sorted((g["status"], g["order_type"], g["order_count"], g["total_amount"]) for g in body["groups"]) == [
+        ("cancelled", "room_service", 1, 4.5),
+        ("received", "room_service", 2, 10.5)
+    ]
+
+def test_summary_limited_to_a_date_range(client, order):
+    order(guest_id=GUEST_ID + "-range")
+    today = date.today().isoformat()
+
+    within = client.get("/api/spend-summary", params={"guest_id": GUEST_ID + "-range", "date_from": today})
+    before = client.get("/api/spend-summary", params={
+        "guest_id": GUEST_ID + "-range", "date_from": "2020-01-01", "date_to": "2020-01-31"
+    })
+
+    assert within.json()["order_count"] == 1
+    assert before.json() == {
+        "guest_id": GUEST_ID + "-range", "date_from": "2020-01-01", "date_to": "2020-01-31",
+        "order_count": 0, "billable_amount": 0.0, "groups": []
+    }
+
+def test_summary_needs_a_guest_or_a_date(client):
+    assert client.get("/api/spend-summary").status_code == 400
@@ -0,0 +1,62 @@
+import asyncio
+from logging.config import fileConfig
+
+from alembic import context
+
+from app.database import ASYNC_DATABASE, DATABASE_URL, Base, engine
+from app import models  # noqa: F401 - registers tables on Base.metadata
+
+config = context.config
+
+if config.config_file_name is not None:
+    fileConfig(config.config_file_name)
+
+target_metadata = Base.metadata
+
+# Both services migrate the same database, so keep their histories apart
+VERSION_TABLE = "restaurant_alembic_version"
+
+def include_name(name, type_, parent_names):
+    """Ignore the other service's tables when autogenerating"""
+    if type_ == "table":
+        return name in target_metadata.tables
+    return True
+
+def run_migrations_offline():
+    """Emit SQL to stdout instead of connecting to the database"""
+    context.configure(
+        url=DATABASE_URL,
+        target_metadata=target_metadata,
+        literal_binds=True,
+        version_table=VERSION_TABLE,
+        include_name=include_name,
+    )
+    with context.begin_transaction():
+        context.run_migrations()
+
+def do_run_migrations(connection):
+    context.configure(
+        connection=connection,
+        target_metadata=target_metadata,
+        version_table=VERSION_TABLE,
+        include_name=include_name,
+    )
+    with context.begin_transaction():
+        context.run_migrations()
+
+async def run_async_migrations():
+    async with engine.connect() as connection:
+        await connection.run_sync(do_run_migrations)
+    await engine.dispose()
+
+def run_migrations_online():
+    if ASYNC_DATABASE:
+        asyncio.run(run_async_migrations())
+    else:
+        with engine.connect() as connection:
+            do_run_migrations(connection)
+
+if context.is_offline_mode():
+    run_migrations_offline()
+else:
+    run_migrations_online()
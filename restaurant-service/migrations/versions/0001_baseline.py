@@ -0,0 +1,72 @@
+"""baseline schema
+
+Tables as previously created by Base.metadata.create_all. Databases that
+already have them are left untouched, so this is safe to run on existing
+deployments.
+
+Revision ID: 0001
+Revises:
+Create Date: 2026-10-17
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "0001"
+down_revision = None
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    existing = set(sa.inspect(op.get_bind()).get_table_names())
+
+    if "menu_items" not in existing:
+        op.create_table(
+            "menu_items",
+            sa.Column("id", sa.String(), primary_key=True),
+            sa.Column("name", sa.String(), nullable=False),
+            sa.Column("description", sa.Text()),
+            sa.Column("price", sa.Float(), nullable=False),
+            sa.Column("category", sa.String(), nullable=False),
+            sa.Column("available", sa.Boolean()),
+            sa.Column("image_url", sa.String(), nullable=True),
+            sa.Column("preparation_time", sa.Integer()),
+            sa.Column("created_at", sa.DateTime()),
+        )
+
+    if "restaurant_orders" not in existing:
+        op.create_table(
+            "restaurant_orders",
+            sa.Column("id", sa.String(), primary_key=True),
+            sa.Column("guest_id", sa.String(), nullable=False),
+            sa.Column("room_number", sa.String()),
+            sa.Column("order_type", sa.String()),
+            sa.Column("items", sa.JSON()),
+            sa.Column("status", sa.String()),
+            sa.Column("total_amount", sa.Float()),
+            sa.Column("special_requests", sa.Text()),
+            sa.Column("created_at", sa.DateTime()),
+            sa.Column("updated_at", sa.DateTime()),
+        )
+
+    if "table_reservations" not in existing:
+        op.create_table(
+            "table_reservations",
+            sa.Column("id", sa.String(), primary_key=True),
+            sa.Column("guest_id", sa.String(), nullable=False),
+            sa.Column("guest_name", sa.String(), nullable=False),
+            sa.Column("persons_count", sa.Integer(), nullable=False),
+            sa.Column("reservation_date", sa.String(), nullable=False),
+            sa.Column("reservation_time", sa.String(), nullable=False),
+            sa.Column("table_number", sa.Integer()),
+            sa.Column("status", sa.String()),
+            sa.Column("special_requests", sa.Text()),
+            sa.Column("created_at", sa.DateTime()),
+        )
+
+
+def downgrade():
+    op.drop_table("table_reservations")
+    op.drop_table("restaurant_orders")
+    op.drop_table("menu_items")
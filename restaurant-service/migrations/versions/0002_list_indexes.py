@@ -0,0 +1,31 @@
+"""indexes for order and reservation list queries
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-17
+"""
+from alembic import op
+
+
+revision = "0002"
+down_revision = "0001"
+branch_labels = None
+depends_on = None
+
+INDEXES = [
+    ("ix_restaurant_orders_created_at_id", "restaurant_orders", ["created_at", "id"]),
+    ("ix_restaurant_orders_guest_id_created_at_id", "restaurant_orders", ["guest_id", "created_at", "id"]),
+    ("ix_restaurant_orders_status_created_at_id", "restaurant_orders", ["status", "created_at", "id"]),
+    ("ix_table_reservations_date_time_id", "table_reservations", ["reservation_date", "reservation_time", "id"]),
+    ("ix_table_reservations_guest_id_date_time_id", "table_reservations", ["guest_id", "reservation_date", "reservation_time", "id"]),
+]
+
+
+def upgrade():
+    for name, table, columns in INDEXES:
+        op.create_index(name, table, columns, if_not_exists=True)
+
+
+def downgrade():
+    for name, table, _ in reversed(INDEXES):
+        op.drop_index(name, table_name=table, if_exists=True)
@@ -0,0 +1,82 @@
+"""table inventory and reservation seating windows
+
+Adds restaurant_tables (seeded with the ten tables the old hash-based
+assignment used) and starts_at/ends_at on table_reservations, backfilled
+from reservation_date/reservation_time.
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2026-10-17
+"""
+from datetime import datetime, timedelta
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "0003"
+down_revision = "0002"
+branch_labels = None
+depends_on = None
+
+# table_number -> seats
+DEFAULT_TABLES = {1: 2, 2: 2, 3: 2, 4: 2, 5: 4, 6: 4, 7: 4, 8: 6, 9: 6, 10: 8}
+BACKFILL_DURATION = timedelta(minutes=120)
+
+
+def upgrade():
+    restaurant_tables = op.create_table(
+        "restaurant_tables",
+        sa.Column("table_number", sa.Integer(), primary_key=True, autoincrement=False),
+        sa.Column("capacity", sa.Integer(), nullable=False),
+        sa.Column("active", sa.Boolean()),
+    )
+    op.bulk_insert(
+        restaurant_tables,
+        [{"table_number": n, "capacity": seats, "active": True} for n, seats in DEFAULT_TABLES.items()]
+    )
+
+    with op.batch_alter_table("table_reservations") as batch:
+        batch.add_column(sa.Column("starts_at", sa.DateTime()))
+        batch.add_column(sa.Column("ends_at", sa.DateTime()))
+
+    reservations = sa.table(
+        "table_reservations",
+        sa.column("id", sa.String()),
+        sa.column("reservation_date", sa.String()),
+        sa.column("reservation_time", sa.String()),
+        sa.column("starts_at", sa.DateTime()),
+        sa.column("ends_at", sa.DateTime()),
+    )
+    bind = op.get_bind()
+    rows = bind.execute(
+        sa.select(reservations.c.id, reservations.c.reservation_date, reservations.c.reservation_time)
+    ).all()
+    windows = []
+    for reservation_id, reservation_date, reservation_time in rows:
+        try:
+            starts_at = datetime.strptime(f"{reservation_date} {reservation_time}", "%Y-%m-%d %H:%M")
+        except ValueError:
+            continue
+        windows.append({"_id": reservation_id, "_starts_at": starts_at, "_ends_at": starts_at + BACKFILL_DURATION})
+    if windows:
+        bind.execute(
+            reservations.update()
+            .where(reservations.c.id == sa.bindparam("_id"))
+            .values(starts_at=sa.bindparam("_starts_at"), ends_at=sa.bindparam("_ends_at")),
+            windows
+        )
+
+    op.create_index(
+        "ix_table_reservations_starts_at_table_number",
+        "table_reservations",
+        ["starts_at", "table_number"]
+    )
+
+
+def downgrade():
+    op.drop_index("ix_table_reservations_starts_at_table_number", table_name="table_reservations")
+    with op.batch_alter_table("table_reservations") as batch:
+        batch.drop_column("ends_at")
+        batch.drop_column("starts_at")
+    op.drop_table("restaurant_tables")
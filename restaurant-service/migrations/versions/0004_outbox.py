@@ -0,0 +1,40 @@
+"""transactional outbox for domain events
+
+Revision ID: 0004
+Revises: 0003
+Create Date: 2026-10-17
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "0004"
+down_revision = "0003"
+branch_labels = None
+depends_on = None
+
+PENDING = sa.text("published_at IS NULL")
+
+
+def upgrade():
+    op.create_table(
+        "restaurant_outbox",
+        sa.Column("id", sa.String(), primary_key=True),
+        sa.Column("event_type", sa.String(), nullable=False),
+        sa.Column("payload", sa.JSON(), nullable=False),
+        sa.Column("attempts", sa.Integer()),
+        sa.Column("created_at", sa.DateTime()),
+        sa.Column("published_at", sa.DateTime(), nullable=True),
+    )
+    op.create_index(
+        "ix_restaurant_outbox_pending_created_at",
+        "restaurant_outbox",
+        ["created_at"],
+        postgresql_where=PENDING,
+        sqlite_where=PENDING
+    )
+
+
+def downgrade():
+    op.drop_index("ix_restaurant_outbox_pending_created_at", table_name="restaurant_outbox")
+    op.drop_table("restaurant_outbox")
@@ -0,0 +1,32 @@
+"""idempotency keys for order creation
+
+Revision ID: 0005
+Revises: 0004
+Create Date: 2026-10-17
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "0005"
+down_revision = "0004"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        "restaurant_idempotency_keys",
+        sa.Column("scope", sa.String(), primary_key=True),
+        sa.Column("key", sa.String(), primary_key=True),
+        sa.Column("request_hash", sa.String(), nullable=False),
+        sa.Column("response", sa.JSON(), nullable=False),
+        sa.Column("created_at", sa.DateTime()),
+        sa.Column("expires_at", sa.DateTime(), nullable=False),
+    )
+    op.create_index("ix_restaurant_idempotency_keys_expires_at", "restaurant_idempotency_keys", ["expires_at"])
+
+
+def downgrade():
+    op.drop_index("ix_restaurant_idempotency_keys_expires_at", table_name="restaurant_idempotency_keys")
+    op.drop_table("restaurant_idempotency_keys")
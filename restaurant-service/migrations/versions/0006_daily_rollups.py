@@ -0,0 +1,32 @@
+"""daily sales rollups for reporting
+
+Revision ID: 0006
+Revises: 0005
+Create Date: 2026-10-17
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "0006"
+down_revision = "0005"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        "restaurant_daily_item_sales",
+        sa.Column("day", sa.Date(), primary_key=True),
+        sa.Column("menu_item_id", sa.String(), primary_key=True),
+        sa.Column("name", sa.String()),
+        sa.Column("category", sa.String()),
+        sa.Column("order_count", sa.Integer(), nullable=False),
+        sa.Column("quantity", sa.Integer(), nullable=False),
+        sa.Column("revenue", sa.Float(), nullable=False),
+    )
+    # Existing orders are counted by running python -m app.rollups once
+
+
+def downgrade():
+    op.drop_table("restaurant_daily_item_sales")
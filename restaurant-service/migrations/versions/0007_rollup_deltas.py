@@ -0,0 +1,32 @@
+"""journal of daily sales rollup changes
+
+Revision ID: 0007
+Revises: 0006
+Create Date: 2026-10-17
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "0007"
+down_revision = "0006"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        "restaurant_daily_item_sales_deltas",
+        sa.Column("id", sa.String(), primary_key=True),
+        sa.Column("day", sa.Date(), nullable=False),
+        sa.Column("menu_item_id", sa.String(), nullable=False),
+        sa.Column("name", sa.String()),
+        sa.Column("category", sa.String()),
+        sa.Column("order_count", sa.Integer(), nullable=False),
+        sa.Column("quantity", sa.Integer(), nullable=False),
+        sa.Column("revenue", sa.Float(), nullable=False),
+    )
+
+
+def downgrade():
+    op.drop_table("restaurant_daily_item_sales_deltas")
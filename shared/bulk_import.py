@@ -0,0 +1,170 @@
+"""Bulk catalog import shared by the services.
+
+Accepts JSON arrays, NDJSON or CSV and upserts them with multi-row
+INSERT ... ON CONFLICT in batches. Rows without an id get a stable one
+derived from (category, name), so re-importing a catalog updates the
+existing rows instead of duplicating them. Invalid rows are skipped and
+reported by index; the valid ones are still imported.
+
+Each service's app.bulk_import binds this to its catalog table, schema
+and cache, and runs the CLI through run_import_cli().
+"""
+import os
+import io
+import csv
+import sys
+import json
+import uuid
+import argparse
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Callable, Dict, List, Optional, Tuple, Type
+
+from pydantic import BaseModel, ValidationError
+from sqlalchemy import Table
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.orm import Session
+
+IMPORT_BATCH_SIZE = int(os.getenv("IMPORT_BATCH_SIZE", "500"))
+MAX_REPORTED_ERRORS = 50
+
+CONTENT_TYPES = {
+    "application/json": "json",
+    "application/x-ndjson": "ndjson",
+    "application/ndjson": "ndjson",
+    "text/csv": "csv",
+}
+
+_INSERTS = {
+    "postgresql": postgresql.insert,
+    "sqlite": sqlite.insert,
+}
+
+def dialect_insert(db: Session):
+    """The INSERT construct with ON CONFLICT support for the session's database"""
+    return _INSERTS[db.get_bind().dialect.name]
+
+class CatalogError(ValueError):
+    """Raised when a catalog cannot be parsed as a whole"""
+
+@dataclass
+class ImportResult:
+    imported: int
+    rejected: int = 0
+    errors: List[Dict] = field(default_factory=list)  # the first MAX_REPORTED_ERRORS rejected rows
+
+def detect_format(content_type: Optional[str], filename: Optional[str] = None) -> str:
+    """Map a Content-Type header or file extension to a catalog format"""
+    if content_type:
+        fmt = CONTENT_TYPES.get(content_type.split(";")[0].strip().lower())
+        if fmt:
+            return fmt
+    if filename:
+        extension = os.path.splitext(filename)[1].lstrip(".").lower()
+        if extension in ("json", "ndjson", "csv"):
+            return extension
+    return "json"
+
+def parse_catalog(content: bytes, fmt: str) -> List[Dict]:
+    """Decode raw catalog bytes into a list of row dicts"""
+    try:
+        text = content.decode("utf-8-sig")
+        if fmt == "json":
+            rows = json.loads(text)
+        elif fmt == "ndjson":
+            rows = [json.loads(line) for line in text.splitlines() if line.strip()]
+        elif fmt == "csv":
+            # Empty CSV cells mean "not set", so schema defaults apply
+            rows = [
+                {key: value for key, value in row.items() if value != ""}
+                for row in csv.DictReader(io.StringIO(text))
+            ]
+        else:
+            raise CatalogError(f"Unsupported catalog format: {fmt}")
+    except (UnicodeDecodeError, json.JSONDecodeError, csv.Error) as e:
+        raise CatalogError(f"Could not parse {fmt} catalog: {e}")
+
+    if not isinstance(rows, list) or not all(isinstance(row, dict) for row in rows):
+        raise CatalogError("Catalog must be a list of objects")
+    return rows
+
+def validate_rows(rows: List[Dict], schema: Type[BaseModel], namespace: uuid.UUID) -> Tuple[List[Dict], List[Dict]]:
+    """Validate rows against schema and give each valid one an id.
+
+    Returns the valid rows, and the index and validation errors of each
+    invalid one.
+    """
+    now = datetime.utcnow()
+    valid = {}
+    errors = []
+
+    for index, row in enumerate(rows):
+        try:
+            values = schema.model_validate(row).model_dump()
+        except ValidationError as e:
+            errors.append({"row": index, "errors": e.errors(include_url=False, include_context=False)})
+            continue
+        values["id"] = row.get("id") or str(
+            uuid.uuid5(namespace, f"{values['category']}/{values['name']}")
+        )
+        values["created_at"] = now
+        # Last occurrence wins: one statement cannot upsert the same row twice
+        valid[values["id"]] = values
+
+    return list(valid.values()), errors
+
+def upsert_rows(db: Session, table: Table, values: List[Dict], batch_size: int = IMPORT_BATCH_SIZE):
+    """Upsert validated rows by id in batches, without committing"""
+    if not values:
+        return
+
+    insert = dialect_insert(db)
+    updated_columns = [name for name in values[0] if name not in ("id", "created_at")]
+
+    for start in range(0, len(values), batch_size):
+        stmt = insert(table).values(values[start:start + batch_size])
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[table.c.id],
+            set_={name: stmt.excluded[name] for name in updated_columns}
+        )
+        db.execute(stmt)
+
+async def run_import_cli(argv: List[str], description: str, catalog: str, import_catalog: Callable, database) -> int:
+    """Command line entry point: python -m app.bulk_import <file|-> [--format json|ndjson|csv].
+
+    catalog names the catalog in messages ("menu", "amenity"), import_catalog
+    is the service's importer and database its app.database module.
+    """
+    parser = argparse.ArgumentParser(prog="python -m app.bulk_import", description=description)
+    parser.add_argument("path", help="catalog file, or - for stdin")
+    parser.add_argument("--format", choices=["json", "ndjson", "csv"])
+    parser.add_argument("--batch-size", type=int, default=IMPORT_BATCH_SIZE)
+    args = parser.parse_args(argv)
+
+    if args.path == "-":
+        content = sys.stdin.buffer.read()
+    else:
+        with open(args.path, "rb") as f:
+            content = f.read()
+
+    db = database.SessionLocal()
+    try:
+        rows = parse_catalog(content, args.format or detect_format(None, args.path))
+        result = await database.run_db(db, import_catalog, rows, args.batch_size)
+    except CatalogError as e:
+        print(f"❌ {e}", file=sys.stderr)
+        return 1
+    finally:
+        if database.ASYNC_DATABASE:
+            await db.close()
+        else:
+            db.close()
+        await database.dispose_engine()
+
+    print(f"✅ Imported {result.imported} {catalog} catalog rows")
+    if result.rejected:
+        print(f"❌ Rejected {result.rejected} invalid rows", file=sys.stderr)
+        for error in result.errors:
+            print(f"   row {error['row']}: {error['errors']}", file=sys.stderr)
+        return 1
+    return 0
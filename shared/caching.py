@@ -0,0 +1,25 @@
+"""HTTP caching helpers shared by the catalog endpoints.
+
+Catalog responses (the restaurant menu, the amenity list) carry a strong
+ETag computed from their body and may be cached by clients for
+CATALOG_MAX_AGE seconds, after which they must revalidate with
+If-None-Match and get a 304 while the catalog is unchanged.
+"""
+import os
+import hashlib
+
+CATALOG_MAX_AGE = int(os.getenv("CATALOG_MAX_AGE", "30"))  # seconds
+CATALOG_CACHE_CONTROL = f"public, max-age={CATALOG_MAX_AGE}, must-revalidate"
+
+def body_etag(body: bytes) -> str:
+    """Strong ETag for a response body"""
+    return f'"{hashlib.sha1(body).hexdigest()}"'
+
+def etag_matches(if_none_match: str, etag: str) -> bool:
+    """Evaluate an If-None-Match header against a strong ETag"""
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    candidates = (tag.strip() for tag in if_none_match.split(","))
+    return any(tag.removeprefix("W/") == etag for tag in candidates)
@@ -0,0 +1,191 @@
+"""Idempotency-Key support for endpoints that create orders.
+
+A client sends the same Idempotency-Key header on every retry of one
+request. The first attempt stores its response under the key, in the same
+transaction as the order it created; a retry gets the stored response back
+without repeating the lookups, inserts or events. Reusing a key with a
+different body is rejected, and keys expire after IDEMPOTENCY_TTL.
+
+IDEMPOTENCY_STORE picks where keys live: "database" (default) shares them
+across workers and replicas and makes concurrent retries safe, "memory"
+keeps them in the worker's process and suits a single-worker setup. Each
+service builds its store with create_store(), passing its key model
+(scope, key, request_hash, response, created_at, expires_at columns).
+"""
+import os
+import time
+import asyncio
+import hashlib
+import logging
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import Callable, Optional, Tuple
+
+from fastapi import HTTPException, Response, status
+from fastapi.concurrency import run_in_threadpool
+from pydantic import BaseModel
+from sqlalchemy import delete, event
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+logger = logging.getLogger(__name__)
+
+IDEMPOTENCY_STORE = os.getenv("IDEMPOTENCY_STORE", "database")  # database, memory
+IDEMPOTENCY_TTL = float(os.getenv("IDEMPOTENCY_TTL", "86400"))  # seconds
+IDEMPOTENCY_PURGE_INTERVAL = float(os.getenv("IDEMPOTENCY_PURGE_INTERVAL", "3600"))  # seconds
+IDEMPOTENCY_MEMORY_MAX_KEYS = int(os.getenv("IDEMPOTENCY_MEMORY_MAX_KEYS", "10000"))
+MAX_KEY_LENGTH = 255
+
+REPLAYED_HEADER = "Idempotent-Replayed"
+
+@dataclass(frozen=True)
+class StoredResponse:
+    request_hash: str
+    response: dict
+
+class DatabaseStore:
+    """Keys in the service's idempotency table, written with the order"""
+    
+    def __init__(self, model):
+        self.model = model
+    
+    def get(self, db: Session, scope: str, key: str) -> Optional[StoredResponse]:
+        record = db.get(self.model, (scope, key))
+        if record is None:
+            return None
+        if record.expires_at <= datetime.utcnow():
+            # Expired: the new request takes the key over in its own transaction
+            db.delete(record)
+            return None
+        return StoredResponse(record.request_hash, record.response)
+    
+    def save(self, db: Session, scope: str, key: str, stored: StoredResponse):
+        now = datetime.utcnow()
+        db.add(self.model(
+            scope=scope,
+            key=key,
+            request_hash=stored.request_hash,
+            response=stored.response,
+            created_at=now,
+            expires_at=now + timedelta(seconds=IDEMPOTENCY_TTL)
+        ))
+
+class MemoryStore:
+    """Keys in a bounded in-process dict; lost on restart, not shared between workers"""
+    
+    def __init__(self, max_keys: int = IDEMPOTENCY_MEMORY_MAX_KEYS):
+        self.max_keys = max_keys
+        self._entries: "OrderedDict[Tuple[str, str], Tuple[float, StoredResponse]]" = OrderedDict()
+        self._lock = threading.Lock()
+    
+    def get(self, db: Session, scope: str, key: str) -> Optional[StoredResponse]:
+        with self._lock:
+            entry = self._entries.get((scope, key))
+            if entry is None:
+                return None
+            if entry[0] <= time.monotonic():
+                del self._entries[(scope, key)]
+                return None
+            return entry[1]
+    
+    def save(self, db: Session, scope: str, key: str, stored: StoredResponse):
+        # Only remember the response once the order it describes is committed
+        @event.listens_for(db, "after_commit", once=True)
+        def remember(session):
+            with self._lock:
+                self._entries[(scope, key)] = (time.monotonic() + IDEMPOTENCY_TTL, stored)
+                self._entries.move_to_end((scope, key))
+                while len(self._entries) > self.max_keys:
+                    self._entries.popitem(last=False)
+
+def create_store(model, kind: str = IDEMPOTENCY_STORE):
+    """The IDEMPOTENCY_STORE backend, keeping database keys in model's table"""
+    if kind == "database":
+        return DatabaseStore(model)
+    if kind == "memory":
+        return MemoryStore()
+    raise ValueError(f"Unknown idempotency store {kind!r}, expected database or memory")
+
+class IdempotentRequest:
+    """An Idempotency-Key bound to the request that carried it"""
+    
+    def __init__(self, store, scope: str, key: str, payload: BaseModel, response: Response):
+        self.store = store
+        self.scope = scope
+        self.key = key
+        self.request_hash = hashlib.sha256(payload.model_dump_json().encode()).hexdigest()
+        self.response = response
+    
+    @classmethod
+    def from_header(cls, store, scope: str, key: Optional[str], payload: BaseModel, response: Response) -> Optional["IdempotentRequest"]:
+        if key is None:
+            return None
+        if not key or len(key) > MAX_KEY_LENGTH:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Idempotency-Key must be 1 to {MAX_KEY_LENGTH} characters"
+            )
+        return cls(store, scope, key, payload, response)
+    
+    def replay(self, stored: StoredResponse) -> dict:
+        if stored.request_hash != self.request_hash:
+            raise HTTPException(
+                status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+                detail="Idempotency-Key was already used with a different request"
+            )
+        self.response.headers[REPLAYED_HEADER] = "true"
+        return stored.response
+
+def replay_stored(db: Session, idempotency: Optional[IdempotentRequest]) -> Optional[dict]:
+    """Return the stored response for a retried request, or None if it is new"""
+    if idempotency is None:
+        return None
+    stored = idempotency.store.get(db, idempotency.scope, idempotency.key)
+    return idempotency.replay(stored) if stored is not None else None
+
+def commit_with_response(db: Session, idempotency: Optional[IdempotentRequest], response: dict) -> Optional[dict]:
+    """Commit the request's writes together with its stored response.
+    
+    Returns None on success. If a concurrent retry with the same key
+    committed first, rolls back and returns that attempt's response.
+    """
+    if idempotency is None:
+        db.commit()
+        return None
+    
+    idempotency.store.save(db, idempotency.scope, idempotency.key, StoredResponse(idempotency.request_hash, response))
+    try:
+        db.commit()
+    except IntegrityError:
+        db.rollback()
+        replayed = replay_stored(db, idempotency)
+        if replayed is None:
+            raise
+        return replayed
+    return None
+
+def purge_expired(db: Session, model) -> int:
+    result = db.execute(delete(model).where(model.expires_at <= datetime.utcnow()))
+    db.commit()
+    return result.rowcount
+
+async def run_purge(model, session_factory: Callable, run_db: Callable):
+    """Delete expired keys of model periodically; runs as a background task of the app"""
+    while True:
+        await asyncio.sleep(IDEMPOTENCY_PURGE_INTERVAL)
+        db = session_factory()
+        try:
+            purged = await run_db(db, purge_expired, model)
+            logger.debug("Purged %d expired idempotency keys", purged)
+        except asyncio.CancelledError:
+            raise
+        except Exception:
+            logger.warning("Idempotency key purge failed", exc_info=True)
+        finally:
+            if isinstance(db, AsyncSession):
+                await db.close()
+            else:
+                await run_in_threadpool(db.close)
@@ -0,0 +1,230 @@
+"""Request instrumentation shared by the services.
+
+PrometheusMiddleware records per-route latency, in-flight requests and
+response codes. Server-sent event streams stay open for as long as a client
+listens, so they are counted and timed apart, in http_streams_open and
+http_stream_duration_seconds, and do not skew the request latency and
+in-flight figures. instrument_engine() hooks SQLAlchemy so the statements a
+request runs are counted and timed against that request's route.
+Metrics go to the default prometheus_client registry, which each service
+exposes on /metrics through metrics_response().
+
+With several uvicorn workers (WEB_CONCURRENCY), each one is a process
+with its own registry, so a scrape would see whichever worker answered.
+Setting PROMETHEUS_MULTIPROC_DIR to an empty directory makes every worker
+write its samples there, and metrics_response() then adds them up across
+workers. The images set it and clear the directory on start; gauges
+declare how they are combined with multiprocess_mode.
+
+Responses also carry the SQL totals in X-DB-Queries and Server-Timing
+headers, and endpoints can declare a @query_budget that is checked on
+every request: over budget is logged in production and raises
+QueryBudgetExceeded when DB_QUERY_BUDGET_STRICT is set (tests, CI).
+"""
+import os
+import time
+import logging
+from contextvars import ContextVar
+from dataclasses import dataclass
+from typing import Iterable, List, Optional, Tuple
+
+from prometheus_client import (
+    CONTENT_TYPE_LATEST,
+    REGISTRY,
+    CollectorRegistry,
+    Counter,
+    Gauge,
+    Histogram,
+    generate_latest,
+    multiprocess,
+)
+from sqlalchemy import event
+from starlette.responses import Response
+
+logger = logging.getLogger(__name__)
+
+SERVER_TIMING_HEADERS = os.getenv("SERVER_TIMING_HEADERS", "true").lower() in ("1", "true", "yes")
+DB_QUERY_BUDGET_STRICT = os.getenv("DB_QUERY_BUDGET_STRICT", "false").lower() in ("1", "true", "yes")
+PROMETHEUS_MULTIPROC_DIR = os.getenv("PROMETHEUS_MULTIPROC_DIR")
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.075, 0.1, 0.25, 0.5, 0.75, 1, 2.5, 5, 10)
+STREAM_DURATION_BUCKETS = (1, 10, 30, 60, 300, 900, 1800, 3600, 14400)
+QUERY_COUNT_BUCKETS = (0, 1, 2, 3, 5, 8, 13, 21, 34, 55, 89)
+
+HTTP_REQUEST_DURATION_SECONDS = Histogram(
+    "http_request_duration_seconds",
+    "Time from request start to the end of the response body",
+    ["method", "route"],
+    buckets=LATENCY_BUCKETS
+)
+HTTP_REQUESTS_IN_FLIGHT = Gauge(
+    "http_requests_in_flight",
+    "Requests currently being handled",
+    multiprocess_mode="livesum"
+)
+HTTP_STREAMS_OPEN = Gauge(
+    "http_streams_open",
+    "Event streams currently open",
+    multiprocess_mode="livesum"
+)
+HTTP_STREAM_DURATION_SECONDS = Histogram(
+    "http_stream_duration_seconds",
+    "Time from request start until an event stream closed",
+    ["method", "route"],
+    buckets=STREAM_DURATION_BUCKETS
+)
+HTTP_RESPONSES_TOTAL = Counter(
+    "http_responses_total",
+    "Responses sent, by status code",
+    ["method", "route", "status"]
+)
+HTTP_REQUEST_DB_SECONDS = Histogram(
+    "http_request_db_seconds",
+    "Time spent executing SQL per request",
+    ["method", "route"],
+    buckets=LATENCY_BUCKETS
+)
+HTTP_REQUEST_DB_QUERIES = Histogram(
+    "http_request_db_queries",
+    "SQL statements executed per request",
+    ["method", "route"],
+    buckets=QUERY_COUNT_BUCKETS
+)
+HTTP_QUERY_BUDGET_EXCEEDED_TOTAL = Counter(
+    "http_query_budget_exceeded_total",
+    "Requests that ran more SQL statements than their route's budget",
+    ["method", "route"]
+)
+
+# Unmatched paths share one label so scanners cannot blow up cardinality
+UNMATCHED_ROUTE = "unmatched"
+EVENT_STREAM_CONTENT_TYPE = b"text/event-stream"
+
+def metrics_response() -> Response:
+    """Render the metrics in the Prometheus text format, summed over workers in multiprocess mode"""
+    registry = REGISTRY
+    if PROMETHEUS_MULTIPROC_DIR:
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+    return Response(content=generate_latest(registry), media_type=CONTENT_TYPE_LATEST)
+
+def mark_process_dead():
+    """Drop this worker's live gauges from the multiprocess totals; call on shutdown"""
+    if PROMETHEUS_MULTIPROC_DIR:
+        multiprocess.mark_process_dead(os.getpid())
+
+@dataclass
+class RequestStats:
+    """SQL activity of the current request"""
+    db_queries: int = 0
+    db_seconds: float = 0.0
+
+# Holds a mutable RequestStats, so work run on the threadpool (which gets
+# a copy of the context) still adds to the request's totals
+_request_stats: ContextVar[Optional[RequestStats]] = ContextVar("request_stats", default=None)
+
+def current_request_stats() -> Optional[RequestStats]:
+    """Stats of the request being handled, or None outside a request"""
+    return _request_stats.get()
+
+class QueryBudgetExceeded(AssertionError):
+    """Raised in strict mode when a request runs more statements than its route allows"""
+
+def query_budget(max_queries: int):
+    """Declare the most SQL statements an endpoint may run per request.
+    
+    Apply below the router decorator. The count must not grow with the
+    input size, which is what catches N+1 query patterns.
+    """
+    def decorator(endpoint):
+        endpoint.query_budget = max_queries
+        return endpoint
+    return decorator
+
+def instrument_engine(engine):
+    """Attribute every statement executed on engine to the current request"""
+    sync_engine = getattr(engine, "sync_engine", engine)  # AsyncEngine wraps a sync one
+    
+    @event.listens_for(sync_engine, "before_cursor_execute")
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        context._query_started_at = time.perf_counter()
+    
+    @event.listens_for(sync_engine, "after_cursor_execute")
+    def after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        stats = _request_stats.get()
+        if stats is not None:
+            stats.db_queries += 1
+            stats.db_seconds += time.perf_counter() - context._query_started_at
+
+class PrometheusMiddleware:
+    """ASGI middleware recording request metrics labelled by route template"""
+    
+    def __init__(self, app, excluded_paths: Iterable[str] = ("/metrics",)):
+        self.app = app
+        self.excluded_paths = frozenset(excluded_paths)
+    
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["path"] in self.excluded_paths:
+            await self.app(scope, receive, send)
+            return
+        
+        stats = RequestStats()
+        token = _request_stats.set(stats)
+        status_code = 500  # if the app raises before responding
+        streaming = False
+        
+        async def send_with_status(message):
+            nonlocal status_code, streaming
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                streaming = self._is_event_stream(message)
+                if streaming:
+                    # From here on the request is an open stream, not one in flight
+                    HTTP_REQUESTS_IN_FLIGHT.dec()
+                    HTTP_STREAMS_OPEN.inc()
+                if SERVER_TIMING_HEADERS:
+                    message["headers"] = list(message.get("headers", [])) + self._timing_headers(stats, started_at)
+            await send(message)
+        
+        HTTP_REQUESTS_IN_FLIGHT.inc()
+        started_at = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            elapsed = time.perf_counter() - started_at
+            (HTTP_STREAMS_OPEN if streaming else HTTP_REQUESTS_IN_FLIGHT).dec()
+            _request_stats.reset(token)
+            
+            # The router stores the matched route in the scope
+            matched = scope.get("route")
+            route = getattr(matched, "path", UNMATCHED_ROUTE)
+            method = scope["method"]
+            duration = HTTP_STREAM_DURATION_SECONDS if streaming else HTTP_REQUEST_DURATION_SECONDS
+            duration.labels(method, route).observe(elapsed)
+            HTTP_RESPONSES_TOTAL.labels(method, route, str(status_code)).inc()
+            HTTP_REQUEST_DB_SECONDS.labels(method, route).observe(stats.db_seconds)
+            HTTP_REQUEST_DB_QUERIES.labels(method, route).observe(stats.db_queries)
+        
+        budget = getattr(getattr(matched, "endpoint", None), "query_budget", None)
+        if budget is not None and stats.db_queries > budget:
+            HTTP_QUERY_BUDGET_EXCEEDED_TOTAL.labels(method, route).inc()
+            detail = f"{method} {route} ran {stats.db_queries} SQL statements, budget is {budget}"
+            if DB_QUERY_BUDGET_STRICT:
+                raise QueryBudgetExceeded(detail)
+            logger.warning("Query budget exceeded: %s", detail)
+    
+    @staticmethod
+    def _is_event_stream(message) -> bool:
+        return any(
+            name.lower() == b"content-type" and value.split(b";")[0].strip().lower() == EVENT_STREAM_CONTENT_TYPE
+            for name, value in message.get("headers", [])
+        )
+    
+    @staticmethod
+    def _timing_headers(stats: RequestStats, started_at: float) -> List[Tuple[bytes, bytes]]:
+        app_ms = (time.perf_counter() - started_at) * 1000
+        server_timing = f'db;dur={stats.db_seconds * 1000:.2f};desc="{stats.db_queries} queries", app;dur={app_ms:.2f}'
+        return [
+            (b"server-timing", server_timing.encode()),
+            (b"x-db-queries", str(stats.db_queries).encode())
+        ]
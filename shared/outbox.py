@@ -0,0 +1,137 @@
+"""Transactional outbox for domain events, shared by the services.
+
+Endpoints call record_event() in the same session as the order change, so
+the event commits or rolls back with it and requests never wait on the
+broker. A background OutboxRelay publishes pending rows in batches through
+RabbitMQManager and stamps published_at once the broker confirms them.
+Delivery is at-least-once; consumers can dedupe on event_id. Published
+rows are kept for OUTBOX_RETENTION, then the relay deletes them in batches.
+
+Each service passes its outbox model (id, event_type, payload, attempts,
+created_at, published_at columns) and its SessionLocal/run_db pair.
+"""
+import os
+import time
+import asyncio
+import logging
+from datetime import datetime, timedelta
+from typing import Callable, List
+
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy import delete, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from .rabbitmq import RabbitMQManager, rabbitmq_manager
+
+logger = logging.getLogger(__name__)
+
+EVENTS_EXCHANGE = os.getenv("EVENTS_EXCHANGE", "hotel.events")
+OUTBOX_RELAY_ENABLED = os.getenv("OUTBOX_RELAY_ENABLED", "true").lower() in ("1", "true", "yes")
+OUTBOX_BATCH_SIZE = int(os.getenv("OUTBOX_BATCH_SIZE", "500"))
+OUTBOX_POLL_INTERVAL = float(os.getenv("OUTBOX_POLL_INTERVAL", "1"))  # seconds
+OUTBOX_MAX_BACKOFF = 30.0  # seconds
+OUTBOX_RETENTION = float(os.getenv("OUTBOX_RETENTION", "604800"))  # seconds published rows are kept
+OUTBOX_PURGE_INTERVAL = float(os.getenv("OUTBOX_PURGE_INTERVAL", "3600"))  # seconds
+
+def record_event(db: Session, model, event_type: str, payload: dict):
+    """Stage an event in the caller's transaction; model is the service's outbox model"""
+    db.add(model(event_type=event_type, payload=payload))
+
+class OutboxRelay:
+    """Publishes one service's outbox table to EVENTS_EXCHANGE"""
+
+    def __init__(
+        self,
+        model,
+        session_factory: Callable,
+        run_db: Callable,
+        manager: RabbitMQManager = rabbitmq_manager,
+        exchange_name: str = EVENTS_EXCHANGE,
+        batch_size: int = OUTBOX_BATCH_SIZE
+    ):
+        self.model = model
+        self.session_factory = session_factory
+        self.run_db = run_db
+        self.manager = manager
+        self.exchange_name = exchange_name
+        self.batch_size = batch_size
+
+    def _claim_pending(self, db: Session, limit: int) -> List:
+        # SKIP LOCKED lets relays in several workers/replicas split the backlog
+        return db.query(self.model).filter(
+            self.model.published_at.is_(None)
+        ).order_by(self.model.created_at).limit(limit).with_for_update(skip_locked=True).all()
+
+    @staticmethod
+    def _mark_published(db: Session, events: List, confirmed: List[bool]):
+        now = datetime.utcnow()
+        for event, ok in zip(events, confirmed):
+            event.attempts = (event.attempts or 0) + 1
+            if ok:
+                event.published_at = now
+        db.commit()
+
+    @staticmethod
+    def _envelope(event) -> dict:
+        return {
+            "event_id": event.id,
+            "event_type": event.event_type,
+            "occurred_at": event.created_at.isoformat(),
+            "data": event.payload
+        }
+
+    def purge_published(self, db: Session) -> int:
+        """Delete rows published before the retention window, one committed batch at a time"""
+        event = self.model
+        cutoff = datetime.utcnow() - timedelta(seconds=OUTBOX_RETENTION)
+        purged = 0
+        while True:
+            # Short transactions: a large backlog does not hold locks on the table for long
+            batch = select(event.id).where(event.published_at < cutoff).limit(self.batch_size)
+            deleted = db.execute(delete(event).where(event.id.in_(batch))).rowcount
+            db.commit()
+            purged += deleted
+            if deleted < self.batch_size:
+                return purged
+
+    async def relay_once(self, db) -> int:
+        """Publish one batch of pending events, returning how many were confirmed"""
+        events = await self.run_db(db, self._claim_pending, self.batch_size)
+        if not events:
+            return 0
+
+        confirmed = await self.manager.publish_many(
+            self.exchange_name,
+            [(event.event_type, self._envelope(event)) for event in events],
+            exchange_type="topic"
+        )
+        await self.run_db(db, self._mark_published, events, confirmed)
+        return sum(confirmed)
+
+    async def run(self):
+        """Drain the outbox forever; runs as a background task of the app"""
+        backoff = OUTBOX_POLL_INTERVAL
+        next_purge = time.monotonic() + OUTBOX_PURGE_INTERVAL
+        while True:
+            db = self.session_factory()
+            try:
+                published = await self.relay_once(db)
+                backoff = OUTBOX_POLL_INTERVAL
+                if time.monotonic() >= next_purge:
+                    next_purge = time.monotonic() + OUTBOX_PURGE_INTERVAL
+                    purged = await self.run_db(db, self.purge_published)
+                    logger.debug("Purged %d published outbox events", purged)
+                if published >= self.batch_size:
+                    continue  # backlog left, go again immediately
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                logger.warning("Outbox relay failed, retrying in %.1fs", backoff, exc_info=True)
+                backoff = min(backoff * 2, OUTBOX_MAX_BACKOFF)
+            finally:
+                if isinstance(db, AsyncSession):
+                    await db.close()
+                else:
+                    await run_in_threadpool(db.close)
+            await asyncio.sleep(backoff)
@@ -0,0 +1,59 @@
+import json
+import base64
+import binascii
+from datetime import datetime
+from typing import Any, List, Optional, Tuple
+
+from fastapi import HTTPException
+from sqlalchemy import DateTime, tuple_
+from sqlalchemy.orm import Query
+
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 500
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+def encode_cursor(*values: Any) -> str:
+    """Pack keyset values into an opaque URL-safe token"""
+    raw = json.dumps([v.isoformat() if isinstance(v, datetime) else v for v in values])
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+def decode_cursor(cursor: str, keyset: List) -> List[Any]:
+    """Unpack a token produced by encode_cursor for the given keyset columns"""
+    try:
+        values = json.loads(base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)))
+        if not isinstance(values, list) or len(values) != len(keyset):
+            raise ValueError(cursor)
+        # encode_cursor only writes scalars; anything else was tampered with
+        if not all(isinstance(value, (str, int, float)) for value in values):
+            raise ValueError(cursor)
+        return [
+            datetime.fromisoformat(value) if isinstance(column.type, DateTime) else value
+            for column, value in zip(keyset, values)
+        ]
+    except (ValueError, TypeError, binascii.Error):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+def paginate(
+    query: Query,
+    keyset: List,
+    limit: int,
+    cursor: Optional[str] = None,
+    descending: bool = False
+) -> Tuple[List[Any], Optional[str]]:
+    """Return one page of query ordered by keyset, plus the cursor of the next page.
+
+    The keyset must end with a unique column so that positions are unambiguous.
+    """
+    if cursor:
+        position = tuple_(*keyset)
+        after = tuple_(*decode_cursor(cursor, keyset))
+        query = query.filter(position < after if descending else position > after)
+    
+    order = [column.desc() for column in keyset] if descending else keyset
+    rows = query.order_by(*order).limit(limit + 1).all()
+    
+    if len(rows) <= limit:
+        return rows, None
+    
+    rows = rows[:limit]
+    return rows, encode_cursor(*(getattr(rows[-1], column.key) for column in keyset))
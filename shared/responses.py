@@ -0,0 +1,37 @@
+"""Fast JSON responses.
+
+DefaultResponse renders with orjson when it is installed, which encodes
+straight to bytes and handles datetimes natively. rows_response() goes one
+step further for list endpoints: it dumps ORM rows without validating them
+into Pydantic models first, since they come from our own tables and already
+have the shape of the declared response schema.
+"""
+from functools import lru_cache
+from typing import Iterable, Mapping, Optional, Type
+
+from fastapi.responses import JSONResponse, ORJSONResponse, Response
+from pydantic import BaseModel, TypeAdapter
+
+try:
+    import orjson
+except ImportError:  # optional, falls back to Pydantic's encoder
+    orjson = None
+
+DefaultResponse = ORJSONResponse if orjson else JSONResponse
+
+@lru_cache(maxsize=None)
+def _list_adapter(schema: Type[BaseModel]) -> TypeAdapter:
+    return TypeAdapter(list[schema])
+
+def dump_rows(rows: Iterable, schema: Type[BaseModel]) -> bytes:
+    """Encode rows as a JSON array with the fields of schema"""
+    if orjson is None:
+        adapter = _list_adapter(schema)
+        return adapter.dump_json(adapter.validate_python(rows, from_attributes=True))
+    
+    fields = tuple(schema.model_fields)
+    return orjson.dumps([{field: getattr(row, field) for field in fields} for row in rows])
+
+def rows_response(rows: Iterable, schema: Type[BaseModel], headers: Optional[Mapping[str, str]] = None) -> Response:
+    """JSON array response for a list endpoint, bypassing response_model validation"""
+    return Response(content=dump_rows(rows, schema), media_type="application/json", headers=headers)
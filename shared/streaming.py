@@ -0,0 +1,209 @@
+"""Server-sent event streams of order status changes.
+
+Endpoints publish an order's new state after committing it; subscribers
+(guest tablets, kitchen screens) hold an SSE connection per order or per
+guest and get each change pushed, instead of polling the database.
+Each event is encoded once and fanned out to every subscriber through a
+small per-subscriber queue, so thousands of open streams cost no queries.
+
+Workers and replicas share events through a transient RabbitMQ fanout
+exchange per service (run_fanout): every process binds its own exclusive
+queue and delivers what arrives to its local subscribers, so a stream sees
+writes served by any worker. While the broker is unreachable, events only
+reach subscribers of the process that made the change. In-process caches
+register with add_listener() to hear about the other processes' writes.
+"""
+import os
+import json
+import uuid
+import asyncio
+import logging
+import contextlib
+from collections import defaultdict
+from typing import AsyncIterator, Callable, Dict, Iterable, List, Optional, Set
+
+import aio_pika
+
+logger = logging.getLogger(__name__)
+
+SSE_HEARTBEAT_SECONDS = float(os.getenv("SSE_HEARTBEAT_SECONDS", "15"))
+# Events buffered per subscriber; a slow client loses the oldest ones first
+SSE_SUBSCRIBER_BUFFER = int(os.getenv("SSE_SUBSCRIBER_BUFFER", "16"))
+SSE_FANOUT_ENABLED = os.getenv("SSE_FANOUT_ENABLED", "true").lower() in ("1", "true", "yes")
+SSE_FANOUT_MAX_BACKOFF = 30.0  # seconds between reconnect attempts
+
+SSE_HEADERS = {
+    "Cache-Control": "no-cache",
+    "X-Accel-Buffering": "no"  # stop nginx-style proxies from buffering the stream
+}
+
+def order_topic(order_id: str) -> str:
+    return f"order:{order_id}"
+
+def guest_topic(guest_id: str) -> str:
+    return f"guest:{guest_id}"
+
+def format_event(event: str, data: dict, event_id: Optional[str] = None) -> bytes:
+    """Encode one SSE frame"""
+    frame = f"event: {event}\n"
+    if event_id:
+        frame += f"id: {event_id}\n"
+    return (frame + f"data: {json.dumps(data, separators=(',', ':'))}\n\n").encode()
+
+class EventBroadcaster:
+    """Pub/sub of pre-encoded SSE frames by topic, shared across processes by run_fanout()"""
+    
+    def __init__(self, buffer_size: int = SSE_SUBSCRIBER_BUFFER):
+        self.buffer_size = buffer_size
+        self._subscribers: Dict[str, Set[asyncio.Queue]] = defaultdict(set)
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._exchange = None  # set while run_fanout() is connected
+        self._sends = set()
+        # Tells this process's events apart from the other processes' on the fan-out
+        self.origin = uuid.uuid4().hex
+        self._listeners: List[Callable[[List[str], bool], None]] = []
+    
+    def subscriber_count(self) -> int:
+        return sum(len(queues) for queues in self._subscribers.values())
+    
+    def add_listener(self, listener: Callable[[List[str], bool], None]):
+        """Call listener(topics, final) on the event loop for each event another process shares"""
+        self._listeners.append(listener)
+    
+    def publish(self, topics: Iterable[str], frame: bytes, final: bool = False):
+        """Queue frame for every subscriber of topics.
+        
+        final marks the last event of a topic (e.g. an order reached a
+        terminal status); streams opened with close_on_final end after it.
+        Safe to call from threadpool workers: delivery is handed to the
+        event loop. Without run_fanout(), a no-op while nobody in this
+        process is subscribed.
+        """
+        if self._loop is None:
+            return
+        if self._exchange is not None:
+            self._loop.call_soon_threadsafe(self._send, list(topics), frame, final)
+            return
+        topics = [topic for topic in topics if topic in self._subscribers]
+        if topics:
+            self._loop.call_soon_threadsafe(self._deliver, topics, (frame, final))
+    
+    def _send(self, topics, frame: bytes, final: bool):
+        # Tasks start in publish order, so one channel keeps an order's events in order
+        task = asyncio.ensure_future(self._forward(self._exchange, topics, frame, final))
+        self._sends.add(task)
+        task.add_done_callback(self._sends.discard)
+    
+    async def _forward(self, exchange, topics, frame: bytes, final: bool):
+        try:
+            await exchange.publish(
+                aio_pika.Message(body=frame, headers={"topics": topics, "final": final, "origin": self.origin}),
+                routing_key=""
+            )
+        except Exception:
+            logger.warning("Could not share an SSE event, delivering it locally only", exc_info=True)
+            self._deliver([topic for topic in topics if topic in self._subscribers], (frame, final))
+    
+    async def _on_message(self, message: aio_pika.IncomingMessage):
+        all_topics = list(message.headers.get("topics", ()))
+        final = bool(message.headers.get("final"))
+        if message.headers.get("origin") != self.origin:
+            for listener in self._listeners:
+                try:
+                    listener(all_topics, final)
+                except Exception:
+                    logger.exception("SSE fan-out listener failed")
+        topics = [topic for topic in all_topics if topic in self._subscribers]
+        if topics:
+            self._deliver(topics, (message.body, final))
+    
+    async def run_fanout(self, manager, exchange_name: str):
+        """Share events with the service's other processes until cancelled.
+        
+        manager is the RabbitMQManager whose connection is used. Events are
+        transient: a process that is down or reconnecting misses them, and
+        its clients see the current state again when they reconnect.
+        """
+        self._loop = asyncio.get_running_loop()
+        backoff = 1.0
+        while True:
+            channel = None
+            try:
+                if not manager.channel:
+                    await manager.connect()
+                channel = await manager.connection.channel(publisher_confirms=False)
+                exchange = await channel.declare_exchange(exchange_name, "fanout", auto_delete=True)
+                queue = await channel.declare_queue(exclusive=True, auto_delete=True)
+                await queue.bind(exchange)
+                await queue.consume(self._on_message, no_ack=True)
+                self._exchange = exchange
+                backoff = 1.0
+                # The robust connection restores the channel, queue and consumer after a drop
+                await asyncio.Event().wait()
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                logger.warning("SSE fan-out unavailable, retrying in %.1fs", backoff, exc_info=True)
+            finally:
+                self._exchange = None
+                if channel is not None and not channel.is_closed:
+                    with contextlib.suppress(Exception):
+                        await channel.close()
+            await asyncio.sleep(backoff)
+            backoff = min(backoff * 2, SSE_FANOUT_MAX_BACKOFF)
+    
+    def _deliver(self, topics, item):
+        for topic in topics:
+            for queue in self._subscribers.get(topic, ()):
+                if queue.full():
+                    queue.get_nowait()
+                queue.put_nowait(item)
+    
+    def subscribe(self, topic: str) -> "Subscription":
+        """Start buffering events for topic; call before reading the current state"""
+        self._loop = asyncio.get_running_loop()
+        queue = asyncio.Queue(maxsize=self.buffer_size)
+        self._subscribers[topic].add(queue)
+        return Subscription(self, topic, queue)
+    
+    def _unsubscribe(self, topic: str, queue: asyncio.Queue):
+        queues = self._subscribers.get(topic)
+        if queues is not None:
+            queues.discard(queue)
+            if not queues:
+                del self._subscribers[topic]
+
+class Subscription:
+    """One client's view of a topic"""
+    
+    def __init__(self, broadcaster: EventBroadcaster, topic: str, queue: asyncio.Queue):
+        self.broadcaster = broadcaster
+        self.topic = topic
+        self.queue = queue
+    
+    def close(self):
+        self.broadcaster._unsubscribe(self.topic, self.queue)
+    
+    async def stream(self, initial: Optional[bytes] = None, close_on_final: bool = False) -> AsyncIterator[bytes]:
+        """Yield SSE frames until the client disconnects, then unsubscribe.
+        
+        initial is sent first. Comment frames go out every
+        SSE_HEARTBEAT_SECONDS so proxies do not close an idle connection.
+        """
+        try:
+            if initial is not None:
+                yield initial
+            while True:
+                try:
+                    frame, final = await asyncio.wait_for(self.queue.get(), SSE_HEARTBEAT_SECONDS)
+                except asyncio.TimeoutError:
+                    yield b": keepalive\n\n"
+                    continue
+                yield frame
+                if final and close_on_final:
+                    return
+        finally:
+            self.close()
+
+# Global instance
+order_events = EventBroadcaster()
@@ -0,0 +1,37 @@
+"""Status UPDATEs that also report the status each row had before.
+
+The rollups need to know which orders moved into or out of a status, and
+RETURNING only gives the new values. The statement below locks the rows in
+a CTE first and reads their old status from it:
+
+    WITH old AS MATERIALIZED (
+        SELECT id AS old_id, status AS old_status FROM orders WHERE id IN (:ids) FOR UPDATE
+    )
+    UPDATE orders SET status = :status, ... WHERE id IN (SELECT old_id FROM old)
+    RETURNING orders.*, (SELECT old_status FROM old WHERE old_id = orders.id) AS previous_status
+
+MATERIALIZED makes SQLite read the old rows before it writes any of them.
+The CTE columns get their own names because SQLAlchemy leaves RETURNING
+columns unqualified on SQLite, where "id = id" would compare a row with
+itself. SQLite ignores FOR UPDATE; it has one writer at a time anyway.
+"""
+from typing import List
+
+from sqlalchemy import Table, select, update
+from sqlalchemy.orm import Session
+
+def update_returning_previous(db: Session, table: Table, ids: List[str], values: dict, *criteria) -> List:
+    """Apply values to the rows of ids that match criteria in one statement.
+
+    Returns the updated rows with every column of table plus previous_status.
+    """
+    old = select(
+        table.c.id.label("old_id"),
+        table.c.status.label("old_status")
+    ).where(table.c.id.in_(ids)).with_for_update().cte("old").prefix_with("MATERIALIZED")
+    previous_status = select(old.c.old_status).where(old.c.old_id == table.c.id).scalar_subquery()
+    return db.execute(
+        update(table).where(table.c.id.in_(select(old.c.old_id)), *criteria).values(
+            **values
+        ).returning(*table.c, previous_status.label("previous_status"))
+    ).all()